@@ -80,6 +80,28 @@ class ByteDataStreamBase:
     def isLittleEndian(self, little_endian):
         pass
 
+    ##
+    # @if jp
+    # @brief データ型の設定
+    #
+    # シリアライザを使用するコネクタのデータ型を設定する。
+    # シリアライザはデータ型毎の情報を事前に準備できる。
+    #
+    # @param data_type データ型
+    #
+    # @else
+    #
+    # @brief Set the data type
+    #
+    # Sets the data type of the connector using the serializer, so that
+    # per type information can be prepared in advance.
+    #
+    # @param data_type data type
+    #
+    # @endif
+    def setDataType(self, data_type):
+        pass
+
     ##
     # @if jp
     # @brief データの符号化
@@ -328,6 +350,8 @@ class SerializerFactories:
     # @if jp
     # @brief シリアライザの生成
     #
+    # データ型を指定した場合は生成したシリアライザのsetDataType()を呼び出す。
+    #
     # @param self
     # @param marshalingtype シリアライザの種類(文字列)
     # @param datatype 対象のデータ型のインスタンス、もしくはクラス
@@ -337,20 +361,27 @@ class SerializerFactories:
     #
     # @else
     #
+    # @brief Create a serializer
+    #
+    # setDataType() of the new serializer is called when a data type
+    # is given.
+    #
     # @param self
     # @param marshalingtype
     # @param datatype
     #
     # @endif
     def createSerializer(self, marshalingtype, datatype=None):
+        obj = None
         if datatype is not None:
             mtype = OpenRTM_aist.toTypename(datatype)
             if mtype in self._factories:
                 obj = self._factories[mtype].createObject(marshalingtype)
-                if obj is not None:
-                    return obj
-        obj = globalserializerfactories.createObject(marshalingtype)
+        if obj is None:
+            obj = globalserializerfactories.createObject(marshalingtype)
         if obj is not None:
+            if datatype is not None and hasattr(obj, "setDataType"):
+                obj.setDataType(datatype)
             return obj
         return None
 
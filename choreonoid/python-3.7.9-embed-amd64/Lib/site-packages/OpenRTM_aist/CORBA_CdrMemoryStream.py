@@ -18,11 +18,57 @@
 #
 
 import sys
+import threading
+import omniORB
 import OpenRTM_aist
 from omniORB import cdrMarshal
 from omniORB import cdrUnmarshal
 from omniORB import any
 
+
+_typecodes = {}
+_typecodes_mutex = threading.RLock()
+
+
+##
+# @if jp
+# @brief データ型のTypeCodeを取得する
+#
+# IDLで定義されたデータ型はリポジトリIDをキーとしてTypeCodeをキャッシュする。
+# キャッシュにない場合はomniORBに登録されたTypeCodeを検索し、見つからない
+# 場合はデータの内容からTypeCodeを求める。リポジトリIDを持たないデータは
+# キャッシュしない。
+#
+# @param data データ型のインスタンス、もしくはクラス
+# @return TypeCode
+#
+# @else
+# @brief Get the TypeCode of a data type
+#
+# TypeCodes of IDL defined types are cached by repository id. On a miss
+# the TypeCode registered to omniORB is looked up, falling back to
+# introspecting the value. Values without a repository id are not
+# cached.
+#
+# @param data instance or class of the data type
+# @return TypeCode
+#
+# @endif
+def getTypeCode(data):
+    repoId = getattr(data, "_NP_RepositoryId", None)
+    if repoId is None:
+        return any.to_any(data).typecode()
+    tc = _typecodes.get(repoId)
+    if tc is not None:
+        return tc
+    tc = omniORB.findTypeCode(repoId)
+    if tc is None:
+        tc = any.to_any(data).typecode()
+    guard = OpenRTM_aist.ScopedLock(_typecodes_mutex)
+    _typecodes[repoId] = tc
+    return tc
+
+
 ##
 # @if jp
 # @class CORBA_CdrMemoryStream
@@ -57,6 +103,8 @@ class CORBA_CdrMemoryStream(OpenRTM_aist.ByteDataStreamBase):
     # @endif
     def __init__(self):
         self._endian = None
+        self._repoId = None
+        self._typecode = None
 
     ##
     # @if jp
@@ -111,6 +159,53 @@ class CORBA_CdrMemoryStream(OpenRTM_aist.ByteDataStreamBase):
     def isLittleEndian(self, little_endian):
         self._endian = little_endian
 
+    ##
+    # @if jp
+    # @brief データ型の設定
+    #
+    # データ型のTypeCodeを取得して保持する。以降は同じデータ型の
+    # 符号化、復号化でTypeCodeを求める処理を省略する。
+    #
+    # @param data_type データ型
+    #
+    # @else
+    #
+    # @brief Set the data type
+    #
+    # Looks up and keeps the TypeCode of the data type, so that encoding
+    # and decoding the same type does not need to find it again.
+    #
+    # @param data_type data type
+    #
+    # @endif
+    def setDataType(self, data_type):
+        self._repoId = getattr(data_type, "_NP_RepositoryId", None)
+        if self._repoId is None:
+            self._typecode = None
+        else:
+            self._typecode = getTypeCode(data_type)
+
+    ##
+    # @if jp
+    # @brief データのTypeCodeを取得する
+    #
+    # @param data データ
+    # @return TypeCode
+    #
+    # @else
+    #
+    # @brief Get the TypeCode of data
+    #
+    # @param data data
+    # @return TypeCode
+    #
+    # @endif
+    def typecode(self, data):
+        if self._typecode is not None and \
+                getattr(data, "_NP_RepositoryId", None) == self._repoId:
+            return self._typecode
+        return getTypeCode(data)
+
     ##
     # @if jp
     # @brief データの符号化
@@ -135,8 +230,7 @@ class CORBA_CdrMemoryStream(OpenRTM_aist.ByteDataStreamBase):
     def serialize(self, data):
         if self._endian is not None:
             try:
-                cdr = cdrMarshal(
-                    any.to_any(data).typecode(), data, self._endian)
+                cdr = cdrMarshal(self.typecode(data), data, self._endian)
                 return OpenRTM_aist.ByteDataStreamBase.SERIALIZE_OK, cdr
             except BaseException:
                 if sys.version_info[0] == 3:
@@ -173,8 +267,8 @@ class CORBA_CdrMemoryStream(OpenRTM_aist.ByteDataStreamBase):
     def deserialize(self, cdr, data_type):
         if self._endian is not None:
             try:
-                data = cdrUnmarshal(
-                    any.to_any(data_type).typecode(), cdr, self._endian)
+                data = cdrUnmarshal(self.typecode(data_type), cdr,
+                                    self._endian)
                 return OpenRTM_aist.ByteDataStreamBase.SERIALIZE_OK, data
             except BaseException:
                 return OpenRTM_aist.ByteDataStreamBase.SERIALIZE_ERROR, data_type
@@ -8,10 +8,12 @@
 #  @author Nobuhiko Miyamoto
 #
 
+import concurrent.futures
 import OpenRTM_aist
 import OpenRTM_aist.RTObject
 from omniORB import CORBA
 import RTC
+import SDOPackage
 
 
 ##
@@ -979,6 +981,142 @@ def connect_multi(name, prop, port, target_ports):
     return ret
 
 
+##
+# @if jp
+#
+# @brief コネクタプロファイルのプロパティのテンプレートを作成する
+#
+# 接続設定にデフォルト値を補完してNVListに変換する。同じ設定で多数の
+# 接続を行う場合に、変換を接続毎に行わずに済む。引数の設定は変更しない。
+#
+#
+# @param prop_arg 設定
+# @return プロパティのNVList
+#
+# @else
+#
+# @brief Create a template of the connector profile properties
+#
+# Fills in the defaults and converts the connection properties into an
+# NVList once, so that many connections with the same properties do not
+# repeat the conversion. The given properties are not modified.
+#
+# @param prop_arg connection properties
+# @return NVList of the properties
+#
+# @endif
+def create_connector_template(prop_arg):
+    prop = OpenRTM_aist.Properties(prop=prop_arg)
+    if not str(prop.getProperty("dataport.dataflow_type")):
+        prop.setProperty("dataport.dataflow_type", "push")
+
+    if not str(prop.getProperty("dataport.interface_type")):
+        prop.setProperty("dataport.interface_type", "corba_cdr")
+
+    properties = []
+    OpenRTM_aist.NVUtil.copyFromProperties(properties, prop)
+    return properties
+
+
+##
+# @if jp
+#
+# @brief テンプレートからコネクタプロファイルを作成する
+#
+#
+# @param name コネクタ名
+# @param template create_connector_template()で作成したNVList
+# @param port0 対象のポート1
+# @param port1 対象のポート2
+# @return コネクタプロファイル
+#
+# @else
+#
+# @brief Create a connector profile from a template
+#
+# @param name connector name
+# @param template NVList created by create_connector_template()
+# @param port0 the first port
+# @param port1 the second port
+# @return connector profile
+#
+# @endif
+def create_connector_by_template(name, template, port0, port1):
+    if CORBA.is_nil(port1):
+        conn_prof = RTC.ConnectorProfile(name, "", [port0], [])
+    else:
+        conn_prof = RTC.ConnectorProfile(name, "", [port0, port1], [])
+    conn_prof.properties = [SDOPackage.NameValue(nv.name, nv.value)
+                            for nv in template]
+    return conn_prof
+
+
+##
+# @if jp
+#
+# @brief 複数のポートの組を一括して接続する
+#
+# (コネクタ名, 設定, ポート1, ポート2) の組のリストを受け取り、
+# 最大max_workers個の接続処理を並行して実行する。設定はオブジェクト毎に
+# 一度だけテンプレートに変換し、同じ設定を持つ接続で再利用する。
+# 設定にはPropertiesの他、create_connector_template()で作成した
+# NVListを指定できる。
+#
+#
+# @param connections (コネクタ名, 設定, ポート1, ポート2) のリスト
+# @param max_workers 並行して実行する接続処理の最大数
+# @return 接続毎の (リターンコード, コネクタプロファイル) のリスト
+# connectionsと同じ順序で返す。ポートがnilの場合等はBAD_PARAMETER、
+# 接続中に例外が発生した場合はRTC_ERRORを返し、プロファイルはNoneとなる。
+#
+# @else
+#
+# @brief Connect many pairs of ports at once
+#
+# Takes a list of (connector name, properties, port0, port1) and runs
+# up to max_workers connection handshakes concurrently. Each distinct
+# properties object is converted into a template only once and reused
+# by every connection sharing it. An NVList made by
+# create_connector_template() may be given instead of Properties.
+#
+# @param connections list of (connector name, properties, port0, port1)
+# @param max_workers maximum number of concurrent handshakes
+# @return list of (return code, connector profile) in the order of
+# connections. BAD_PARAMETER is returned for nil or identical ports and
+# RTC_ERROR if the handshake raised; the profile is None in both cases.
+#
+# @endif
+def connect_bulk(connections, max_workers=8):
+    templates = {}
+    for _, prop, _, _ in connections:
+        if id(prop) not in templates:
+            if isinstance(prop, list):
+                templates[id(prop)] = prop
+            else:
+                templates[id(prop)] = create_connector_template(prop)
+
+    def _connect(conn):
+        name, prop, port0, port1 = conn
+        try:
+            if CORBA.is_nil(port0):
+                return (RTC.BAD_PARAMETER, None)
+            if not CORBA.is_nil(port1):
+                if port0._is_equivalent(port1):
+                    return (RTC.BAD_PARAMETER, None)
+            cprof = create_connector_by_template(name, templates[id(prop)],
+                                                 port0, port1)
+            return port0.connect(cprof)
+        except BaseException:
+            return (RTC.RTC_ERROR, None)
+
+    if max_workers <= 1 or len(connections) <= 1:
+        return [_connect(conn) for conn in connections]
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(connections))) as executor:
+        return list(executor.map(_connect, connections))
+
+
 ##
 # @if jp
 # @class find_port
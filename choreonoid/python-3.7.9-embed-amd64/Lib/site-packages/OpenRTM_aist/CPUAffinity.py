@@ -3,14 +3,17 @@
 
 ##
 # @file CPUAffinity.py
-# @brief
+# @brief CPU affinity utilities
 # @date $Date$
 # @author Nobuhiko Miyamoto
 #
 
 
 import os
+import sys
 import ctypes
+import platform
+import threading
 
 
 ##
@@ -68,11 +71,11 @@ def setProcessAffinity(cpu_num_list):
         flag = PROCESS_QUERY_INFORMATION | PROCESS_SET_INFORMATION
         ctypes.windll.kernel32.OpenProcess(flag, 0, pid)
 
-        result = ctypes.windll.kernel32.SetProcessAffinityMask(
+        ctypes.windll.kernel32.SetProcessAffinityMask(
             ctypes.windll.kernel32.GetCurrentProcess(), cpu_num)
-        processMask = ctypes.c_long()
-        systemMask = ctypes.c_long()
-        result = ctypes.windll.kernel32.GetProcessAffinityMask(
+        processMask = ctypes.c_size_t()
+        systemMask = ctypes.c_size_t()
+        ctypes.windll.kernel32.GetProcessAffinityMask(
             ctypes.windll.kernel32.GetCurrentProcess(),
             ctypes.byref(processMask),
             ctypes.byref(systemMask))
@@ -83,48 +86,39 @@ def setProcessAffinity(cpu_num_list):
             return True
 
     else:
-        from ctypes.util import find_library
-        pthread = find_library("pthread")
-        if pthread is None:
-            return False
-        pthread = ctypes.CDLL(pthread)
-
-        mask = ctypes.c_long()
-        mask.value = cpu_num
-        result = pthread.sched_setaffinity(
-            pid, ctypes.sizeof(mask), ctypes.byref(mask))
-        if result != 0:
-            return False
-        mask = ctypes.c_long()
-        result = pthread.sched_getaffinity(
-            pid, ctypes.sizeof(mask), ctypes.byref(mask))
-        if mask.value != cpu_num:
-            return False
-        else:
-            return True
+        return _setAffinity(pid, cpu_num_list)
 
 
 ##
 # @if jp
 # @brief スレッドのCPUアフィニティを設定
 #
+# スレッドIDを指定した場合は、そのスレッドに設定する(POSIXのみ)。
+#
 # @param cpu_num_list CPUの番号リスト
+# @param tid スレッドID(Noneの場合は呼び出したスレッド)
 # @return 成功でTrue、失敗でFalse
 #
 # @else
-# @brief
+# @brief Set the CPU affinity of a thread
 #
-# @param cpu_num_list
-# @return
+# When a thread ID is given, the affinity of that thread is set
+# (POSIX only).
+#
+# @param cpu_num_list list of CPU numbers
+# @param tid thread ID (None for the calling thread)
+# @return True on success, False otherwise
 #
 # @endif
 #
-def setThreadAffinity(cpu_num_list):
+def setThreadAffinity(cpu_num_list, tid=None):
     cpu_num = listToCUPNUM(cpu_num_list)
     if cpu_num == 0:
         return False
 
     if os.name == "nt":
+        if tid is not None:
+            return False
 
         h = ctypes.windll.kernel32.GetCurrentThread()
 
@@ -136,25 +130,246 @@ def setThreadAffinity(cpu_num_list):
         return True
 
     else:
-        from ctypes.util import find_library
-        pthread = find_library("pthread")
-        if pthread is None:
-            return False
-        pthread = ctypes.CDLL(pthread)
-        libc = find_library("libc")
-        libc = ctypes.CDLL(libc)
-
-        mask = ctypes.c_long()
-        mask.value = cpu_num
-        tid = libc.syscall(186)
-        result = pthread.sched_setaffinity(
-            tid, ctypes.sizeof(mask), ctypes.byref(mask))
-        if result != 0:
-            return False
-        mask = ctypes.c_long()
-        result = pthread.sched_getaffinity(
-            tid, ctypes.sizeof(mask), ctypes.byref(mask))
-        if mask.value != cpu_num:
-            return False
-        else:
-            return True
+        if tid is None:
+            tid = getThreadId()
+        return _setAffinity(tid, cpu_num_list)
+
+
+##
+# @if jp
+# @brief CPUアフィニティを設定して確認する(POSIX)
+#
+# os.sched_setaffinity() を使用するため、CPU数の上限はない。
+# 存在しないCPUの番号はカーネルにより除外される。
+#
+# @param tid スレッドID(0の場合は呼び出したスレッド)
+# @param cpu_num_list CPUの番号リスト
+# @return 成功でTrue、失敗でFalse
+#
+# @else
+# @brief Set and verify the CPU affinity (POSIX)
+#
+# Uses os.sched_setaffinity(), so there is no limit on the number of
+# CPUs. CPU numbers that do not exist are dropped by the kernel.
+#
+# @param tid thread ID (0 for the calling thread)
+# @param cpu_num_list list of CPU numbers
+# @return True on success, False otherwise
+#
+# @endif
+#
+def _setAffinity(tid, cpu_num_list):
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    cpus = set()
+    try:
+        for num in cpu_num_list:
+            cpus.add(int(num))
+    except ValueError:
+        return False
+    if not cpus:
+        return False
+    try:
+        os.sched_setaffinity(tid, cpus)
+        result = os.sched_getaffinity(tid)
+    except OSError:
+        return False
+    return bool(result) and result.issubset(cpus)
+
+
+##
+# @if jp
+# @brief CPUの番号リストの文字列を変換
+#
+# "0,2,4-7" のような番号と範囲の指定に加え、"node1" のように NUMA
+# ノードを指定すると、そのノードに属するCPUを追加する。
+#
+# @param cpu_str CPUの番号リストの文字列
+# @return CPUの番号リスト(昇順)
+#
+# @else
+# @brief Convert a CPU list string
+#
+# Accepts numbers and ranges such as "0,2,4-7". A NUMA node given as
+# "node1" adds the CPUs of that node.
+#
+# @param cpu_str CPU list string
+# @return sorted list of CPU numbers
+#
+# @endif
+#
+def parseCPUList(cpu_str):
+    cpus = set()
+    nodes = None
+    for item in cpu_str.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            if item.startswith("node"):
+                if nodes is None:
+                    nodes = getNumaNodes()
+                cpus.update(nodes.get(int(item[4:].lstrip(":")), []))
+            elif "-" in item:
+                first, last = item.split("-", 1)
+                cpus.update(range(int(first), int(last) + 1))
+            else:
+                cpus.add(int(item))
+        except ValueError:
+            pass
+    return sorted(cpus)
+
+
+##
+# @if jp
+# @brief NUMA ノードの一覧を取得
+#
+# /sys/devices/system/node から取得する。取得できない場合は全CPUを
+# ノード0とする。
+#
+# @return ノード番号をキー、CPUの番号リストを値とする辞書
+#
+# @else
+# @brief Get the NUMA nodes
+#
+# Read from /sys/devices/system/node. When unavailable, all CPUs are
+# put into node 0.
+#
+# @return dict from node number to list of CPU numbers
+#
+# @endif
+#
+def getNumaNodes():
+    global _numa_nodes
+    if _numa_nodes is not None:
+        return _numa_nodes
+    nodes = {}
+    path = "/sys/devices/system/node"
+    try:
+        for name in os.listdir(path):
+            if not name.startswith("node") or not name[4:].isdigit():
+                continue
+            with open(os.path.join(path, name, "cpulist")) as f:
+                nodes[int(name[4:])] = parseCPUList(f.read())
+    except (IOError, OSError):
+        nodes = {}
+    if not nodes:
+        nodes[0] = list(range(os.cpu_count() or 1))
+    _numa_nodes = nodes
+    return nodes
+
+
+_numa_nodes = None
+
+
+##
+# @if jp
+# @brief CPUが属する NUMA ノードを取得
+#
+# @param cpu CPUの番号
+# @return ノード番号(不明の場合は-1)
+#
+# @else
+# @brief Get the NUMA node of a CPU
+#
+# @param cpu CPU number
+# @return node number (-1 if unknown)
+#
+# @endif
+#
+def getCPUNode(cpu):
+    for node, cpus in getNumaNodes().items():
+        if cpu in cpus:
+            return node
+    return -1
+
+
+_gettid = {"x86_64": 186, "amd64": 186, "i386": 224, "i686": 224,
+           "aarch64": 178, "arm64": 178, "armv7l": 224, "ppc64le": 207}
+_libc = None
+
+
+##
+# @if jp
+# @brief 呼び出したスレッドのスレッドIDを取得
+#
+# Linux ではカーネルのスレッドID(gettid)を返す。それ以外では
+# threading.get_ident() を返す。
+#
+# @return スレッドID
+#
+# @else
+# @brief Get the thread ID of the calling thread
+#
+# Returns the kernel thread ID (gettid) on Linux, and
+# threading.get_ident() elsewhere.
+#
+# @return thread ID
+#
+# @endif
+#
+def getThreadId():
+    global _libc
+    if hasattr(threading, "get_native_id"):
+        return threading.get_native_id()
+    if sys.platform.startswith("linux"):
+        num = _gettid.get(platform.machine().lower())
+        if num is not None:
+            if _libc is None:
+                _libc = ctypes.CDLL(None, use_errno=True)
+            tid = _libc.syscall(num)
+            if tid > 0:
+                return tid
+    return threading.get_ident()
+
+
+##
+# @if jp
+# @brief スレッドのCPUアフィニティを取得
+#
+# @param tid スレッドID(0の場合は呼び出したスレッド)
+# @return CPUの番号リスト(取得できない場合は空)
+#
+# @else
+# @brief Get the CPU affinity of a thread
+#
+# @param tid thread ID (0 for the calling thread)
+# @return list of CPU numbers (empty if unavailable)
+#
+# @endif
+#
+def getThreadAffinity(tid=0):
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    try:
+        return sorted(os.sched_getaffinity(tid))
+    except OSError:
+        return []
+
+
+##
+# @if jp
+# @brief スレッドが最後に実行されたCPUを取得
+#
+# /proc/self/task/<tid>/stat から取得する。
+#
+# @param tid スレッドID
+# @return CPUの番号(不明の場合は-1)
+#
+# @else
+# @brief Get the CPU a thread last ran on
+#
+# Read from /proc/self/task/<tid>/stat.
+#
+# @param tid thread ID
+# @return CPU number (-1 if unknown)
+#
+# @endif
+#
+def getThreadCPU(tid):
+    try:
+        with open("/proc/self/task/%d/stat" % tid) as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return int(fields[36])
+    except (IOError, OSError, IndexError, ValueError):
+        return -1
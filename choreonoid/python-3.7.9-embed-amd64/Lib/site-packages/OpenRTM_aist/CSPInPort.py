@@ -90,6 +90,9 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             manager.addInPort(self)
         self._writingConnector = None
         self._syncmode = False
+        self._creditmode = False
+        self._creditdirty = False
+        self._creditturn = 0
 
     ##
     # @if jp
@@ -179,6 +182,10 @@ class CSPInPort(OpenRTM_aist.InPortBase):
         self._syncmode = OpenRTM_aist.toBool(
             prop.getProperty("csp.sync_wait"), "YES", "NO", False)
 
+        self._creditmode = OpenRTM_aist.toBool(
+            prop.getProperty("csp.credit"), "YES", "NO", False) \
+            and not self._bufferzeromode
+
         if not self._bufferzeromode:
             self._writable_listener = OpenRTM_aist.CSPInPort.IsWritableListener(
                 self._thebuffer, self._ctrl, self._channeltimeout, self, self._manager)
@@ -317,8 +324,80 @@ class CSPInPort(OpenRTM_aist.InPortBase):
         for con in self._connectors:
             con.setIsWritableListener(self._writable_listener)
             con.setWriteListener(self._write_listener)
+        del guard_con
+        self.notifyCredit()
         return (ret, prof)
 
+    ##
+    # @if jp
+    #
+    # @brief バッファからデータを読み込む
+    # クレジットモードの場合は空き容量の通知が必要であることを記録する
+    #
+    # @param self
+    # @return 読み込んだデータ
+    #
+    # @else
+    #
+    # @brief Read data from the buffer
+    # In credit mode, records that the free space has to be announced.
+    #
+    # @param self
+    # @return data read
+    #
+    # @endif
+    #
+    def readBuffer(self):
+        _, value = self._thebuffer.read()
+        self._creditdirty = True
+        return value
+
+    ##
+    # @if jp
+    #
+    # @brief 接続先のOutPortにバッファの空き容量(クレジット)を通知する
+    # csp.creditがYESの場合のみ通知する。接続先はクレジットが残っている間は
+    # is_writableの問い合わせ前に書き込み可能と判断できる。
+    # 複数のOutPortが接続されている場合は、合計がバッファの空き容量を
+    # 超えないように各接続に分配する。端数を受け取る接続は通知毎に
+    # 入れ替える。
+    # 通知はonewayで行うため、self._ctrl._condのロックを保持せずに呼び出すこと。
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Announce the free space of the buffer (credit) to the
+    # connected OutPorts
+    # Only done when csp.credit is YES. While credit remains, the peer
+    # can regard this port as writable without asking is_writable first.
+    # With several OutPorts connected, the free space is split between
+    # the connections so that their credits never add up to more. The
+    # connections that get the remainder rotate with every notification.
+    # The notification is oneway; do not call this while holding
+    # self._ctrl._cond.
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def notifyCredit(self):
+        if not self._creditmode:
+            return
+        self._creditdirty = False
+        credit = self._thebuffer.writable()
+        guard_con = OpenRTM_aist.ScopedLock(self._connector_mutex)
+        cons = [con for con in self._connectors
+                if hasattr(con, "notifyCredit")]
+        if not cons:
+            return
+        self._creditturn = (self._creditturn + 1) % len(cons)
+        for i, con in enumerate(cons):
+            share = credit // len(cons)
+            if (i - self._creditturn) % len(cons) < credit % len(cons):
+                share += 1
+            con.notifyCredit(share)
+
     ##
     # @if jp
     #
@@ -349,7 +428,7 @@ class CSPInPort(OpenRTM_aist.InPortBase):
         if not self._syncmode:
             guard_ctrl = OpenRTM_aist.ScopedLock(self._ctrl._cond)
         if not self._thebuffer.empty():
-            _, value = self._thebuffer.read(value)
+            value = self.readBuffer()
             if guard_ctrl is not None:
                 del guard_ctrl
             self.notify()
@@ -361,11 +440,11 @@ class CSPInPort(OpenRTM_aist.InPortBase):
         elif self._ctrl._writing:
             self._ctrl._cond.wait(self._channeltimeout)
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
+                value = self.readBuffer()
                 if guard_ctrl is not None:
                     del guard_ctrl
                 self.notify()
-                ret, data = con.deserializeData(value[0])
+                ret, data = con.deserializeData(value)
                 if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
                     return CSPInPort.SUCCESSFUL_GET_DATA, data
                 else:
@@ -435,7 +514,7 @@ class CSPInPort(OpenRTM_aist.InPortBase):
                 guard_ctrl = OpenRTM_aist.ScopedLock(self._ctrl._cond)
 
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
+                value = self.readBuffer()
                 del guard_ctrl
                 self.notify()
                 ret, data = self._connectors[0].deserializeData(value)
@@ -492,7 +571,7 @@ class CSPInPort(OpenRTM_aist.InPortBase):
 
         else:
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
+                value = self.readBuffer()
                 self.notify()
                 ret, data = self._connectors[0].deserializeData(value)
                 if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
@@ -656,6 +735,9 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             guard = OpenRTM_aist.ScopedLock(self._ctrl._cond)
         if ret:
             self._value = value
+        del guard
+        if self._creditdirty:
+            self.notifyCredit()
         return ret
 
     ##
@@ -692,6 +774,9 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             guard = OpenRTM_aist.ScopedLock(self._ctrl._cond)
         if ret:
             self._value = value
+        del guard
+        if self._creditdirty:
+            self.notifyCredit()
         return ret
 
     ##
@@ -772,15 +857,19 @@ class CSPInPort(OpenRTM_aist.InPortBase):
         if self._ctrl._writing:
             self._ctrl._cond.wait(self._channeltimeout)
 
+        data = self._value
         if self._writingConnector:
             self._writingConnector = None
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
-                ret, data = self._connectors[0].deserializeData(value)
+                value = self.readBuffer()
+                ret, cdr_data = self._connectors[0].deserializeData(value)
                 if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
-                    return data
+                    data = cdr_data
 
-        return self._value
+        del guard
+        if self._creditdirty:
+            self.notifyCredit()
+        return data
 
     ##
     # @if jp
@@ -813,7 +902,10 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             return None
 
         if not self._bufferzeromode:
-            return self.readBufferMode()
+            data = self.readBufferMode()
+            if self._creditdirty:
+                self.notifyCredit()
+            return data
         else:
             return self.readZeroMode()
 
@@ -858,7 +950,7 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             if self._ctrl._writing or self._thebuffer.empty():
                 self._ctrl._cond.wait(self._channeltimeout)
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
+                value = self.readBuffer()
 
                 ret, data = self._connectors[0].deserializeData(value)
                 if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
@@ -912,7 +1004,7 @@ class CSPInPort(OpenRTM_aist.InPortBase):
             self._ctrl._cond.wait(self._channeltimeout)
             self._ctrl._waiting = False
             if not self._thebuffer.empty():
-                _, value = self._thebuffer.read()
+                value = self.readBuffer()
                 ret, data = self._connectors[0].deserializeData(value)
                 if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
                     return data
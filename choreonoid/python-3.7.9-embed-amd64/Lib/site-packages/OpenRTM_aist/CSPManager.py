@@ -59,6 +59,9 @@ class CSPManager(object):
     def __init__(self):
         self._outports = []
         self._inports = []
+        self._outportset = set()
+        self._inportset = set()
+        self._ready = {}
         self._ctrl = CSPManager.CSPThreadCtrl()
         self._writableOutPort = None
         self._readableInPort = None
@@ -104,6 +107,9 @@ class CSPManager(object):
             port.releaseManager()
         self._outports = []
         self._inports = []
+        self._outportset = set()
+        self._inportset = set()
+        self._ready = {}
 
     ##
     # @if jp
@@ -216,9 +222,9 @@ class CSPManager(object):
         for port in ports:
             ret = port.select()
             if ret:
-                if port in self._inports:
+                if port in self._inportset:
                     return True, None, port
-                elif port in self._outports:
+                elif port in self._outportset:
                     return True, port, None
         return False, None, None
 
@@ -248,14 +254,39 @@ class CSPManager(object):
         for port in ports:
             ret = port.reselect()
             if ret:
-                if isinstance(port, OpenRTM_aist.CSPInPort):
+                if port in self._inportset:
                     return True, None, port
-                elif isinstance(port, OpenRTM_aist.CSPEventPort.CSPEventPort):
-                    return True, None, port
-                elif isinstance(port, OpenRTM_aist.CSPOutPort):
+                elif port in self._outportset:
                     return True, port, None
         return False, None, None
 
+    ##
+    # @if jp
+    #
+    # @brief 書き込み可能の通知を受けたポートの一覧を取得する
+    #
+    # 取得したポートは一覧から削除する。
+    #
+    # @param self
+    # @return ポート一覧
+    #
+    # @else
+    #
+    # @brief Take the ports notified as ready
+    #
+    # The returned ports are removed from the ready set.
+    #
+    # @param self
+    # @return list of ports
+    #
+    # @endif
+    #
+    def takeReadyPorts(self):
+        guard = OpenRTM_aist.ScopedLock(self._ctrl._cond)
+        ports = list(self._ready)
+        self._ready.clear()
+        return ports
+
     ##
     # @if jp
     #
@@ -283,6 +314,11 @@ class CSPManager(object):
     def select(self, timeout):
         ports1, ports2 = self.getPorts()
 
+        ret, outport, inport = self.selectPort(self.takeReadyPorts())
+
+        if ret:
+            return ret, outport, inport
+
         ret, outport, inport = self.selectPort(ports2)
 
         if ret:
@@ -315,6 +351,7 @@ class CSPManager(object):
                     self._writableOutPort = None
                     self._readableInPort = None
                     return True, outport, inport
+                return self.selectPort(self.takeReadyPorts())
         return False, None, None
 
     ##
@@ -349,6 +386,40 @@ class CSPManager(object):
         else:
             return False
 
+    ##
+    # @if jp
+    #
+    # @brief ポートが書き込み可能になったことを通知
+    #
+    # InPortからのクレジット通知により書き込み可能になったOutPortを
+    # 書き込み可能なポートの一覧に追加する。select関数で待機している
+    # 場合は待機を解除し、一覧のポートを再度選択する。
+    #
+    # @param self
+    # @param port ポート
+    #
+    # @else
+    #
+    # @brief Notify that a port became writable
+    #
+    # Adds an OutPort that became writable by a credit notification of
+    # the InPort to the ready set. A select() waiting for ports is woken
+    # up and tries the ready ports again.
+    #
+    # @param self
+    # @param port port
+    #
+    # @endif
+    #
+    def notifyReady(self, port):
+        guard = OpenRTM_aist.ScopedLock(self._ctrl._cond)
+        if port not in self._outportset and port not in self._inportset:
+            return
+        self._ready[port] = True
+        if self._ctrl._waiting:
+            self._ctrl._timeout = False
+            self._ctrl._cond.notify()
+
     ##
     # @if jp
     #
@@ -368,6 +439,7 @@ class CSPManager(object):
     #
     def addInPort(self, port):
         self._inports.append(port)
+        self._inportset.add(port)
 
     ##
     # @if jp
@@ -388,6 +460,7 @@ class CSPManager(object):
     #
     def addOutPort(self, port):
         self._outports.append(port)
+        self._outportset.add(port)
 
     ##
     # @if jp
@@ -408,6 +481,8 @@ class CSPManager(object):
     #
     def removeInPort(self, port):
         self._inports.remove(port)
+        self._inportset.discard(port)
+        self._ready.pop(port, None)
 
     ##
     # @if jp
@@ -428,6 +503,8 @@ class CSPManager(object):
     #
     def removeOutPort(self, port):
         self._outports.remove(port)
+        self._outportset.discard(port)
+        self._ready.pop(port, None)
 
     class CSPThreadCtrl:
         def __init__(self):
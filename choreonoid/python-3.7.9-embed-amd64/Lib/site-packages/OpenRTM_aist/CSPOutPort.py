@@ -156,6 +156,8 @@ class CSPOutPort(OpenRTM_aist.OutPortBase):
             self._buffdata, self._ctrl, self._channeltimeout, self, self._manager)
         self._read_listener = OpenRTM_aist.CSPOutPort.ReadListener(
             self._buffdata, self._ctrl, self._channeltimeout)
+        self._credit_listener = OpenRTM_aist.CSPOutPort.CreditListener(
+            self, self._manager)
 
     ##
     # @if jp
@@ -176,6 +178,7 @@ class CSPOutPort(OpenRTM_aist.OutPortBase):
     #
     def setManager(self, manager):
         self._readable_listener.setManager(manager)
+        self._credit_listener.setManager(manager)
         self._manager = manager
         if manager:
             self._manager.addOutPort(self)
@@ -197,6 +200,7 @@ class CSPOutPort(OpenRTM_aist.OutPortBase):
     #
     def releaseManager(self):
         self._readable_listener.releaseManager()
+        self._credit_listener.releaseManager()
         self._manager = None
 
     ##
@@ -229,6 +233,8 @@ class CSPOutPort(OpenRTM_aist.OutPortBase):
         for con in self._connectors:
             con.setIsReadableListener(self._readable_listener)
             con.setReadListener(self._read_listener)
+            if hasattr(con, "setCreditListener"):
+                con.setCreditListener(self._credit_listener)
         return (ret, prof)
 
     ##
@@ -713,6 +719,120 @@ class CSPOutPort(OpenRTM_aist.OutPortBase):
             guard_manager = OpenRTM_aist.Guard.ScopedLock(self._mutex)
             self._manager = None
 
+    ##
+    # @if jp
+    #
+    # @class CreditListener
+    #
+    # @brief クレジット通知時のリスナ
+    # 接続先のInPortからクレジットの通知を受けた場合に、
+    # CSPManagerにポートが送信可能になったことを通知する
+    #
+    #
+    # @else
+    #
+    # @class CreditListener
+    #
+    # @brief Listener called on credit notification
+    # Tells the CSPManager that the port became ready when the
+    # connected InPort pushes credit.
+    #
+    #
+    # @endif
+    #
+    class CreditListener:
+        ##
+        # @if jp
+        #
+        # @brief コンストラクタ
+        #
+        #
+        # @param self
+        # @param port ポート
+        # @param manager CSPManager
+        #
+        #
+        #
+        # @else
+        #
+        # @brief
+        #
+        # @param self
+        # @param port
+        # @param manager
+        #
+        # @endif
+        #
+        def __init__(self, port, manager=None):
+            self._port = port
+            self._manager = manager
+            self._mutex = threading.RLock()
+
+        ##
+        # @if jp
+        #
+        # @brief クレジット通知時のコールバック関数
+        #
+        #
+        # @param self
+        # @param con OutPortConnector
+        #
+        #
+        #
+        # @else
+        #
+        # @brief
+        #
+        # @param self
+        # @param con
+        #
+        # @endif
+        #
+        def __call__(self, con):
+            guard_manager = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+            if self._manager:
+                self._manager.notifyReady(self._port)
+
+        ##
+        # @if jp
+        #
+        # @brief CSPManagerの設定
+        #
+        # @param self
+        # @param manager CSPManager
+        #
+        # @else
+        #
+        # @brief
+        #
+        # @param self
+        # @param manager
+        #
+        # @endif
+        #
+        def setManager(self, manager):
+            guard_manager = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+            self._manager = manager
+
+        ##
+        # @if jp
+        #
+        # @brief CSPManagerの解除
+        #
+        # @param self
+        #
+        # @else
+        #
+        # @brief
+        #
+        # @param self
+        #
+        # @endif
+        #
+        def releaseManager(self):
+            guard_manager = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+            self._manager = None
+
     ##
     # @if jp
     #
@@ -664,6 +664,7 @@ class CorbaPort(OpenRTM_aist.PortBase):
         prop_list = []
         OpenRTM_aist.NVUtil.copyFromProperties(prop_list, self._properties)
         self._profile.properties.extend(prop_list)
+        self.profileChanged()
 
         num = -1
         ret, num = OpenRTM_aist.stringTo(num,
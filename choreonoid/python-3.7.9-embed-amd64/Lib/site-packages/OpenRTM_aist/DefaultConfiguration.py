@@ -94,10 +94,30 @@ default_config = ["config.version", OpenRTM_aist.openrtm_version,
                   "manager.nameservers", "default",
                   "manager.language", lang,
                   "manager.components.naming_policy", "process_unique",
+                  "manager.components.ns_unique.allocation", "lookup",
+                  "manager.components.ns_unique.cache_ttl", "1.0",
+                  "manager.components.ns_unique.reservation", "NO",
                   "manager.modules.C++.manager_cmd", "rtcd",
                   "manager.modules.Python.manager_cmd", "rtcd_python",
                   "manager.modules.Java.manager_cmd", "rtcd_java",
                   "manager.modules.search_auto", "YES",
+                  "manager.modules.index.file", "",
+                  "manager.modules.index.rescan_interval", "10.0",
+                  "manager.slave_pool.size", "0",
+                  "manager.slave_pool.languages", "",
+                  "manager.slave_pool.preload", "",
+                  "manager.thread_placement.interval", "1.0",
+                  "manager.thread_placement.report_file", "",
+                  "manager.liveness_monitor.enable", "YES",
+                  "manager.liveness_monitor.interval", "1.0",
+                  "manager.liveness_monitor.max_interval", "10.0",
+                  "manager.liveness_monitor.concurrency", "4",
+                  "manager.profiler.enable", "NO",
+                  "manager.profiler.interval", "0.01",
+                  "manager.profiler.components", "",
+                  "manager.profiler.max_depth", "64",
+                  "manager.profiler.max_stacks", "10000",
+                  "manager.profiler.output_file", "rtc_profile_%p.folded",
                   "manager.local_service.enabled_services", "ALL",
                   "sdo.service.provider.enabled_services", "ALL",
                   "sdo.service.consumer.enabled_services", "ALL",
@@ -16,6 +16,8 @@
 import OpenRTM_aist
 import OpenRTM_aist.Macho
 import copy
+import threading
+import collections
 
 
 ##
@@ -145,6 +147,207 @@ class Event1(Event0):
     def __call__(self):
         self._eb.run(self._data)
 
+##
+# @if jp
+#
+# @class EventSlot
+#
+# @brief イベント名毎の受信キュー
+# 優先度、集約方法、キューの長さを指定してバインドしたイベントを保持し、
+# Machine の EventScheduler に実行待ちとして登録する。
+# 集約方法は以下のいずれか。
+# - "" : 受信したイベントを全てキューに格納する。キューが一杯の場合は
+#        最も古いイベントを捨てる
+# - "latest" : 最新のイベントのみ保持する
+# - "count" : データを保持せず受信数のみ数える
+#
+# 受信数、実行数、破棄数、集約数を getStatus() で取得できる。
+#
+# @since 2.0.0
+#
+# @else
+#
+# @class EventSlot
+#
+# @brief Per event name receive queue
+# Holds the events bound with a priority, a coalescing policy or a
+# queue length, and registers itself to the EventScheduler of the
+# Machine while events are pending. The coalescing policy is one of
+# - "" : every event is queued; the oldest is dropped when full
+# - "latest" : only the newest event is kept
+# - "count" : no data is kept, only the number of events
+#
+# getStatus() returns the received, delivered, dropped and coalesced
+# counts.
+#
+# @since 2.0.0
+#
+# @endif
+#
+class EventSlot:
+    """
+    """
+
+    LATEST = "latest"
+    COUNT = "count"
+
+    ##
+    # @if jp
+    #
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param binder イベントを実行するバインダ(deliver()を持つ)
+    # @param scheduler EventScheduler
+    # @param priority 優先度
+    # @param coalesce 集約方法
+    # @param length キューの長さ(0以下の場合は8)
+    #
+    # @else
+    #
+    # @brief A constructor.
+    #
+    # @param self
+    # @param binder binder running the events (with deliver())
+    # @param scheduler EventScheduler
+    # @param priority priority
+    # @param coalesce coalescing policy
+    # @param length queue length (8 if 0 or less)
+    #
+    # @endif
+    #
+    def __init__(self, binder, scheduler, priority=0, coalesce="", length=0):
+        self._binder = binder
+        self._scheduler = scheduler
+        self._priority = priority
+        self._coalesce = OpenRTM_aist.normalize(coalesce or "")
+        if length <= 0:
+            length = OpenRTM_aist.RingBuffer.RINGBUFFER_DEFAULT_LENGTH
+        self._mutex = threading.Lock()
+        self._queue = collections.deque(maxlen=length)
+        self._count = 0
+        self._scheduled = False
+        self._received = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._coalesced = 0
+
+    ##
+    # @if jp
+    # @brief 集約方法の取得
+    # @else
+    # @brief Get the coalescing policy
+    # @endif
+    #
+    def getCoalesce(self):
+        return self._coalesce
+
+    ##
+    # @if jp
+    #
+    # @brief イベントを格納する
+    #
+    # @param self
+    # @param item イベントのデータ(count の場合は使用しない)
+    #
+    # @else
+    #
+    # @brief Store an event
+    #
+    # @param self
+    # @param item event data (unused for count)
+    #
+    # @endif
+    #
+    def push(self, item):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._received += 1
+        if self._coalesce == EventSlot.COUNT:
+            if self._count:
+                self._coalesced += 1
+            self._count += 1
+        elif self._coalesce == EventSlot.LATEST:
+            if self._queue:
+                self._coalesced += 1
+                self._queue.clear()
+            self._queue.append(item)
+        else:
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1
+            self._queue.append(item)
+        if not self._scheduled:
+            self._scheduled = True
+            self._scheduler.ready(self, self._priority)
+
+    ##
+    # @if jp
+    #
+    # @brief イベントを1つ実行する
+    # Machine.run_event() から呼び出す。イベントが残っている場合は
+    # 再度実行待ちとして登録する。
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Run one event
+    # Called from Machine.run_event(). The slot registers itself again
+    # while events remain.
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def deliver(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self._coalesce == EventSlot.COUNT:
+            item = self._count
+            self._count = 0
+        elif self._queue:
+            item = self._queue.popleft()
+        else:
+            self._scheduled = False
+            return
+        if self._queue:
+            self._scheduler.ready(self, self._priority)
+        else:
+            self._scheduled = False
+        self._delivered += 1
+        del guard
+        self._binder.deliver(item)
+
+    ##
+    # @if jp
+    #
+    # @brief 統計情報の取得
+    #
+    # @param self
+    # @return received(受信数)、delivered(実行数)、dropped(キューが一杯で
+    # 捨てた数)、coalesced(集約した数)、pending(実行待ちの数)の辞書
+    #
+    # @else
+    #
+    # @brief Get the statistics
+    #
+    # @param self
+    # @return dict of received, delivered, dropped (dropped because the
+    # queue was full), coalesced and pending
+    #
+    # @endif
+    #
+    def getStatus(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self._coalesce == EventSlot.COUNT:
+            pending = 1 if self._count else 0
+        else:
+            pending = len(self._queue)
+        return {"received": self._received,
+                "delivered": self._delivered,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+                "pending": pending}
+
+
 ##
 # @if jp
 #
@@ -199,6 +402,9 @@ class EventBinder0(OpenRTM_aist.ConnectorDataListener):
         self._eventName = event_name
         self._handler = handler
         self._buffer = buffer
+        self._slot = None
+        self._event = Event0(self)
+        self._fsmEvent = OpenRTM_aist.Macho.Event(self._handler)
 
     ##
     # @if jp
@@ -243,7 +449,10 @@ class EventBinder0(OpenRTM_aist.ConnectorDataListener):
     def __call__(self, info, cdrdata):
         if info.properties.getProperty(
                 "fsm_event_name") == self._eventName or info.name == self._eventName:
-            self._buffer.write(Event0(self))
+            if self._slot is not None:
+                self._slot.push(None)
+            else:
+                self._buffer.write(self._event)
 
             return OpenRTM_aist.ConnectorListenerStatus.NO_CHANGE, cdrdata
         return OpenRTM_aist.ConnectorListenerStatus.NO_CHANGE, cdrdata
@@ -265,7 +474,47 @@ class EventBinder0(OpenRTM_aist.ConnectorDataListener):
     # @endif
     #
     def run(self):
-        self._fsm.dispatch(OpenRTM_aist.Macho.Event(self._handler))
+        self._fsm.dispatch(self._fsmEvent)
+
+    ##
+    # @if jp
+    # @brief EventSlot から取り出したイベントを実行する
+    # @param self
+    # @param item イベントのデータ(使用しない)
+    # @else
+    # @brief Run an event taken from the EventSlot
+    # @param self
+    # @param item event data (unused)
+    # @endif
+    #
+    def deliver(self, item):
+        self.run()
+
+    ##
+    # @if jp
+    # @brief EventSlot の設定
+    # 設定した場合はバッファの代わりに EventSlot にイベントを格納する
+    # @param self
+    # @param slot EventSlot(Noneの場合はバッファを使用する)
+    # @else
+    # @brief Set the EventSlot
+    # When set, events are stored in the EventSlot instead of the buffer
+    # @param self
+    # @param slot EventSlot (None to use the buffer)
+    # @endif
+    #
+    def setSlot(self, slot):
+        self._slot = slot
+
+    ##
+    # @if jp
+    # @brief EventSlot の取得
+    # @else
+    # @brief Get the EventSlot
+    # @endif
+    #
+    def getSlot(self):
+        return self._slot
 
 
 ##
@@ -323,6 +572,7 @@ class EventBinder1(OpenRTM_aist.ConnectorDataListener):
         self._handler = handler
         self._data_type = data_type
         self._buffer = buffer
+        self._slot = None
 
     ##
     # @if jp
@@ -365,10 +615,13 @@ class EventBinder1(OpenRTM_aist.ConnectorDataListener):
     # @endif
     #
     def __call__(self, info, cdrdata):
-        data_ = OpenRTM_aist.ConnectorDataListenerT.__call__(
-            self, info, cdrdata, self._data_type, OpenRTM_aist.PortType.InPortType)
         if info.properties.getProperty(
                 "fsm_event_name") == self._eventName or info.name == self._eventName:
+            if self._slot is not None:
+                self._slot.push((info, cdrdata))
+                return OpenRTM_aist.ConnectorListenerStatus.NO_CHANGE, cdrdata
+            data_ = OpenRTM_aist.ConnectorDataListenerT.__call__(
+                self, info, cdrdata, self._data_type, OpenRTM_aist.PortType.InPortType)
             self._buffer.write(Event1(self, data_))
             return OpenRTM_aist.ConnectorListenerStatus.NO_CHANGE, cdrdata
         return OpenRTM_aist.ConnectorListenerStatus.NO_CHANGE, cdrdata
@@ -394,6 +647,56 @@ class EventBinder1(OpenRTM_aist.ConnectorDataListener):
     def run(self, data):
         self._fsm.dispatch(OpenRTM_aist.Macho.Event(self._handler, data))
 
+    ##
+    # @if jp
+    # @brief EventSlot から取り出したイベントを実行する
+    # データは実行時に復号化する。集約方法が count の場合はイベントの
+    # 数を引数としてイベントハンドラを実行する。
+    # @param self
+    # @param item (コネクタプロファイル, 受信データ)、もしくはイベントの数
+    # @else
+    # @brief Run an event taken from the EventSlot
+    # The data is deserialized here. With the count policy the handler
+    # gets the number of events as its argument.
+    # @param self
+    # @param item (connector profile, received data) or number of events
+    # @endif
+    #
+    def deliver(self, item):
+        if self._slot.getCoalesce() == EventSlot.COUNT:
+            self.run(item)
+            return
+        info, cdrdata = item
+        data_ = OpenRTM_aist.ConnectorDataListenerT.__call__(
+            self, info, cdrdata, self._data_type, OpenRTM_aist.PortType.InPortType)
+        self.run(data_)
+
+    ##
+    # @if jp
+    # @brief EventSlot の設定
+    # 設定した場合はバッファの代わりに EventSlot にイベントを格納する
+    # @param self
+    # @param slot EventSlot(Noneの場合はバッファを使用する)
+    # @else
+    # @brief Set the EventSlot
+    # When set, events are stored in the EventSlot instead of the buffer
+    # @param self
+    # @param slot EventSlot (None to use the buffer)
+    # @endif
+    #
+    def setSlot(self, slot):
+        self._slot = slot
+
+    ##
+    # @if jp
+    # @brief EventSlot の取得
+    # @else
+    # @brief Get the EventSlot
+    # @endif
+    #
+    def getSlot(self):
+        return self._slot
+
 
 ##
 # @if jp
@@ -572,6 +875,7 @@ class EventInPort(OpenRTM_aist.InPortBase):
         self._name = name
         self._fsm = fsm
         self._buffer = self._fsm.getBuffer()
+        self._binders = {}
 
     ##
     # @if jp
@@ -643,23 +947,39 @@ class EventInPort(OpenRTM_aist.InPortBase):
     # コネクタのON_RECEIVEDコールバック実行時にバッファに実行予定のイベントとして格納する
     # バッファに格納したイベントはMachineのrun_event関数で実行する
     #
+    # 優先度、集約方法、キューの長さのいずれかを指定した場合は、
+    # イベント名毎の EventSlot に格納し、優先度の順に実行する。
+    #
     # @param name イベント名
     # @param handler イベントハンドラ
+    # @param priority 優先度(大きいほど先に実行する、バッファのイベントは0)
+    # @param coalesce 集約方法("", "latest", "count")
+    # @param length キューの長さ
     #
     #
     # @else
     #
     # @brief
     #
+    # When a priority, a coalescing policy or a queue length is given,
+    # the events are kept in a per event name EventSlot and run in
+    # priority order.
+    #
     # @param name
     # @param handler
+    # @param priority priority (higher runs first, buffered events are 0)
+    # @param coalesce coalescing policy ("", "latest", "count")
+    # @param length queue length
     #
     # @endif
     #
 
-    def bindEvent0(self, name, handler):
+    def bindEvent0(self, name, handler, priority=0, coalesce="", length=0):
+        binder = EventBinder0(self._fsm, name, handler, self._buffer)
+        binder.setSlot(self.createSlot(binder, priority, coalesce, length))
+        self._binders[name] = binder
         self.addConnectorDataListener(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVED,
-                                      EventBinder0(self._fsm, name, handler, self._buffer))
+                                      binder)
     ##
     # @if jp
     #
@@ -667,23 +987,99 @@ class EventInPort(OpenRTM_aist.InPortBase):
     # コネクタのON_RECEIVEDコールバック実行時にバッファに実行予定のイベントとして格納する
     # バッファに格納したイベントはMachineのrun_event関数で実行する
     #
+    # 優先度、集約方法、キューの長さのいずれかを指定した場合は、
+    # イベント名毎の EventSlot に格納し、優先度の順に実行する。
+    # データの復号化は実行時に行うため、latest の場合は最新のデータのみ、
+    # count の場合はデータを復号化せず、イベントの数を引数とする。
+    #
     # @param name イベント名
     # @param handler イベントハンドラ
     # @param data_type データ型
+    # @param priority 優先度(大きいほど先に実行する、バッファのイベントは0)
+    # @param coalesce 集約方法("", "latest", "count")
+    # @param length キューの長さ
     #
     #
     # @else
     #
     # @brief
     #
+    # When a priority, a coalescing policy or a queue length is given,
+    # the events are kept in a per event name EventSlot and run in
+    # priority order. The data is deserialized when the event runs, so
+    # only the newest data is deserialized with "latest", and with
+    # "count" the handler gets the number of events instead.
     #
     # @param name
     # @param handler
     # @param data_type
+    # @param priority priority (higher runs first, buffered events are 0)
+    # @param coalesce coalescing policy ("", "latest", "count")
+    # @param length queue length
     #
     # @endif
     #
 
-    def bindEvent1(self, name, handler, data_type):
+    def bindEvent1(self, name, handler, data_type, priority=0, coalesce="", length=0):
+        binder = EventBinder1(self._fsm, name, handler, data_type, self._buffer)
+        binder.setSlot(self.createSlot(binder, priority, coalesce, length))
+        self._binders[name] = binder
         self.addConnectorDataListener(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVED,
-                                      EventBinder1(self._fsm, name, handler, data_type, self._buffer))
+                                      binder)
+
+    ##
+    # @if jp
+    #
+    # @brief EventSlot を生成する
+    # 優先度、集約方法、キューの長さがいずれも指定されていない場合は
+    # 生成しない
+    #
+    # @param binder バインダ
+    # @param priority 優先度
+    # @param coalesce 集約方法
+    # @param length キューの長さ
+    # @return EventSlot、もしくはNone
+    #
+    # @else
+    #
+    # @brief Create an EventSlot
+    # None if none of priority, coalescing policy and length is given
+    #
+    # @param binder binder
+    # @param priority priority
+    # @param coalesce coalescing policy
+    # @param length queue length
+    # @return EventSlot or None
+    #
+    # @endif
+    #
+    def createSlot(self, binder, priority, coalesce, length):
+        if not priority and not coalesce and length <= 0:
+            return None
+        return EventSlot(binder, self._fsm.getEventScheduler(),
+                         priority, coalesce, length)
+
+    ##
+    # @if jp
+    #
+    # @brief イベントの統計情報を取得する
+    #
+    # @param name イベント名
+    # @return EventSlot.getStatus() の辞書(EventSlot を使用しない
+    # イベントの場合は空)
+    #
+    # @else
+    #
+    # @brief Get the statistics of an event
+    #
+    # @param name event name
+    # @return dict of EventSlot.getStatus() (empty for events without
+    # an EventSlot)
+    #
+    # @endif
+    #
+    def getEventStatus(self, name):
+        binder = self._binders.get(name)
+        if binder is None or binder.getSlot() is None:
+            return {}
+        return binder.getSlot().getStatus()
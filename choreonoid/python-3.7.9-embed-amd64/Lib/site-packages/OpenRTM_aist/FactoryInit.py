@@ -19,6 +19,82 @@ import OpenRTM_aist
 from OpenRTM_aist.ext.sdo.observer import ComponentObserverConsumer
 
 
+##
+# @if jp
+# @class LazyCreator
+# @brief 遅延インポートするクラスの生成関数オブジェクト
+#
+# ファクトリから初めて生成される時点でクラスのモジュールをインポートする。
+#
+# @else
+# @class LazyCreator
+# @brief Creator of a lazily imported class
+#
+# The module of the class is imported when the factory creates the
+# first object.
+#
+# @endif
+#
+class LazyCreator:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param name OpenRTM_aistパッケージでのクラス名
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    # @param name class name in the OpenRTM_aist package
+    #
+    # @endif
+    def __init__(self, name):
+        self._name = name
+
+    def __call__(self):
+        return getattr(OpenRTM_aist, self._name)()
+
+
+##
+# @if jp
+# @brief 遅延インポートするクラスのファクトリ登録情報
+#
+# (ファクトリクラス名, 識別子, クラス名) のリスト
+#
+# @else
+# @brief Factory entries of lazily imported classes
+#
+# List of (factory class name, identifier, class name)
+#
+# @endif
+lazy_factories = [
+    ("PublisherFactory", "periodic", "PublisherPeriodic"),
+    ("InPortProviderFactory", "direct", "InPortDirectProvider"),
+    ("InPortConsumerFactory", "direct", "InPortDirectConsumer"),
+    ("OutPortProviderFactory", "direct", "OutPortDirectProvider"),
+    ("OutPortConsumerFactory", "direct", "OutPortDirectConsumer"),
+    ("InPortProviderFactory", "shared_memory", "InPortSHMProvider"),
+    ("InPortConsumerFactory", "shared_memory", "InPortSHMConsumer"),
+    ("OutPortProviderFactory", "shared_memory", "OutPortSHMProvider"),
+    ("OutPortConsumerFactory", "shared_memory", "OutPortSHMConsumer"),
+    ("NumberingPolicyFactory", "node_unique", "NodeNumberingPolicy"),
+    ("NumberingPolicyFactory", "ns_unique", "NamingServiceNumberingPolicy"),
+    ("OutPortProviderFactory", "data_service", "OutPortDSProvider"),
+    ("OutPortConsumerFactory", "data_service", "OutPortDSConsumer"),
+    ("InPortProviderFactory", "data_service", "InPortDSProvider"),
+    ("InPortConsumerFactory", "data_service", "InPortDSConsumer"),
+    ("InPortProviderFactory", "csp_channel", "InPortCSPProvider"),
+    ("InPortConsumerFactory", "csp_channel", "InPortCSPConsumer"),
+    ("OutPortProviderFactory", "csp_channel", "OutPortCSPProvider"),
+    ("OutPortConsumerFactory", "csp_channel", "OutPortCSPConsumer")
+]
+
+
 def FactoryInit():
     # Buffers
     OpenRTM_aist.CdrRingBufferInit()
@@ -29,32 +105,18 @@ def FactoryInit():
     # Publishers
     OpenRTM_aist.PublisherFlushInit()
     OpenRTM_aist.PublisherNewInit()
-    OpenRTM_aist.PublisherPeriodicInit()
 
     # Providers/Consumer
     OpenRTM_aist.InPortCorbaCdrProviderInit()
     OpenRTM_aist.InPortCorbaCdrConsumerInit()
     OpenRTM_aist.OutPortCorbaCdrConsumerInit()
     OpenRTM_aist.OutPortCorbaCdrProviderInit()
-    OpenRTM_aist.InPortDirectProviderInit()
-    OpenRTM_aist.InPortDirectConsumerInit()
-    OpenRTM_aist.OutPortDirectProviderInit()
-    OpenRTM_aist.OutPortDirectConsumerInit()
-    OpenRTM_aist.InPortSHMProviderInit()
-    OpenRTM_aist.InPortSHMConsumerInit()
-    OpenRTM_aist.OutPortSHMProviderInit()
-    OpenRTM_aist.OutPortSHMConsumerInit()
     OpenRTM_aist.ProcessUniquePolicyInit()
-    OpenRTM_aist.NodeNumberingPolicyInit()
-    OpenRTM_aist.NamingServiceNumberingPolicyInit()
     OpenRTM_aist.LogstreamFileInit()
-    OpenRTM_aist.OutPortDSProviderInit()
-    OpenRTM_aist.OutPortDSConsumerInit()
-    OpenRTM_aist.InPortDSProviderInit()
-    OpenRTM_aist.InPortDSConsumerInit()
-    OpenRTM_aist.InPortCSPProviderInit()
-    OpenRTM_aist.InPortCSPConsumerInit()
-    OpenRTM_aist.OutPortCSPProviderInit()
-    OpenRTM_aist.OutPortCSPConsumerInit()
     OpenRTM_aist.CORBA_CdrMemoryStreamInit()
     ComponentObserverConsumer.ComponentObserverConsumerInit()
+
+    # Transports, publishers and policies imported on first use
+    for factory, id_, name in lazy_factories:
+        getattr(OpenRTM_aist, factory).instance().addFactory(id_,
+                                                             LazyCreator(name))
@@ -1035,6 +1035,97 @@ class FsmStructureListener:
     toString = staticmethod(toString)
 
 
+##
+# @if jp
+# @class FsmTransitionListener クラス
+# @brief FsmTransitionListener クラス
+#
+# FsmTransitionListener クラスは、FSMの状態遷移が完了した時に、遷移元
+# の状態、遷移先の状態、遷移の契機となったイベントの名前の差分のみを
+# 受け取るリスナーオブジェクトの基底クラスである。遷移中に呼ばれる
+# PreFsmActionListener、PostFsmActionListener と異なり、1回の状態遷移
+# について1回だけ呼び出される。
+#
+# <pre>
+# class MyListener(OpenRTM_aist.FsmTransitionListener):
+#     def __call__(self, from_, to, event):
+#         print(from_, "->", to, event)
+# </pre>
+#
+# このようにして定義されたリスナクラスは、
+# RTObject_impl.addFsmTransitionListener() によりセットする。
+#
+# @else
+# @class FsmTransitionListener class
+# @brief FsmTransitionListener class
+#
+# FsmTransitionListener class is a base class for the listener
+# objects which receive only the delta of a completed FSM state
+# transition: the source state, the target state and the name of the
+# event that caused it. Unlike PreFsmActionListener and
+# PostFsmActionListener, which are called during the transition, it is
+# called once per state transition.
+#
+# <pre>
+# class MyListener(OpenRTM_aist.FsmTransitionListener):
+#     def __call__(self, from_, to, event):
+#         print(from_, "->", to, event)
+# </pre>
+#
+# The listener class defined above is set by
+# RTObject_impl.addFsmTransitionListener().
+#
+# @endif
+#
+class FsmTransitionListener:
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        pass
+
+    ##
+    # @if jp
+    # @brief デストラクタ
+    # @else
+    # @brief Destructor
+    # @endif
+    #
+
+    def __del__(self):
+        pass
+
+    ##
+    # @if jp
+    #
+    # @brief 仮想コールバック関数
+    #
+    # FsmTransitionListener のコールバック関数
+    #
+    # @param from_ 遷移元の状態名
+    # @param to 遷移先の状態名
+    # @param event イベント名
+    #
+    # @else
+    #
+    # @brief Virtual Callback function
+    #
+    # This is a the Callback function for FsmTransitionListener.
+    #
+    # @param from_ source state name
+    # @param to target state name
+    # @param event event name
+    #
+    # @endif
+    #
+    def __call__(self, from_, to, event):
+        pass
+
+
 ##
 # @if jp
 # @class PreFsmActionListenerHolder
@@ -1475,6 +1566,113 @@ class FsmStructureListenerHolder:
         return
 
 
+##
+# @if jp
+# @class FsmTransitionListenerHolder
+# @brief FsmTransitionListener ホルダクラス
+#
+# 複数の FsmTransitionListener を保持し管理するクラス。
+#
+# @else
+# @class FsmTransitionListenerHolder
+# @brief FsmTransitionListener holder class
+#
+# This class manages one ore more instances of
+# FsmTransitionListener class.
+#
+# @endif
+#
+class FsmTransitionListenerHolder:
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._listeners = []
+        self._mutex = threading.RLock()
+
+    ##
+    # @if jp
+    #
+    # @brief リスナーの追加
+    #
+    # @param listener 追加するリスナ
+    # @else
+    #
+    # @brief Add the listener.
+    #
+    # @param listener Added listener
+    # @endif
+    #
+    def addListener(self, listener):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        self._listeners.append(listener)
+
+    ##
+    # @if jp
+    #
+    # @brief リスナーの削除
+    #
+    # @param listener 削除するリスナ
+    # @else
+    #
+    # @brief Remove the listener.
+    #
+    # @param listener Removed listener
+    # @endif
+    #
+    def removeListener(self, listener):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        len_ = len(self._listeners)
+        for i in range(len_):
+            idx = (len_ - 1) - i
+            if self._listeners[idx] == listener:
+                del self._listeners[idx]
+                return
+
+    ##
+    # @if jp
+    #
+    # @brief リスナーが登録されているかどうか
+    #
+    # @return 登録されている場合にTrue
+    # @else
+    #
+    # @brief Whether any listener is registered
+    #
+    # @return True if registered
+    # @endif
+    #
+    def hasListeners(self):
+        return len(self._listeners) > 0
+
+    ##
+    # @if jp
+    #
+    # @brief リスナーへ通知する
+    #
+    # @param from_ 遷移元の状態名
+    # @param to 遷移先の状態名
+    # @param event イベント名
+    # @else
+    #
+    # @brief Notify listeners.
+    #
+    # @param from_ source state name
+    # @param to target state name
+    # @param event event name
+    # @endif
+    #
+    def notify(self, from_, to, event):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        for listener in self._listeners:
+            listener(from_, to, event)
+        return
+
+
 ##
 # @if jp
 # @class FsmActionListeners
@@ -1550,6 +1748,14 @@ class FsmActionListeners:
         self.structure_ = [FsmStructureListenerHolder()
                            for i in range(self.structure_num)]
 
+        ##
+        # @if jp
+        # @brief FsmTransitionListener ホルダ
+        # @else
+        # @brief FsmTransitionListener holder
+        # @endif
+        self.transition_ = FsmTransitionListenerHolder()
+
     ##
     # @if jp
     # @brief リスナーの追加
@@ -1835,3 +2041,61 @@ class FsmActionListeners:
     def notifyStructure(self, ltype, ec_id):
         if ltype < len(self.structure_):
             self.structure_[ltype].notify(ec_id)
+
+    ##
+    # @if jp
+    # @brief FsmTransitionListener の追加
+    #
+    # @param self
+    # @param listener 追加するリスナ
+    #
+    # @else
+    # @brief Add a FsmTransitionListener
+    #
+    # @param self
+    # @param listener listener to add
+    #
+    # @endif
+    def addTransitionListener(self, listener):
+        self.transition_.addListener(listener)
+        return True
+
+    ##
+    # @if jp
+    # @brief FsmTransitionListener の削除
+    #
+    # @param self
+    # @param listener 削除するリスナ
+    #
+    # @else
+    # @brief Remove a FsmTransitionListener
+    #
+    # @param self
+    # @param listener listener to remove
+    #
+    # @endif
+    def removeTransitionListener(self, listener):
+        self.transition_.removeListener(listener)
+        return True
+
+    ##
+    # @if jp
+    # @brief FsmTransitionListener へ状態遷移を通知する
+    #
+    # @param self
+    # @param from_ 遷移元の状態名
+    # @param to 遷移先の状態名
+    # @param event イベント名
+    #
+    # @else
+    # @brief Notify a state transition to the FsmTransitionListeners
+    #
+    # @param self
+    # @param from_ source state name
+    # @param to target state name
+    # @param event event name
+    #
+    # @endif
+    def notifyTransition(self, from_, to, event):
+        if self.transition_.hasListeners():
+            self.transition_.notify(from_, to, event)
@@ -16,10 +16,11 @@
 
 
 import copy
+import heapq
+import itertools
 
 
 import OpenRTM_aist
-import threading
 
 ##
 # @if jp
@@ -91,8 +92,11 @@ class InPort(OpenRTM_aist.InPortBase):
         self._OnRead = None
         self._OnReadConvert = None
 
-        self._directNewData = False
-        self._valueMutex = threading.RLock()
+        # latest sample written directly by a push connector:
+        # (sequence, data), replaced as a whole so that no lock is needed
+        self._directCount = itertools.count(1)
+        self._directSlot = (0, value)
+        self._directRead = 0
 
         marshaling_types = OpenRTM_aist.SerializerFactories.instance().getSerializerList(value)
         marshaling_types = OpenRTM_aist.flatten(marshaling_types).lstrip()
@@ -149,14 +153,10 @@ class InPort(OpenRTM_aist.InPortBase):
     # bool isNew()
 
     def isNew(self, names=None):
-        self._rtcout.RTC_TRACE("isNew()")
-
-        guard = OpenRTM_aist.ScopedLock(self._valueMutex)
-        if self._directNewData == True:
-            self._rtcout.RTC_TRACE(
-                "isNew() returns true because of direct write.")
+        if self._directSlot[0] != self._directRead:
             return True
-        del guard
+
+        self._rtcout.RTC_TRACE("isNew()")
 
         if not self._connectors:
             self._rtcout.RTC_DEBUG("no connectors")
@@ -225,9 +225,9 @@ class InPort(OpenRTM_aist.InPortBase):
     # bool isEmpty()
 
     def isEmpty(self, names=None):
-        self._rtcout.RTC_TRACE("isEmpty()")
-        if self._directNewData == True:
+        if self._directSlot[0] != self._directRead:
             return False
+        self._rtcout.RTC_TRACE("isEmpty()")
         if not self._connectors:
             self._rtcout.RTC_DEBUG("no connectors")
             return True
@@ -340,36 +340,43 @@ class InPort(OpenRTM_aist.InPortBase):
     #  DataType read()
 
     def read(self, name=None):
-        self._rtcout.RTC_TRACE("DataType read()")
-
         if self._OnRead is not None:
             self._OnRead()
-            self._rtcout.RTC_TRACE("OnRead called")
-
-        guard = OpenRTM_aist.ScopedLock(self._valueMutex)
-        if self._directNewData == True:
 
-            self._rtcout.RTC_TRACE("Direct data transfer")
+        # direct data transfer: no copy and no logging per sample
+        seq, data = self._directSlot
+        if seq != self._directRead:
+            self._directRead = seq
             if self._OnReadConvert is not None:
-                self._value = self._OnReadConvert(self._value)
-                self._rtcout.RTC_TRACE("OnReadConvert for direct data called")
-            self._directNewData = False
-            return self._value
-        del guard
+                data = self._OnReadConvert(data)
+            self._value = data
+            return data
+
+        # direct pull connectors are read without logging
+        if name is None and self._connectors:
+            con = self._connectors[0]
+            if con.directMode():
+                ret, _val = con.read(self.readTarget(con))
+                if ret == OpenRTM_aist.DataPortStatus.PORT_OK:
+                    if self._OnReadConvert is not None:
+                        _val = self._OnReadConvert(_val)
+                    self._value = _val
+                return self._value
+
+        self._rtcout.RTC_TRACE("DataType read()")
 
         if not self._connectors:
             self._rtcout.RTC_DEBUG("no connectors")
             return self._value
 
-        _val = copy.deepcopy(self._value)
-
         if name is None:
-            ret, _val = self._connectors[0].read(_val)
+            con = self._connectors[0]
+            ret, _val = con.read(self.readTarget(con))
         else:
             ret = OpenRTM_aist.DataPortStatus.PRECONDITION_NOT_MET
             for con in self._connectors:
                 if con.name() == name:
-                    ret, _val = con.read(_val)
+                    ret, _val = con.read(self.readTarget(con))
             if ret == OpenRTM_aist.DataPortStatus.PRECONDITION_NOT_MET:
                 self._rtcout.RTC_DEBUG("not found %s", name)
                 return self._value
@@ -395,6 +402,104 @@ class InPort(OpenRTM_aist.InPortBase):
         self._rtcout.RTC_ERROR("unknown retern value from buffer.read()")
         return self._value
 
+    ##
+    # @if jp
+    #
+    # @brief 全てのコネクタから未読データを一括で読み出す
+    #
+    # 各コネクタのバッファに格納されている未読データを全て読み出し、
+    # 一つのリストにして返す。データ毎のコピーやログ出力は行わない。
+    #
+    # order が "timestamp" の場合はデータのタイムスタンプ(tm)の順に
+    # マージする。各コネクタのデータは到着順のままなので、
+    # timestamp_policy が on_received のコネクタでは到着順となる。
+    # "connector" の場合はコネクタ毎の到着順のデータをコネクタの順に
+    # 連結する。タイムスタンプを持たないデータ型は常にコネクタ順となる。
+    #
+    # OnRead は一度だけ呼び出され、OnReadConvert はデータ毎に呼び出される。
+    # 読み出したデータがある場合は最後のデータをバインドされた変数に設定する。
+    #
+    # @param self
+    # @param names 読み出すコネクタ名、もしくはコネクタ名のリスト
+    #              (Noneの場合は全てのコネクタ)
+    # @param order マージ順("timestamp"、もしくは"connector")
+    #
+    # @return 読み出したデータのリスト
+    #
+    # @else
+    #
+    # @brief Read all unread data from every connector at once
+    #
+    # Reads every unread sample from the buffers of the connectors and
+    # returns them in one list, without copying or logging per sample.
+    #
+    # With order "timestamp" the samples are merged by their timestamp
+    # (tm). Each connector keeps arrival order, so connectors with
+    # timestamp_policy on_received yield arrival order. With
+    # "connector" the samples of each connector are concatenated in
+    # connector order. Data types without a timestamp always use
+    # connector order.
+    #
+    # OnRead is called once and OnReadConvert is called per sample. The
+    # bound variable is set to the last sample, if any.
+    #
+    # @param self
+    # @param names connector name or list of connector names
+    #              (None for all connectors)
+    # @param order merge order ("timestamp" or "connector")
+    #
+    # @return list of the samples read
+    #
+    # @endif
+    #
+    # std::vector<DataType> readAll()
+    def readAll(self, names=None, order="timestamp"):
+        self._rtcout.RTC_TRACE("readAll()")
+
+        if self._OnRead is not None:
+            self._OnRead()
+            self._rtcout.RTC_TRACE("OnRead called")
+
+        values = []
+        seq, data = self._directSlot
+        if seq != self._directRead:
+            self._directRead = seq
+            values.append(data)
+
+        if isinstance(names, str):
+            names = [names]
+
+        results = []
+        for con in self._connectors[:]:
+            if names is not None and con.name() not in names:
+                continue
+            ret, data = con.readAll(self._value)
+            if ret != OpenRTM_aist.DataPortStatus.PORT_OK:
+                self._rtcout.RTC_WARN("readAll() failed on %s: %s",
+                                      (con.name(),
+                                       OpenRTM_aist.DataPortStatus.toString(ret)))
+            if data:
+                results.append(data)
+
+        if len(results) == 1:
+            values.extend(results[0])
+        elif order == "timestamp" and hasattr(self._value, "tm"):
+            values.extend(heapq.merge(
+                *results, key=lambda v: (v.tm.sec, v.tm.nsec)))
+        else:
+            for data in results:
+                values.extend(data)
+
+        if not values:
+            return values
+
+        if self._OnReadConvert is not None:
+            values = [self._OnReadConvert(v) for v in values]
+            self._rtcout.RTC_DEBUG("OnReadConvert called")
+
+        self._value = values[-1]
+        return values
+
     ##
     # @if jp
     #
@@ -416,6 +521,37 @@ class InPort(OpenRTM_aist.InPortBase):
     def update(self):
         self.read()
 
+    ##
+    # @if jp
+    #
+    # @brief コネクタの read() に与えるデータ
+    #
+    # デシリアライザはデータを直接書き換える場合があるため、
+    # バインドされた変数のコピーを与える。ダイレクト接続のコネクタは
+    # 引数を使用しないため、コピーしない。
+    #
+    # @param self
+    # @param con コネクタ
+    # @return データ
+    #
+    # @else
+    #
+    # @brief Data given to read() of a connector
+    #
+    # Deserializers may fill the data in place, so a copy of the bound
+    # variable is given. Direct connectors do not use the argument and
+    # get no copy.
+    #
+    # @param self
+    # @param con connector
+    # @return data
+    #
+    # @endif
+    def readTarget(self, con):
+        if con.directMode():
+            return self._value
+        return copy.deepcopy(self._value)
+
     ##
     # @if jp
     #
@@ -453,6 +589,38 @@ class InPort(OpenRTM_aist.InPortBase):
     def setOnReadConvert(self, on_rconvert):
         self._OnReadConvert = on_rconvert
 
+    ##
+    # @if jp
+    #
+    # @brief データ受信時のコールバックの設定
+    #
+    # 接続プロファイルの decode_on_receive が YES の Push 型コネクタで、
+    # 受信したデータを復号化した後に受信したスレッドで呼ばれる
+    # コールバックオブジェクトを設定する。コールバックオブジェクトの
+    # 戻り値がバッファに格納され、read() で読み出される。
+    #
+    # @param self
+    # @param on_rconvert 設定対象コールバックオブジェクト
+    #
+    # @else
+    #
+    # @brief Set the callback called on receive
+    #
+    # For push connectors with decode_on_receive set to YES, the
+    # callback is called on the receiving thread with the decoded data.
+    # Its return value is buffered and later returned by read().
+    #
+    # @param self
+    # @param on_rconvert callback object
+    #
+    # @endif
+
+    def setOnReceiveConvert(self, on_rconvert):
+        self._OnReceiveConvert = on_rconvert
+        for con in self._connectors[:]:
+            if isinstance(con, OpenRTM_aist.InPortPushConnector):
+                con.setOnReceiveConvert(on_rconvert)
+
     ##
     # @if jp
     #
@@ -469,7 +637,4 @@ class InPort(OpenRTM_aist.InPortBase):
     # @endif
     # void write(const DataType& data)
     def write(self, data):
-        guard = OpenRTM_aist.ScopedLock(self._valueMutex)
-        self._value = data
-        self._directNewData = True
-        del guard
+        self._directSlot = (next(self._directCount), data)
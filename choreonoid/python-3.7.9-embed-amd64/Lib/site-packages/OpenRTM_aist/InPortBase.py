@@ -96,6 +96,7 @@ class InPortBase(OpenRTM_aist.PortBase, OpenRTM_aist.DataPortStatus):
         self._consumerTypes = ""
         self._connectors = []
         self._connector_mutex = threading.RLock()
+        self._OnReceiveConvert = None
 
         # PortProfile::properties を設定
         self._rtcout.RTC_DEBUG("setting port.port_type: DataInPort")
@@ -170,6 +171,7 @@ class InPortBase(OpenRTM_aist.PortBase, OpenRTM_aist.DataPortStatus):
         prop_list = []
         OpenRTM_aist.NVUtil.copyFromProperties(prop_list, self._properties)
         self._profile.properties.extend(prop_list)
+        self.profileChanged()
 
         if self._singlebuffer:
             self._rtcout.RTC_DEBUG("single buffer mode.")
@@ -928,6 +930,8 @@ class InPortBase(OpenRTM_aist.PortBase, OpenRTM_aist.DataPortStatus):
                 return RTC.RTC_ERROR
 
             connector.setDataType(self._value)
+            if self._OnReceiveConvert is not None:
+                connector.setOnReceiveConvert(self._OnReceiveConvert)
             # So that a provider gets endian information from a connector.
             provider.setConnector(connector)
 
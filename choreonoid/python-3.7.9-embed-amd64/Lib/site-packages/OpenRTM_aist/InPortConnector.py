@@ -180,6 +180,41 @@ class InPortConnector(OpenRTM_aist.ConnectorBase):
     def read(self, data=None):
         pass
 
+    ##
+    # @if jp
+    # @brief 未読データの一括読み出し
+    #
+    # バッファに格納されている未読データを全て読み出す。読み出し開始時に
+    # バッファに格納されていた数だけ read() を呼び出すため、読み出し中に
+    # 書き込まれたデータは読み出さない。
+    #
+    # @param data 読み出すデータ型のインスタンス
+    # @return リターンコード、読み出したデータのリスト
+    #
+    # @else
+    # @brief Read all unread data
+    #
+    # Reads every unread sample stored in the buffer. read() is called
+    # as many times as the buffer held samples when reading started,
+    # so samples written meanwhile are left for the next call.
+    #
+    # @param data instance of the data type to read
+    # @return return code, list of the data read
+    #
+    # @endif
+    #
+    def readAll(self, data=None):
+        if not self._buffer:
+            return self.PRECONDITION_NOT_MET, []
+
+        values = []
+        for _ in range(self._buffer.readable()):
+            ret, value = self.read(data)
+            if ret != self.PORT_OK:
+                break
+            values.append(value)
+        return self.PORT_OK, values
+
     # void setConnectorInfo(ConnectorInfo profile);
     def setConnectorInfo(self, profile):
         self._profile = profile
@@ -215,6 +250,26 @@ class InPortConnector(OpenRTM_aist.ConnectorBase):
     def setDataType(self, data):
         self._dataType = data
 
+    ##
+    # @if jp
+    # @brief ダイレクト接続モードかの判定
+    #
+    # ダイレクト接続モードの場合、read() は引数のデータを使用しない。
+    #
+    # @return True：ダイレクト接続モード,False：それ以外
+    #
+    # @else
+    # @brief Whether the connector is in direct mode
+    #
+    # In direct mode read() does not use the data given as argument.
+    #
+    # @return True: direct mode, False: otherwise
+    #
+    # @endif
+    #
+    def directMode(self):
+        return False
+
     def write(self, data):
         pass
 
@@ -192,6 +192,26 @@ class InPortDuplexConnector(OpenRTM_aist.InPortConnector):
             return self._consumer.isReadable(retry)
         return False
 
+    ##
+    # @if jp
+    # @brief バッファの空き数をOutPort側に通知
+    #
+    # @param self
+    # @param credit バッファの空き数
+    #
+    # @else
+    #
+    # @brief Push the number of free buffer slots to the OutPort
+    #
+    # @param self
+    # @param credit number of free slots
+    #
+    # @endif
+    #
+    def notifyCredit(self, credit):
+        if self._consumer:
+            self._consumer.notifyCredit(credit)
+
     ##
     # @if jp
     # @brief 接続解除
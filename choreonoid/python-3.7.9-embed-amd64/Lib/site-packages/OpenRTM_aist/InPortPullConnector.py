@@ -204,32 +204,16 @@ class InPortPullConnector(OpenRTM_aist.InPortConnector):
     # virtual ReturnCode read(cdrMemoryStream& data);
 
     def read(self, data=None):
-        self._rtcout.RTC_TRACE("InPortPullConnector.read()")
-
+        # direct mode: no deserialization and no logging per sample
         if self._directOutPort is not None:
             if self._directOutPort.isEmpty():
                 self._listeners.notify(
                     OpenRTM_aist.ConnectorListenerType.ON_BUFFER_EMPTY, self._profile)
                 self._outPortListeners.notify(
                     OpenRTM_aist.ConnectorListenerType.ON_SENDER_EMPTY, self._profile)
-                self._rtcout.RTC_TRACE("ON_BUFFER_EMPTY(InPort,OutPort), ")
-                self._rtcout.RTC_TRACE("ON_SENDER_EMPTY(InPort,OutPort) ")
-                self._rtcout.RTC_TRACE("callback called in direct mode.")
-
-            data = self._directOutPort.read()
-            #self._outPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_BUFFER_READ, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_BUFFER_READ(OutPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
-            #self._outPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_SEND, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_SEND(OutPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
-            #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVED, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_RECEIVED(InPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
-            #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_SEND, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_BUFFER_WRITE(InPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
-            return self.PORT_OK, data
+            return self.PORT_OK, self._directOutPort.read()
+
+        self._rtcout.RTC_TRACE("InPortPullConnector.read()")
 
         if not self._consumer:
             return self.PORT_ERROR, data
@@ -264,6 +248,31 @@ class InPortPullConnector(OpenRTM_aist.InPortConnector):
 
         return ret, data
 
+    ##
+    # @if jp
+    # @brief 未読データの一括読み出し
+    #
+    # Pull型の場合は read() で1つのデータを取得する。
+    #
+    # @param data 読み出すデータ型のインスタンス
+    # @return リターンコード、読み出したデータのリスト
+    #
+    # @else
+    # @brief Read all unread data
+    #
+    # A pull connector reads one sample with read().
+    #
+    # @param data instance of the data type to read
+    # @return return code, list of the data read
+    #
+    # @endif
+    #
+    def readAll(self, data=None):
+        ret, value = self.read(data)
+        if ret != self.PORT_OK:
+            return ret, []
+        return ret, [value]
+
     ##
     # @if jp
     # @brief 接続解除関数
@@ -398,6 +407,9 @@ class InPortPullConnector(OpenRTM_aist.InPortConnector):
         self._outPortListeners = self._directOutPort._listeners
         return True
 
+    def directMode(self):
+        return self._directOutPort is not None
+
     ##
     # @if jp
     # @brief コンシューマのインターフェースの登録を取り消す
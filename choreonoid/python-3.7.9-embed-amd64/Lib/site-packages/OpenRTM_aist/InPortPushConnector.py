@@ -43,6 +43,11 @@ import threading
 # InPortProvider::put() にデータが渡される。書き込まれたデータは
 # Connector 内で Buffer にデータが書き込まれる。
 #
+# 接続プロファイルの decode_on_receive が YES の場合は、受信したスレッド
+# (ORBのスレッド等)でデータを復号化してからバッファに書き込み、read() では
+# 復号化済みのデータを取り出すだけとする。このモードでは ON_BUFFER_READ の
+# リスナは復号化の直前に受信したスレッドで呼び出される。
+#
 # @since 1.0.0
 #
 # @else
@@ -67,6 +72,12 @@ import threading
 # InPortProvider::put() by OutPortConnector.  The data is written
 # into the buffer in the connector.
 #
+# When decode_on_receive is YES in the connector profile, the data is
+# deserialized on the receiving thread (an ORB thread or the like)
+# before it is buffered, and read() only takes the decoded value out.
+# In this mode ON_BUFFER_READ listeners are called on the receiving
+# thread just before deserialization.
+#
 # @since 1.0.0
 #
 # @endif
@@ -154,6 +165,11 @@ class InPortPushConnector(OpenRTM_aist.InPortConnector):
 
         self._serializer = None
 
+        self._decode_on_receive = OpenRTM_aist.toBool(info.properties.getProperty(
+            "decode_on_receive"), "YES", "NO", False)
+        self._receiveSerializer = None
+        self._OnReceiveConvert = None
+
         return
 
     ##
@@ -290,6 +306,8 @@ class InPortPushConnector(OpenRTM_aist.InPortConnector):
 
         if ret != self.PORT_OK:
             return ret, data
+        elif isinstance(cdr, InPortPushConnector.DecodedData):
+            return self.PORT_OK, cdr.value
         else:
             cdr = self.onBufferRead(cdr)
             if self._serializer is None:
@@ -313,6 +331,77 @@ class InPortPushConnector(OpenRTM_aist.InPortConnector):
 
         return self.PORT_ERROR, data
 
+    ##
+    # @if jp
+    # @brief 未読データの一括読み出し
+    #
+    # 読み出し開始時にバッファに格納されていたデータを全て読み出し、
+    # 復号化する。データ毎のログ出力は行わない。結果のリストは読み出し
+    # 開始時のデータ数で確保しておく。
+    #
+    # @param data 読み出すデータ型のインスタンス
+    # @return リターンコード、読み出したデータのリスト
+    # 復号化に失敗した場合は UNKNOWN_ERROR と失敗までに読み出したデータを返す
+    #
+    # @else
+    # @brief Read all unread data
+    #
+    # Reads and deserializes every sample the buffer held when reading
+    # started, without logging per sample. The result list is allocated
+    # for that number of samples up front.
+    #
+    # @param data instance of the data type to read
+    # @return return code, list of the data read
+    # On a deserialization failure, UNKNOWN_ERROR is returned with the
+    # data read so far.
+    #
+    # @endif
+    #
+    def readAll(self, data=None):
+        self._rtcout.RTC_TRACE("readAll()")
+
+        datatype = self._dataType
+        if datatype is None:
+            if data is None:
+                self._rtcout.RTC_ERROR("invalid data type")
+                return self.UNKNOWN_ERROR, []
+            datatype = data
+
+        if not self._buffer:
+            return self.PRECONDITION_NOT_MET, []
+
+        if self._serializer is None:
+            self._rtcout.RTC_ERROR("serializer creation failure.")
+            return self.UNKNOWN_ERROR, []
+        self._serializer.isLittleEndian(self._endian)
+
+        values = [None] * self._buffer.readable()
+        count = 0
+        while count < len(values):
+            if self._sync_readwrite:
+                ret, cdr = self.readBuff()
+                if ret != self.PORT_OK:
+                    break
+            else:
+                ret, cdr = self._buffer.read()
+                if ret != OpenRTM_aist.BufferStatus.BUFFER_OK:
+                    break
+            if isinstance(cdr, InPortPushConnector.DecodedData):
+                values[count] = cdr.value
+                count += 1
+                continue
+            cdr = self.onBufferRead(cdr)
+            ser_ret, value = self._serializer.deserialize(cdr, datatype)
+            if ser_ret != OpenRTM_aist.ByteDataStreamBase.SERIALIZE_OK:
+                self._rtcout.RTC_ERROR("deserialize error")
+                del values[count:]
+                return self.UNKNOWN_ERROR, values
+            values[count] = value
+            count += 1
+
+        del values[count:]
+        return self.PORT_OK, values
+
     ##
     # @if jp
     # @brief 接続解除
@@ -450,6 +539,9 @@ class InPortPushConnector(OpenRTM_aist.InPortConnector):
     # ReturnCode write(const OpenRTM::CdrData& data);
 
     def write(self, data):
+        if self._decode_on_receive:
+            data = self.decode(data)
+
         if self._sync_readwrite:
             self._readready_worker._cond.acquire()
             while not self._readready_worker._completed:
@@ -522,6 +614,92 @@ class InPortPushConnector(OpenRTM_aist.InPortConnector):
         OpenRTM_aist.InPortConnector.setDataType(self, data)
         self._serializer = OpenRTM_aist.SerializerFactories.instance().createSerializer(
             self._marshaling_type, data)
+        if self._decode_on_receive:
+            self._receiveSerializer = OpenRTM_aist.SerializerFactories.instance().createSerializer(
+                self._marshaling_type, data)
+
+    ##
+    # @if jp
+    # @brief 受信時の復号化
+    #
+    # decode_on_receive が YES の場合に write() から呼び出される。
+    # ON_BUFFER_READ のリスナを呼び出してから復号化し、受信時の変換関数が
+    # 設定されている場合は変換したデータを DecodedData で包んで返す。
+    # 復号化できない場合は受信したデータをそのまま返し、read() で
+    # 復号化を行う。
+    #
+    # @param cdr 受信したデータ
+    # @return バッファに書き込むデータ
+    #
+    # @else
+    # @brief Decode on receive
+    #
+    # Called from write() when decode_on_receive is YES. Calls the
+    # ON_BUFFER_READ listeners, deserializes, applies the receive
+    # conversion if set, and wraps the result in DecodedData. If the
+    # data cannot be decoded it is returned as received and read()
+    # decodes it instead.
+    #
+    # @param cdr received data
+    # @return data to write into the buffer
+    #
+    # @endif
+    #
+    def decode(self, cdr):
+        if self._receiveSerializer is None or self._dataType is None:
+            return cdr
+        cdr = self.onBufferRead(cdr)
+        self._receiveSerializer.isLittleEndian(self._endian)
+        ser_ret, value = self._receiveSerializer.deserialize(
+            cdr, self._dataType)
+        if ser_ret != OpenRTM_aist.ByteDataStreamBase.SERIALIZE_OK:
+            self._rtcout.RTC_ERROR("deserialize error on receive")
+            return cdr
+        if self._OnReceiveConvert is not None:
+            value = self._OnReceiveConvert(value)
+        return InPortPushConnector.DecodedData(value)
+
+    ##
+    # @if jp
+    # @brief 受信時の変換関数の設定
+    #
+    # decode_on_receive が YES の場合に、復号化したデータに対して
+    # 受信したスレッドで呼び出される関数を設定する。関数の戻り値が
+    # バッファに格納される。
+    #
+    # @param on_rconvert 変換関数
+    #
+    # @else
+    # @brief Set the conversion applied on receive
+    #
+    # When decode_on_receive is YES, the function is called on the
+    # receiving thread with the decoded data, and its return value is
+    # buffered.
+    #
+    # @param on_rconvert conversion function
+    #
+    # @endif
+    #
+    def setOnReceiveConvert(self, on_rconvert):
+        self._OnReceiveConvert = on_rconvert
+
+    ##
+    # @if jp
+    # @brief 復号化済みのデータ
+    #
+    # バッファ内で受信したままのデータと区別するために使用する。
+    #
+    # @else
+    # @brief Decoded data
+    #
+    # Tells decoded values apart from received data in the buffer.
+    #
+    # @endif
+    class DecodedData(object):
+        __slots__ = ("value",)
+
+        def __init__(self, value):
+            self.value = value
 
     class WorkerThreadCtrl:
         def __init__(self):
@@ -888,6 +888,8 @@ class _MachineBase(object):
         self.myPendingEvent = None
         self.myInstances = None
         self.myDeferEvents = []
+        self.myTransitions = None
+        self.myParents = None
 
     def currentState(self):
         return self.myCurrentState.key()
@@ -911,7 +913,10 @@ class _MachineBase(object):
         while self.myPendingState or self.myPendingEvent:
             while self.myPendingState:
 
-                self.myCurrentState.exit(self.myPendingState)
+                if self.myTransitions is None:
+                    self.myCurrentState.exit(self.myPendingState)
+                else:
+                    self.exitPath(self.myCurrentState, self.myPendingState)
                 self.myCurrentState.setHistorySuper(self.myCurrentState)
                 previous = self.myCurrentState
 
@@ -920,7 +925,10 @@ class _MachineBase(object):
                     self.myCurrentState.setBox(self.myPendingBox)
                     self.myPendingBox = None
 
-                self.myCurrentState.entry(previous)
+                if self.myTransitions is None:
+                    self.myCurrentState.entry(previous)
+                else:
+                    self.entryPath(previous, self.myCurrentState)
                 self.myPendingState = None
                 behaviour = self.myCurrentState.specification()
 
@@ -940,6 +948,107 @@ class _MachineBase(object):
     def getInstances(self):
         return self.myInstances
 
+    ##
+    # @if jp
+    # @brief 状態遷移の経路を事前に計算する
+    #
+    # 最上位状態以下の全ての状態の組(遷移元, 遷移先)について、
+    # on_exit を呼ぶ状態の列と on_entry を呼ぶ状態の列(共通の祖先までの
+    # 経路)を StateID で計算しておく。以降の遷移は _StateInstance.exit()、
+    # entry() で階層をたどる代わりにこの表を使う。表にない組(表の作成後に
+    # 生成した状態等)は最初の遷移時に計算して表に加える。
+    #
+    # @param self
+    # @param TOP 最上位状態
+    #
+    # @else
+    # @brief Precompute the transition paths
+    #
+    # For every pair (source, target) of states under the top state, the
+    # states whose on_exit and on_entry are called (the paths up to the
+    # least common ancestor) are computed as StateIDs. Later transitions
+    # use this table instead of walking the hierarchy in
+    # _StateInstance.exit() and entry(). Pairs missing from the table
+    # (e.g. states created afterwards) are computed on their first
+    # transition and added.
+    #
+    # @param self
+    # @param TOP top state
+    #
+    # @endif
+    def precomputeTransitions(self, TOP):
+        self.myParents = {0: None}
+        stack = [TOP]
+        while stack:
+            S = stack.pop()
+            if S.StateID in self.myParents:
+                continue
+            self.myParents[S.StateID] = S.SUPER.StateID
+            for C in getattr(S, "_SUBSTATES", ()):
+                if C.SUPER.StateID == S.StateID:
+                    stack.append(C)
+        self.myTransitions = {}
+        for src in self.myParents:
+            for dst in self.myParents:
+                self.myTransitions[(src, dst)] = self._transitionPath(src, dst)
+
+    def _transitionPath(self, src, dst):
+        parents = self.myParents
+        dst_chain = set()
+        i = dst
+        while i is not None:
+            dst_chain.add(i)
+            i = parents[i]
+        src_chain = set()
+        i = src
+        while i is not None:
+            src_chain.add(i)
+            i = parents[i]
+
+        exits = []
+        i = src
+        while parents[i] is not None and (i == dst or i not in dst_chain):
+            exits.append(i)
+            i = parents[i]
+
+        entries = []
+        if parents[dst] is not None:
+            entries.append(dst)
+            i = parents[dst]
+            while parents[i] is not None and i not in src_chain:
+                entries.append(i)
+                i = parents[i]
+            entries.reverse()
+        return tuple(exits), tuple(entries)
+
+    def _getTransitionPath(self, previous, next):
+        key = (previous.id(), next.id())
+        path = self.myTransitions.get(key)
+        if path is None:
+            for instance in (previous, next):
+                while instance is not None and instance.id() not in self.myParents:
+                    parent = instance.myParent
+                    self.myParents[instance.id()] = parent.id() if parent else None
+                    instance = parent
+            path = self._transitionPath(key[0], key[1])
+            self.myTransitions[key] = path
+        return path
+
+    def exitPath(self, current, next):
+        instances = self.myInstances
+        for i in self._getTransitionPath(current, next)[0]:
+            instance = instances[i]
+            instance.mySpecification.on_exit()
+            if instance.myBox is not _EmptyBox.theEmptyBox:
+                instance.mySpecification._deleteBox(instance)
+
+    def entryPath(self, previous, current):
+        instances = self.myInstances
+        for i in self._getTransitionPath(previous, current)[1]:
+            instance = instances[i]
+            instance.createBox()
+            instance.mySpecification.on_entry()
+
     def start(self, instance, *args):
         #global _theDefaultInitializer
         self.myCurrentState = _StateSpecification._getInstance(self)
@@ -1103,10 +1212,12 @@ class Machine(_MachineBase):
     theStateCount = 1
     # def __init__(self, TOP, TopBase):
 
-    def __init__(self, TOP, initial_state=None, args=()):
+    def __init__(self, TOP, initial_state=None, args=(), precompute=False):
         super(Machine, self).__init__()
         self.TOP = TOP
         self.TopBase = TOP.SUPER(TOP._state_name)
+        if precompute:
+            self.precomputeTransitions(TOP)
         self.init(box=None, initial_state=initial_state, args=args)
         self._mutex = threading.RLock()
 
@@ -1118,6 +1229,9 @@ class Machine(_MachineBase):
         self.myCurrentState.shutdown()
         self.free(Machine.theStateCount)
         Machine.theStateCount = 1
+        if self.myTransitions is not None:
+            self.myTransitions = {}
+            self.myParents = {0: None}
 
     def init(self, box=None, initial_state=None, args=()):
         self.allocate(Machine.theStateCount)
@@ -1285,6 +1399,7 @@ def topstate(cls):
     TOP.StateID = Machine.theStateCount
     Machine.theStateCount += 1
     TOP._state_name = staticmethod(lambda: TOP.__name__)
+    TOP._SUBSTATES = []
 
     TOP.box = lambda self: self._box()
     TOP.HISTORY = False
@@ -1314,6 +1429,7 @@ def substate(superstate):
         STATE.StateID = Machine.theStateCount
         Machine.theStateCount += 1
         STATE._state_name = staticmethod(lambda: cls.__name__)
+        _addSubstate(superstate, STATE)
         STATE.box = lambda self: self._box()
         STATE.HISTORY = False
         #STATE.data = lambda self: self._box()
@@ -1325,6 +1441,29 @@ def substate(superstate):
     return _substate
 
 
+##
+# @if jp
+# @brief サブ状態を親状態に登録する
+#
+# Machine.precomputeTransitions() で状態の階層をたどるために使用する。
+# fsm_substate() 等で親状態を派生したクラスからも同じリストを参照する。
+#
+# @else
+# @brief Register a substate to its superstate
+#
+# Used by Machine.precomputeTransitions() to walk the state hierarchy.
+# Classes derived from the superstate (e.g. by fsm_substate()) refer to
+# the same list.
+#
+# @endif
+def _addSubstate(SUPERSTATE, STATE):
+    if "_SUBSTATES" not in STATE.__dict__:
+        STATE._SUBSTATES = []
+    if not hasattr(SUPERSTATE, "_SUBSTATES"):
+        SUPERSTATE._SUBSTATES = []
+    SUPERSTATE._SUBSTATES.append(STATE)
+
+
 def history(cls):
     def _saveHistory(self, instance, shallow, deep):
         if not instance.getHistory():
@@ -1357,6 +1496,7 @@ def TOPSTATE(TOP):
     TOP.StateID = Machine.theStateCount
     Machine.theStateCount += 1
     TOP._state_name = staticmethod(lambda: TOP.__name__)
+    TOP._SUBSTATES = []
 
     TOP.box = lambda self: self._box()
 
@@ -1366,6 +1506,7 @@ def SUBSTATE(STATE, SUPERSTATE):
     STATE.StateID = Machine.theStateCount
     Machine.theStateCount += 1
     STATE._state_name = staticmethod(lambda: STATE.__name__)
+    _addSubstate(SUPERSTATE, STATE)
     STATE.box = lambda self: self._box()
 
 
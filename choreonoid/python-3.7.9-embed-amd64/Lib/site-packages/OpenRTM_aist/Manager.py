@@ -130,13 +130,15 @@ class Manager:
     # @endif
     def __init__(self, _manager=None):
         self._initProc = None
-        self._compManager = OpenRTM_aist.ObjectManager(self.InstanceName)
-        self._factory = OpenRTM_aist.ObjectManager(self.FactoryPredicate)
-        self._ecfactory = OpenRTM_aist.ObjectManager(self.ECFactoryPredicate)
+        self._compManager = OpenRTM_aist.IndexedObjectManager(self.InstanceName)
+        self._factory = OpenRTM_aist.IndexedObjectManager(self.FactoryPredicate)
+        self._ecfactory = OpenRTM_aist.IndexedObjectManager(
+            self.ECFactoryPredicate)
         self._ecs = []
         self._scheduler = OpenRTM_aist.PeriodicTimer()
         self._invoker = OpenRTM_aist.DelayedTimer()
         self._needsTimer = False
+        self._profiler = None
         self._orb = None
         self._poa = None
         self._poaManager = None
@@ -219,6 +221,8 @@ class Manager:
             manager.initExecContext()
             manager.initComposite()
             manager.initTimer()
+            manager.initPortLivenessMonitor()
+            manager.initProfiler()
             manager.initManagerServant()
 
         return manager
@@ -261,6 +265,8 @@ class Manager:
             manager.initExecContext()
             manager.initComposite()
             manager.initTimer()
+            manager.initPortLivenessMonitor()
+            manager.initProfiler()
             manager.initManagerServant()
 
         return manager
@@ -474,6 +480,7 @@ class Manager:
         self._rtcout.RTC_TRACE("Manager::main()")
 
         def orbrun():
+            OpenRTM_aist.placeThread("orb", "orb")
             try:
                 self._orb.run()
             except BaseException:
@@ -1488,7 +1495,10 @@ class Manager:
     def shutdownManager(self):
         self._rtcout.RTC_TRACE("Manager.shutdownManager()")
         self._listeners.manager_.preShutdown()
+        self.dumpThreadPlacement()
+        self.shutdownProfiler()
         self.shutdownComponents()
+        OpenRTM_aist.PortLivenessMonitor.instance().exit()
         self.shutdownManagerServant()
         self.shutdownNaming()
         self.shutdownORB()
@@ -2119,32 +2129,98 @@ class Manager:
     def initCpuAffinity(self):
         self._rtcout.RTC_TRACE("Manager.initCpuAffinity()")
 
-        if not self._config.findNode("manager.cpu_affinity"):
-            return
-
-        affinity_str = self._config.getProperty("manager.cpu_affinity")
+        # the process affinity is the default of the thread placement
+        affinity_str = ""
+        if self._config.findNode("manager.cpu_affinity"):
+            affinity_str = self._config.getProperty("manager.cpu_affinity")
 
         if affinity_str:
             self._rtcout.RTC_DEBUG("CPU affinity property: %s", affinity_str)
 
-            tmp = affinity_str.split(",")
+            cpu_num = OpenRTM_aist.parseCPUList(affinity_str)
+            if cpu_num:
+                self._rtcout.RTC_DEBUG("CPU affinity mask set to %s",
+                                       ",".join([str(n) for n in cpu_num]))
 
-            cpu_num = []
-            for num in tmp:
-                try:
-                    cpu_num.append(int(num))
-                    self._rtcout.RTC_DEBUG(
-                        "CPU affinity mask set to %d", int(num))
-                except BaseException:
-                    pass
+                ret = OpenRTM_aist.setProcessAffinity(cpu_num)
 
-            if not cpu_num:
-                return
+                if ret == False:
+                    self._rtcout.RTC_ERROR("CPU affinity mask setting failed")
 
-            ret = OpenRTM_aist.setProcessAffinity(cpu_num)
+        self.initThreadPlacement()
 
-            if ret == False:
-                self._rtcout.RTC_ERROR("CPU affinity mask setting failed")
+    ##
+    # @if jp
+    # @brief スレッド配置の初期化
+    #
+    # manager.thread_placement.<役割>.cpu_affinity で指定した役割ごとの
+    # CPUの集合を ThreadPlacement に設定する。other が指定されている
+    # 場合は、登録されていないスレッドの配置をタイマーに登録する。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Initialize the thread placement
+    #
+    # Sets the CPU set of each role given by
+    # manager.thread_placement.<role>.cpu_affinity to ThreadPlacement.
+    # When "other" is given, placing the unregistered threads is added
+    # to the timer.
+    #
+    # @param self
+    #
+    # @endif
+    def initThreadPlacement(self):
+        self._rtcout.RTC_TRACE("Manager.initThreadPlacement()")
+        if not self._config.findNode("manager.thread_placement"):
+            return
+        placement = OpenRTM_aist.ThreadPlacement.instance()
+        placement.init(self._config.getNode("manager.thread_placement"))
+
+        if not placement.getPolicy(OpenRTM_aist.ThreadPlacement.OTHER):
+            return
+        placement.placeOthers()
+        if self._needsTimer:
+            interval = OpenRTM_aist.TimeValue(1, 0)
+            try:
+                tm = float(self._config.getProperty(
+                    "manager.thread_placement.interval"))
+                if tm > 0.0:
+                    interval.set_time(tm)
+            except ValueError:
+                pass
+            self.addTask(placement.placeOthers, interval)
+
+    ##
+    # @if jp
+    # @brief スレッドとCPUの対応を出力する
+    #
+    # manager.thread_placement.report_file が指定されている場合に、
+    # スレッドとCPUの対応をファイルに出力する。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Dump the thread to CPU mapping
+    #
+    # Writes the thread to CPU mapping to
+    # manager.thread_placement.report_file when it is given.
+    #
+    # @param self
+    #
+    # @endif
+    def dumpThreadPlacement(self):
+        filename = self._config.getProperty(
+            "manager.thread_placement.report_file")
+        if not filename:
+            return
+        filename = self.formatString(filename, self._config)
+        try:
+            with open(filename, "w") as f:
+                f.write(OpenRTM_aist.ThreadPlacement.instance().toString())
+                f.write("\n")
+        except (IOError, OSError):
+            self._rtcout.RTC_ERROR("failed to write %s", filename)
 
     ##
     # @if jp
@@ -2212,6 +2288,107 @@ class Manager:
     def initTimer(self):
         return True
 
+    ##
+    # @if jp
+    # @brief ポートの生存監視の初期化
+    #
+    # manager.liveness_monitor の設定で PortLivenessMonitor を初期化する。
+    # 監視スレッドは最初の接続時に開始する。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Initialize the port liveness monitor
+    #
+    # Initializes PortLivenessMonitor with the manager.liveness_monitor
+    # settings. The monitor thread starts on the first connection.
+    #
+    # @param self
+    #
+    # @endif
+    def initPortLivenessMonitor(self):
+        self._rtcout.RTC_TRACE("Manager.initPortLivenessMonitor()")
+        OpenRTM_aist.PortLivenessMonitor.instance().init(
+            self._config.getNode("manager.liveness_monitor"))
+
+    ##
+    # @if jp
+    # @brief サンプリングプロファイラの初期化
+    #
+    # manager.profiler.enable が YES の場合に SamplingProfiler を
+    # 初期化し、サンプリングを開始する。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Initialize the sampling profiler
+    #
+    # Initializes SamplingProfiler and starts sampling when
+    # manager.profiler.enable is YES.
+    #
+    # @param self
+    #
+    # @endif
+    def initProfiler(self):
+        self._rtcout.RTC_TRACE("Manager.initProfiler()")
+        if not OpenRTM_aist.toBool(self._config.getProperty(
+                "manager.profiler.enable"), "YES", "NO", False):
+            return
+        profiler = OpenRTM_aist.SamplingProfiler.instance()
+        profiler.init(self._config.getNode("manager.profiler"))
+        profiler.start()
+        self._profiler = profiler
+
+    ##
+    # @if jp
+    # @brief サンプリングプロファイラの集計結果を出力する
+    #
+    # @param self
+    # @param filename 出力ファイル名(空の場合は manager.profiler.output_file)
+    # @return 出力した場合にTrue
+    #
+    # @else
+    # @brief Dump the stacks aggregated by the sampling profiler
+    #
+    # @param self
+    # @param filename output file name (manager.profiler.output_file if empty)
+    # @return True if written
+    #
+    # @endif
+    def dumpProfile(self, filename=""):
+        if self._profiler is None:
+            self._rtcout.RTC_WARN("sampling profiler is not enabled")
+            return False
+        if not filename:
+            filename = self._config.getProperty("manager.profiler.output_file")
+            if not filename:
+                return False
+        return self._profiler.dump(self.formatString(filename, self._config))
+
+    ##
+    # @if jp
+    # @brief サンプリングプロファイラの終了
+    #
+    # 集計結果を manager.profiler.output_file に出力して終了する。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Shutdown the sampling profiler
+    #
+    # Writes the aggregated stacks to manager.profiler.output_file and
+    # stops.
+    #
+    # @param self
+    #
+    # @endif
+    def shutdownProfiler(self):
+        if self._profiler is None:
+            return
+        self._profiler.exit()
+        self.dumpProfile()
+        self._profiler = None
+
     ##
     # @if jp
     # @brief Timer の終了
@@ -2604,12 +2781,17 @@ class Manager:
     # RTコンポーネントの型およびインスタンス毎に記載されたプロパティファイルの
     # 情報を読み込み、コンポーネントに設定する。
     # また、各コンポーネントの NamingService 登録時の名称を取得し、設定する。
+    # プロパティファイルの解析結果は PropertiesFileCache に保持し、
+    # 同じ型のコンポーネントを複数生成する場合は一度だけ解析する。
     #
     # @param self
     # @param comp コンフィギュレーション対象RTコンポーネント
     #
     # @else
     #
+    # The parsed property files are kept in PropertiesFileCache, so that
+    # creating many components of the same type parses each file once.
+    #
     # @endif
     # void configureComponent(RTObject_impl* comp, const coil::Properties&
     # prop);
@@ -2631,8 +2813,8 @@ class Manager:
 
         if self._config.getProperty(name_conf) != "":
             try:
-                conff = open(self._config.getProperty(name_conf))
-                name_prop.load(conff)
+                OpenRTM_aist.PropertiesFileCache.instance().load(
+                    name_prop, self._config.getProperty(name_conf))
                 self._rtcout.RTC_INFO("Component instance conf file: %s loaded.",
                                       self._config.getProperty(name_conf))
                 self._rtcout.RTC_DEBUG(name_prop)
@@ -2640,9 +2822,6 @@ class Manager:
             except BaseException:
                 print("Not found. : %s" % self._config.getProperty(name_conf))
                 self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
-            else:
-                name_prop.load(conff)
-                conff.close()
 
         if self._config.findNode(category + "." + inst_name):
             temp_ = OpenRTM_aist.Properties(
@@ -2662,8 +2841,8 @@ class Manager:
 
         if self._config.getProperty(type_conf) != "":
             try:
-                conff = open(self._config.getProperty(type_conf))
-                type_prop.load(conff)
+                OpenRTM_aist.PropertiesFileCache.instance().load(
+                    type_prop, self._config.getProperty(type_conf))
                 self._rtcout.RTC_INFO("Component type conf file: %s loaded.",
                                       self._config.getProperty(type_conf))
                 self._rtcout.RTC_DEBUG(type_prop)
@@ -2671,9 +2850,6 @@ class Manager:
             except BaseException:
                 print("Not found. : %s" % self._config.getProperty(type_conf))
                 self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
-            else:
-                type_prop.load(conff)
-                conff.close()
 
         if self._config.findNode(category + "." + type_name):
             temp_ = OpenRTM_aist.Properties(
@@ -2737,13 +2913,11 @@ class Manager:
         if file_name[0] != '\0':
 
             try:
-                conff = open(file_name)
+                OpenRTM_aist.PropertiesFileCache.instance().load(prop, file_name)
             except BaseException:
                 print("Not found. : %s" % file_name)
                 self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
             else:
-                prop.load(conff)
-                conff.close()
                 return True
 
         return False
@@ -3610,6 +3784,9 @@ class Manager:
                 return False
             return self._name == comp.getInstanceName()
 
+        def key(self):
+            return self._name
+
     # ============================================================
     # コンポーネントファクトリ
     # ============================================================
@@ -3663,6 +3840,9 @@ class Manager:
 
             return True
 
+        def key(self):
+            return self._impleid
+
     # ============================================================
     # ExecutionContextファクトリ
     # ============================================================
@@ -3685,6 +3865,9 @@ class Manager:
         def __call__(self, factory):
             return self._name == factory.name()
 
+        def key(self):
+            return self._name
+
     # ============================================================
     # Module Fanctor
     # ============================================================
@@ -211,6 +211,7 @@ class ManagerServant(RTM__POA.Manager):
         self._masterMutex = threading.RLock()
         self._slaveMutex = threading.RLock()
         self._objref = RTM.Manager._nil
+        self._slavePool = None
 
         config = copy.deepcopy(self._mgr.getConfig())
 
@@ -225,6 +226,20 @@ class ManagerServant(RTM__POA.Manager):
             # this is master manager
             self._rtcout.RTC_TRACE("This manager is master.")
             self._isMaster = True
+
+            pool_size = 0
+            ret, pool_size = OpenRTM_aist.stringTo(
+                pool_size, config.getProperty("manager.slave_pool.size", "0"))
+            if ret and pool_size > 0:
+                languages = config.getProperty("manager.slave_pool.languages")
+                if not languages:
+                    languages = config.getProperty("manager.language")
+                languages = [lang.strip() for lang in languages.split(",")
+                             if lang.strip()]
+                self._slavePool = SlaveManagerPool(
+                    self, pool_size, languages,
+                    config.getProperty("manager.slave_pool.preload"))
+                self._slavePool.start()
             return
         else:
             # this is slave manager
@@ -269,6 +284,10 @@ class ManagerServant(RTM__POA.Manager):
     # @endif
 
     def exit(self):
+        if self._slavePool:
+            self._slavePool.exit()
+            self._slavePool = None
+
         guard_master = OpenRTM_aist.ScopedLock(self._masterMutex)
         for master in self._masters:
             try:
@@ -515,6 +534,8 @@ class ManagerServant(RTM__POA.Manager):
         if self._isMaster:
             guard = OpenRTM_aist.ScopedLock(self._slaveMutex)
             for slave in self._slaves[:]:
+                if self._slavePool and self._slavePool.isIdle(slave):
+                    continue
                 try:
                     prof = slave.get_configuration()
                     prop = OpenRTM_aist.Properties()
@@ -736,6 +757,10 @@ class ManagerServant(RTM__POA.Manager):
     #
     # 現在当該マネージャのコンフィギュレーションを設定する。
     #
+    # キー名が manager.profiler.dump の場合はコンフィギュレーションを
+    # 設定せず、サンプリングプロファイラの集計結果を値のファイル名
+    # (空の場合は manager.profiler.output_file)に出力する。
+    #
     # @param name セットするコンフィギュレーションのキー名
     # @param value セットするコンフィギュレーションの値
     # @return リターンコード
@@ -745,6 +770,11 @@ class ManagerServant(RTM__POA.Manager):
     #
     # This operation sets managers configuration.
     #
+    # When the key name is manager.profiler.dump, no configuration is
+    # set, and the stacks aggregated by the sampling profiler are written
+    # to the file named by the value (manager.profiler.output_file if
+    # empty).
+    #
     # @param name A configuration key name to be set
     # @param value A configuration value to be set
     # @return Return code
@@ -756,6 +786,10 @@ class ManagerServant(RTM__POA.Manager):
     def set_configuration(self, name, value):
         self._rtcout.RTC_TRACE(
             "set_configuration(name = %s, value = %s)", (name, value))
+        if name == "manager.profiler.dump":
+            if self._mgr.dumpProfile(value):
+                return RTC.RTC_OK
+            return RTC.PRECONDITION_NOT_MET
         self._mgr.getConfig().setProperty(name, value)
         return RTC.RTC_OK
 
@@ -1047,6 +1081,10 @@ class ManagerServant(RTM__POA.Manager):
     # ReturnCode_t shutdown()
 
     def shutdown(self):
+        if self._slavePool:
+            self._slavePool.exit()
+            self._slavePool = None
+
         guard_master = OpenRTM_aist.ScopedLock(self._masterMutex)
         for master in self._masters:
             try:
@@ -1351,6 +1389,60 @@ class ManagerServant(RTM__POA.Manager):
 
         return paramstr, module_name
 
+    ##
+    # @if jp
+    # @brief スレーブマネージャの起動コマンドを生成する
+    # @param self
+    # @param language 起動するマネージャの言語
+    # @param mgrstr マネージャのインスタンス名
+    # @return 起動コマンド
+    # @else
+    #
+    # @brief Create the command that launches a slave manager
+    # @param self
+    # @param language language of the manager
+    # @param mgrstr instance name of the manager
+    # @return command line
+    # @endif
+    # std::string createManagerCommand(string language, string mgrstr)
+    def createManagerCommand(self, language, mgrstr):
+        config = copy.deepcopy(self._mgr.getConfig())
+        rtcd_cmd = config.getProperty(
+            "manager.modules." +
+            language +
+            ".manager_cmd")
+
+        if not rtcd_cmd:
+            lang = config.getProperty("manager.language")
+            rtcd_cmd = config.getProperty(
+                "manager.modules." +
+                lang +
+                ".manager_cmd")
+
+        load_path = config.getProperty("manager.modules.load_path")
+        load_path_language = config.getProperty(
+            "manager.modules." + language + ".load_paths")
+        load_path = load_path + "," + load_path_language
+
+        if os.name == "nt":
+            cmd = "cmd /c " + rtcd_cmd
+            load_path = load_path.replace("\\", "\\\\")
+            load_path = load_path.replace("\\", "\\\\")
+        else:
+            cmd = rtcd_cmd
+        cmd += " -o " + "manager.is_master:NO"
+        cmd += " -o " + "manager.corba_servant:YES"
+        cmd += " -o " + "corba.master_manager:" + \
+            config.getProperty("corba.master_manager")
+        cmd += " -o " + "manager.name:" + \
+            config.getProperty("manager.name")
+        cmd += " -o " + "manager.instance_name:" + mgrstr
+        cmd += " -o " + "\"manager.modules.load_path:" + load_path + "\""
+        cmd += " -o " + "manager.supported_languages:" + language
+        cmd += " -o " + "manager.shutdown_auto:NO"
+
+        return cmd
+
     ##
     # @if jp
     # @brief 指定のマネージャでRTCを起動する
@@ -1376,49 +1468,18 @@ class ManagerServant(RTM__POA.Manager):
         if not mgrstr:
             return RTC.RTObject._nil
 
+        comp_param = CompParam(arg)
+
         if mgrstr == "manager_%p":
             mgrobj = RTM.Manager._nil
+            if self._slavePool:
+                mgrobj = self._slavePool.acquire(comp_param.language())
         else:
             mgrobj = self.findManagerByName(mgrstr)
 
-        comp_param = CompParam(arg)
-
         if CORBA.is_nil(mgrobj):
             self._rtcout.RTC_WARN("%s cannot be found.", mgrstr)
-            config = copy.deepcopy(self._mgr.getConfig())
-            rtcd_cmd = config.getProperty(
-                "manager.modules." +
-                comp_param.language() +
-                ".manager_cmd")
-
-            if not rtcd_cmd:
-                lang = config.getProperty("manager.language")
-                rtcd_cmd = config.getProperty(
-                    "manager.modules." +
-                    lang +
-                    ".manager_cmd")
-
-            load_path = config.getProperty("manager.modules.load_path")
-            load_path_language = config.getProperty(
-                "manager.modules." + comp_param.language() + ".load_paths")
-            load_path = load_path + "," + load_path_language
-
-            if os.name == "nt":
-                cmd = "cmd /c " + rtcd_cmd
-                load_path = load_path.replace("\\", "\\\\")
-                load_path = load_path.replace("\\", "\\\\")
-            else:
-                cmd = rtcd_cmd
-            cmd += " -o " + "manager.is_master:NO"
-            cmd += " -o " + "manager.corba_servant:YES"
-            cmd += " -o " + "corba.master_manager:" + \
-                config.getProperty("corba.master_manager")
-            cmd += " -o " + "manager.name:" + \
-                config.getProperty("manager.name")
-            cmd += " -o " + "manager.instance_name:" + mgrstr
-            cmd += " -o " + "\"manager.modules.load_path:" + load_path + "\""
-            cmd += " -o " + "manager.supported_languages:" + comp_param.language()
-            cmd += " -o " + "manager.shutdown_auto:NO"
+            cmd = self.createManagerCommand(comp_param.language(), mgrstr)
 
             self._rtcout.RTC_DEBUG("Invoking command: %s.", cmd)
 
@@ -1462,6 +1523,10 @@ class ManagerServant(RTM__POA.Manager):
                             prof = slave.get_configuration()
                             prop = OpenRTM_aist.Properties()
                             OpenRTM_aist.NVUtil.copyToProperties(prop, prof)
+                            # slave managers launched by the pool are
+                            # handed out by the pool only
+                            if prop.getProperty("manager.slave_pool.token"):
+                                continue
                             name = prop.getProperty("manager.instance_name")
 
                             if re.match(regex, name) and not (
@@ -1661,3 +1726,306 @@ class ManagerServant(RTM__POA.Manager):
                 return self._mgr == mgr
 
             return self._mgr._is_equivalent(mgr)
+
+
+##
+# @if jp
+# @class SlaveManagerPool
+# @brief 起動済みスレーブマネージャのプール
+#
+# manager.slave_pool.size に指定した数のスレーブマネージャを言語毎に
+# 事前に起動しておき、manager_name=manager_%p によるRTC生成時に
+# 待機中のスレーブマネージャを割り当てる。割り当てた分はバックグラウンドの
+# スレッドで補充する。プールで起動したスレーブマネージャは
+# manager.slave_pool.token で識別する。manager.slave_pool.preload に
+# 指定したモジュールはスレーブマネージャの起動時にロードしておく。
+#
+# @else
+# @class SlaveManagerPool
+# @brief Pool of pre-started slave managers
+#
+# Keeps manager.slave_pool.size slave managers per language started in
+# advance, and hands an idle one out when an RTC is created with
+# manager_name=manager_%p. Slaves handed out are replaced by a
+# background thread. Slaves started by the pool are identified by
+# manager.slave_pool.token. Modules listed in manager.slave_pool.preload
+# are loaded by the slave managers on start up.
+#
+# @endif
+class SlaveManagerPool:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param servant マスターマネージャのManagerServant
+    # @param size 言語毎に待機させるスレーブマネージャの数
+    # @param languages 言語のリスト
+    # @param preload 起動時にロードするモジュール(カンマ区切り)
+    # @param timeout スレーブマネージャの登録待ちのタイムアウト[s]
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    # @param servant ManagerServant of the master manager
+    # @param size number of idle slave managers per language
+    # @param languages list of languages
+    # @param preload modules loaded on start up (comma separated)
+    # @param timeout timeout[s] for a slave manager to register
+    #
+    # @endif
+    def __init__(self, servant, size, languages, preload="", timeout=10.0):
+        self._servant = servant
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf(
+            "SlaveManagerPool")
+        self._size = size
+        self._languages = languages
+        self._preload = preload
+        self._timeout = timeout
+        self._interval = 0.05
+        self._cond = threading.Condition(threading.RLock())
+        self._idle = {}
+        self._pending = {}
+        self._checked = []
+        self._count = 0
+        self._running = False
+        self._thread = None
+
+    ##
+    # @if jp
+    # @brief スレーブマネージャの起動を開始する
+    # @param self
+    # @else
+    # @brief Start launching slave managers
+    # @param self
+    # @endif
+    def start(self):
+        guard = OpenRTM_aist.ScopedLock(self._cond)
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    ##
+    # @if jp
+    # @brief プールを停止する
+    #
+    # 待機中のスレーブマネージャは終了させる。
+    #
+    # @param self
+    # @else
+    # @brief Stop the pool
+    #
+    # Idle slave managers are shut down.
+    #
+    # @param self
+    # @endif
+    def exit(self):
+        guard = OpenRTM_aist.ScopedLock(self._cond)
+        self._running = False
+        self._cond.notify()
+        thread = self._thread
+        self._thread = None
+        del guard
+
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+        guard = OpenRTM_aist.ScopedLock(self._cond)
+        idle = self._idle
+        self._idle = {}
+        self._pending = {}
+        del guard
+
+        for mgrs in idle.values():
+            for mgr in mgrs:
+                try:
+                    mgr.shutdown()
+                except BaseException:
+                    self._rtcout.RTC_DEBUG(
+                        OpenRTM_aist.Logger.print_exception())
+
+    ##
+    # @if jp
+    # @brief 待機中のスレーブマネージャを取得する
+    #
+    # 取得したスレーブマネージャはプールから取り除き、補充を要求する。
+    #
+    # @param self
+    # @param language 言語
+    # @return スレーブマネージャ(待機中のものがない場合はnil)
+    # @else
+    # @brief Take an idle slave manager
+    #
+    # The slave manager is removed from the pool and a refill is
+    # requested.
+    #
+    # @param self
+    # @param language language
+    # @return slave manager (nil if none is idle)
+    # @endif
+    # RTM::Manager_ptr acquire(string language)
+    def acquire(self, language):
+        while True:
+            guard = OpenRTM_aist.ScopedLock(self._cond)
+            idle = self._idle.get(language)
+            if not idle:
+                self._rtcout.RTC_DEBUG("No idle %s slave manager.", language)
+                return RTM.Manager._nil
+            mgr = idle.pop(0)
+            self._cond.notify()
+            del guard
+
+            try:
+                if not mgr._non_existent():
+                    self._rtcout.RTC_DEBUG(
+                        "Idle %s slave manager acquired.", language)
+                    return mgr
+            except BaseException:
+                self._rtcout.RTC_DEBUG(OpenRTM_aist.Logger.print_exception())
+            self._rtcout.RTC_WARN("Idle slave manager has gone away.")
+
+    ##
+    # @if jp
+    # @brief スレーブマネージャがプールで待機中かを判定する
+    # @param self
+    # @param mgr スレーブマネージャ
+    # @return True：待機中
+    # @else
+    # @brief Check if a slave manager is idle in the pool
+    # @param self
+    # @param mgr slave manager
+    # @return True if idle
+    # @endif
+    def isIdle(self, mgr):
+        guard = OpenRTM_aist.ScopedLock(self._cond)
+        for idle in self._idle.values():
+            if OpenRTM_aist.CORBA_SeqUtil.find(
+                    idle, ManagerServant.is_equiv(mgr)) >= 0:
+                return True
+        return False
+
+    ##
+    # @if jp
+    # @brief プールのスレッドの処理
+    #
+    # 不足しているスレーブマネージャを起動し、登録を待つ。
+    # 登録待ちのものがない場合は補充要求まで待機する。
+    #
+    # @param self
+    # @else
+    # @brief Main loop of the pool thread
+    #
+    # Launches missing slave managers and waits for them to register.
+    # Sleeps until a refill is requested when nothing is pending.
+    #
+    # @param self
+    # @endif
+    def run(self):
+        while True:
+            failed = self.fill()
+            self.collect()
+
+            guard = OpenRTM_aist.ScopedLock(self._cond)
+            if not self._running:
+                return
+            if self._pending or failed:
+                self._cond.wait(self._interval if not failed else 1.0)
+            else:
+                self._cond.wait()
+            if not self._running:
+                return
+            del guard
+
+    ##
+    # @if jp
+    # @brief 不足しているスレーブマネージャを起動する
+    # @param self
+    # @return True：起動に失敗した
+    # @else
+    # @brief Launch missing slave managers
+    # @param self
+    # @return True if a launch failed
+    # @endif
+    def fill(self):
+        launches = []
+        guard = OpenRTM_aist.ScopedLock(self._cond)
+        now = time.time()
+        for token, (language, launched) in list(self._pending.items()):
+            if now - launched > self._timeout:
+                self._rtcout.RTC_WARN(
+                    "Slave manager %s did not register.", token)
+                del self._pending[token]
+
+        for language in self._languages:
+            count = len(self._idle.get(language, []))
+            for lang, _ in self._pending.values():
+                if lang == language:
+                    count += 1
+            while count < self._size:
+                self._count += 1
+                token = str(os.getpid()) + "_" + str(self._count)
+                self._pending[token] = (language, now)
+                launches.append((token, language))
+                count += 1
+        del guard
+
+        for token, language in launches:
+            cmd = self._servant.createManagerCommand(language, "manager_%p")
+            cmd += " -o " + "manager.slave_pool.token:" + token
+            if self._preload:
+                cmd += " -o " + "\"manager.modules.preload:" + \
+                    self._preload + "\""
+            self._rtcout.RTC_DEBUG("Invoking command: %s.", cmd)
+            if OpenRTM_aist.launch_shell(cmd) == -1:
+                self._rtcout.RTC_ERROR("%s: failed", cmd)
+                guard = OpenRTM_aist.ScopedLock(self._cond)
+                for token_, _ in launches:
+                    self._pending.pop(token_, None)
+                return True
+        return False
+
+    ##
+    # @if jp
+    # @brief 登録されたスレーブマネージャのうち、プールで起動したものを
+    # 待機中のリストに追加する
+    # @param self
+    # @else
+    # @brief Move slave managers launched by the pool that have
+    # registered to the idle list
+    # @param self
+    # @endif
+    def collect(self):
+        if not self._pending:
+            return
+        slaves = self._servant.get_slave_managers()[:]
+        checked = []
+        for slave in slaves:
+            if OpenRTM_aist.CORBA_SeqUtil.find(
+                    self._checked, ManagerServant.is_equiv(slave)) >= 0:
+                checked.append(slave)
+                continue
+            try:
+                prof = slave.get_configuration()
+                prop = OpenRTM_aist.Properties()
+                OpenRTM_aist.NVUtil.copyToProperties(prop, prof)
+                token = prop.getProperty("manager.slave_pool.token")
+            except BaseException:
+                self._rtcout.RTC_DEBUG(OpenRTM_aist.Logger.print_exception())
+                continue
+            checked.append(slave)
+
+            guard = OpenRTM_aist.ScopedLock(self._cond)
+            if token in self._pending:
+                language, _ = self._pending.pop(token)
+                self._idle.setdefault(language, []).append(slave)
+                self._rtcout.RTC_DEBUG(
+                    "%s slave manager %s is ready.", (language, token))
+            del guard
+        self._checked = checked
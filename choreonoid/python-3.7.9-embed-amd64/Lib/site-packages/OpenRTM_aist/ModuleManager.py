@@ -20,6 +20,7 @@ import os
 import glob
 import encodings.aliases
 import codecs
+import time
 
 import OpenRTM_aist
 
@@ -35,6 +36,8 @@ ALLOW_URL = "manager.modules.download_allowed"
 MOD_DWNDIR = "manager.modules.download_dir"
 MOD_DELMOD = "manager.modules.download_cleanup"
 MOD_PRELOAD = "manager.modules.preload"
+MOD_INDEX_FILE = "manager.modules.index.file"
+MOD_INDEX_RESCAN = "manager.modules.index.rescan_interval"
 
 
 ##
@@ -97,6 +100,15 @@ class ModuleManager:
         if not self._rtcout:
             self._rtcout = self._mgr.getLogbuf("ModuleManager")
         self._modprofs = []
+        self._modprofpaths = set()
+        self._index = OpenRTM_aist.ModuleProfileIndex(
+            OpenRTM_aist.replaceEnv(prop.getProperty(MOD_INDEX_FILE)))
+        try:
+            self._rescanInterval = float(
+                prop.getProperty(MOD_INDEX_RESCAN, "10.0"))
+        except ValueError:
+            self._rescanInterval = 10.0
+        self._lastScan = None
         self._loadfailmods = {}
         langs = self._properties.getProperty(
             "manager.supported_languages").split(",")
@@ -480,10 +492,6 @@ class ModuleManager:
         # classname
         classname = basename.split(".")[0].lower()
 
-        # loaded profile = old profiles - new profiles
-        # for old
-        oldp = self._mgr.getFactoryProfiles()
-
         # for new
         comp_spec_name = classname + "_spec"
 
@@ -504,7 +512,25 @@ class ModuleManager:
         comp_spec = getattr(imp_file, comp_spec_name, None)
         if not comp_spec:
             return None
-        newp = OpenRTM_aist.Properties(defaults_str=comp_spec)
+        return OpenRTM_aist.Properties(defaults_str=comp_spec)
+
+    ##
+    # @if jp
+    # @brief ロード済みのファクトリと同じプロファイルを除外する
+    #
+    # @param self
+    # @param newp モジュールのプロファイル
+    #
+    # @return ロード済みの場合は空のプロファイル
+    #
+    # @else
+    # @brief Exclude profiles of already loaded factories
+    # @endif
+
+    def __excludeLoadedProfile(self, newp):
+        # loaded profile = old profiles - new profiles
+        # for old
+        oldp = self._mgr.getFactoryProfiles()
 
         profs = []
 
@@ -541,7 +567,7 @@ class ModuleManager:
     # @brief Getting loadable file list on the loadpath for given language
     # @endif
 
-    def getModuleList(self, lang, modules):
+    def getModuleList(self, lang, modules, found=None):
         l = "manager.modules." + lang
         lprop = self._properties.getNode(l)
 
@@ -582,6 +608,8 @@ class ModuleManager:
             for f in flist:
                 f = f.replace("\\", "/")
                 f = f.replace("//", "/")
+                if found is not None:
+                    found.add(f)
                 self.addNewFile(f, modules, lang)
         modules = list(set(modules))
 
@@ -600,12 +628,10 @@ class ModuleManager:
     # @endif
 
     def addNewFile(self, fpath, modules, lang):
-        exists = False
-        for modprof in self._modprofs:
-            if modprof.getProperty("module_file_path") == fpath:
-                self._rtcout.RTC_DEBUG(
-                    "Module %s already exists in cache.", fpath)
-                return
+        if fpath in self._modprofpaths:
+            self._rtcout.RTC_DEBUG(
+                "Module %s already exists in cache.", fpath)
+            return
 
         if not (fpath in self._loadfailmods[lang]):
             self._rtcout.RTC_DEBUG("New module: %s", fpath)
@@ -633,10 +659,26 @@ class ModuleManager:
         paths = lprop.getProperty("load_paths").split(",")
 
         for mod_ in modules:
-
-            if lang == self._managerLanguage:
+            found, prop = self._index.find(lang, mod_)
+            if found:
+                self._rtcout.RTC_DEBUG("Module %s found in index.", mod_)
+                if prop is None:
+                    if lang != self._managerLanguage:
+                        self._loadfailmods[lang].append(mod_)
+                    continue
+                if lang == self._managerLanguage:
+                    prop = self.__excludeLoadedProfile(prop)
+                prop.setProperty(
+                    "module_file_name", os.path.basename(mod_))
+                prop.setProperty("module_file_path", mod_)
+                prop.setProperty("language", lang)
+                modprops.append(prop)
+
+            elif lang == self._managerLanguage:
                 prop = self.__getRtcProfile(mod_)
+                self._index.update(lang, mod_, prop)
                 if prop:
+                    prop = self.__excludeLoadedProfile(prop)
                     prop.setProperty(
                         "module_file_name", os.path.basename(mod_))
                     prop.setProperty("module_file_path", mod_)
@@ -665,12 +707,14 @@ class ModuleManager:
                             prop.setProperty(key, value)
                     if count > 0:
                         self._rtcout.RTC_DEBUG("rtcprof cmd sub process done.")
+                        self._index.update(lang, mod_, prop)
                         prop.setProperty(
                             "module_file_name", os.path.basename(mod_))
                         prop.setProperty("module_file_path", mod_)
                         prop.setProperty("language", lang)
                         modprops.append(prop)
                     else:
+                        self._index.update(lang, mod_, None)
                         self._loadfailmods[lang].append(mod_)
 
                 except BaseException:
@@ -690,9 +734,11 @@ class ModuleManager:
     # @endif
 
     def removeInvalidModules(self):
-        for modprof in self._modprofs:
+        for modprof in self._modprofs[:]:
             if not os.path.isfile(modprof.getProperty("module_file_path")):
                 self._modprofs.remove(modprof)
+                self._modprofpaths.discard(
+                    modprof.getProperty("module_file_path"))
 
     ##
     # @if jp
@@ -736,6 +782,14 @@ class ModuleManager:
 
     def getLoadableModules(self):
         self._rtcout.RTC_TRACE("getLoadableModules()")
+
+        now = time.time()
+        if self._lastScan is not None and \
+                now - self._lastScan < self._rescanInterval:
+            self.removeInvalidModules()
+            self._rtcout.RTC_DEBUG("Modile profile size: %d (cached)",
+                                   len(self._modprofs))
+            return self._modprofs
         # getting loadable module file path list.
         langs = self._properties.getProperty(
             "manager.supported_languages").split(",")
@@ -747,7 +801,9 @@ class ModuleManager:
             lang = lang.strip()
 
             modules_ = []
-            self.getModuleList(lang, modules_)
+            found_ = set()
+            self.getModuleList(lang, modules_, found_)
+            self._index.prune(lang, found_)
             self._rtcout.RTC_DEBUG(
                 "%s: %s", (lang, OpenRTM_aist.flatten(modules_)))
 
@@ -758,12 +814,19 @@ class ModuleManager:
                 len(tmpprops))
 
             self._modprofs.extend(tmpprops)
+            for prop in tmpprops:
+                self._modprofpaths.add(prop.getProperty("module_file_path"))
 
         self._rtcout.RTC_DEBUG("Modile profile size: %d", len(self._modprofs))
         self.removeInvalidModules()
         self._rtcout.RTC_DEBUG(
             "Modile profile size: %d (invalid mod-profiles deleted)", len(self._modprofs))
 
+        if not self._index.save():
+            self._rtcout.RTC_WARN("Failed to save module index: %s",
+                                  self._properties.getProperty(MOD_INDEX_FILE))
+        self._lastScan = now
+
         return self._modprofs
 
     ##
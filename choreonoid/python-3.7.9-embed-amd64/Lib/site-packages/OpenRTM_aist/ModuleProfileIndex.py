@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ModuleProfileIndex.py
+# @brief Module profile index class
+# @date $Date: $
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+
+import os
+import json
+import threading
+
+import OpenRTM_aist
+
+
+##
+# @if jp
+#
+# @brief モジュールプロファイルのインデックスクラス
+# @class ModuleProfileIndex
+#
+# ロード可能モジュールのファイルパス毎に、ファイルの更新時刻、サイズと
+# 取得したRTCプロファイルを保持する。更新時刻とサイズが変わっていない
+# ファイルはプロファイルの取得(モジュールのインポート、rtcprofの実行)を
+# 省略できる。プロファイルを取得できなかったファイルも記録する。
+# ファイル名を指定した場合は JSON 形式で保存し、次回起動時に読み込む。
+#
+# @else
+#
+# @brief Module profile index class
+# @class ModuleProfileIndex
+#
+# Keeps the modification time, the size and the extracted RTC profile
+# of each loadable module file, so that unchanged files do not have to
+# be imported or passed to rtcprof again. Files without a profile are
+# recorded as well. When a file name is given, the index is persisted
+# as JSON and reloaded on the next start.
+#
+# @endif
+class ModuleProfileIndex:
+    """
+    """
+
+    VERSION = 2
+
+    ##
+    # @if jp
+    #
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param filename インデックスの保存先(空の場合は保存しない)
+    #
+    # @else
+    #
+    # @brief Constructor
+    #
+    # @param self
+    # @param filename file the index is stored to (not stored if empty)
+    #
+    # @endif
+    def __init__(self, filename=""):
+        self._filename = filename
+        self._mutex = threading.RLock()
+        self._entries = {}
+        self._dirty = False
+        if self._filename:
+            self.load()
+
+    ##
+    # @if jp
+    #
+    # @brief インデックスファイルを読み込む
+    #
+    # 読み込めない場合やバージョンが異なる場合は空のインデックスとする。
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Load the index file
+    #
+    # @param self
+    #
+    # @endif
+    def load(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        try:
+            with open(self._filename, "r") as f:
+                data = json.load(f)
+            if data.get("version") == ModuleProfileIndex.VERSION:
+                self._entries = data.get("entries", {})
+        except (IOError, OSError, ValueError):
+            self._entries = {}
+        self._dirty = False
+
+    ##
+    # @if jp
+    #
+    # @brief インデックスファイルを保存する
+    #
+    # 変更がない場合は何もしない。一時ファイルに書き込んでから置き換える。
+    #
+    # @param self
+    #
+    # @return 保存に成功、もしくは保存不要の場合にTrue
+    #
+    # @else
+    #
+    # @brief Save the index file
+    #
+    # Does nothing if unchanged. A temporary file is written and then
+    # renamed over the index file.
+    #
+    # @param self
+    #
+    # @return True if saved or nothing to save
+    #
+    # @endif
+    def save(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if not self._filename or not self._dirty:
+            return True
+        tmpname = self._filename + "." + str(os.getpid()) + ".tmp"
+        try:
+            dirname = os.path.dirname(self._filename)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with open(tmpname, "w") as f:
+                json.dump({"version": ModuleProfileIndex.VERSION,
+                           "entries": self._entries}, f)
+            os.replace(tmpname, self._filename)
+        except (IOError, OSError):
+            return False
+        self._dirty = False
+        return True
+
+    ##
+    # @if jp
+    #
+    # @brief ファイルに対応するプロファイルを検索する
+    #
+    # ファイルの更新時刻とサイズが記録時と一致する場合のみ有効とする。
+    #
+    # @param self
+    # @param lang 言語
+    # @param path ファイルパス
+    #
+    # @return (見つかったかどうか, プロファイル)
+    # プロファイルが取得できなかったファイルの場合はNone
+    #
+    # @else
+    #
+    # @brief Find the profile of a file
+    #
+    # An entry is valid only while the modification time and the size
+    # of the file are unchanged.
+    #
+    # @param self
+    # @param lang language
+    # @param path file path
+    #
+    # @return (found or not, profile) profile is None for files without one
+    #
+    # @endif
+    def find(self, lang, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False, None
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        entry = self._entries.get(lang, {}).get(path)
+        if entry is None or entry["mtime"] != st.st_mtime or \
+                entry["size"] != st.st_size:
+            return False, None
+        if entry["profile"] is None:
+            return True, None
+        prop = OpenRTM_aist.Properties()
+        for key, value, default_value in entry["profile"]:
+            if default_value:
+                prop.setDefault(key, default_value)
+            if value is not None:
+                prop.setProperty(key, value)
+        return True, prop
+
+    ##
+    # @if jp
+    #
+    # @brief ファイルのプロファイルを記録する
+    #
+    # @param self
+    # @param lang 言語
+    # @param path ファイルパス
+    # @param prop プロファイル(取得できなかった場合はNone)
+    #
+    # @else
+    #
+    # @brief Record the profile of a file
+    #
+    # @param self
+    # @param lang language
+    # @param path file path
+    # @param prop profile (None if it could not be extracted)
+    #
+    # @endif
+    def update(self, lang, path, prop):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        profile = None
+        if prop is not None:
+            profile = []
+            for node in prop.leaf:
+                self.__storeNode(profile, node.name, node)
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._entries.setdefault(lang, {})[path] = {"mtime": st.st_mtime,
+                                                    "size": st.st_size,
+                                                    "profile": profile}
+        self._dirty = True
+
+    ##
+    # @if jp
+    #
+    # @brief プロパティのノードを値、デフォルト値とともに記録する
+    #
+    # 子ノードを持つノードの値も失われないように、全てのノードを記録する。
+    #
+    # @param self
+    # @param profile 記録先のリスト
+    # @param name ノードの名前('.'区切り)
+    # @param node 対象ノード
+    #
+    # @else
+    #
+    # @brief Record a property node with its value and default value
+    #
+    # Every node is recorded, so values of nodes that also have children
+    # are not lost.
+    #
+    # @param self
+    # @param profile list the node is recorded to
+    # @param name node name ('.' separated)
+    # @param node target node
+    #
+    # @endif
+    def __storeNode(self, profile, name, node):
+        if node.value is not None or node.default_value:
+            profile.append([name, node.value, node.default_value])
+        for leaf in node.leaf:
+            self.__storeNode(profile, name + "." + leaf.name, leaf)
+
+    ##
+    # @if jp
+    #
+    # @brief 走査で見つからなかったファイルのエントリを削除する
+    #
+    # @param self
+    # @param lang 言語
+    # @param paths 走査で見つかったファイルパスの集合
+    #
+    # @else
+    #
+    # @brief Remove entries of files not found by the scan
+    #
+    # @param self
+    # @param lang language
+    # @param paths set of file paths found by the scan
+    #
+    # @endif
+    def prune(self, lang, paths):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        entries = self._entries.get(lang, {})
+        for path in list(entries.keys()):
+            if path not in paths:
+                del entries[path]
+                self._dirty = True
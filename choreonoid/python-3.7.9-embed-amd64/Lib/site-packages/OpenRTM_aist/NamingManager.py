@@ -260,6 +260,57 @@ class NamingOnCorba(NamingBase):
         self._rtcout.RTC_TRACE("getCorbaNaming()")
         return self._cosnaming
 
+    ##
+    # @if jp
+    #
+    # @brief RTCのインスタンス名の一覧の取得
+    #
+    # 指定コンテキスト以下を再帰的に走査し、kindがrtcのバインディングの
+    # 名前を集める。コンテキスト毎に一度だけlistを呼び出し、RTCの
+    # オブジェクトリファレンスの解決や生存確認は行わない。
+    #
+    # @param self
+    # @param context 現在走査中のコンテキスト
+    # @param names RTCのインスタンス名の集合
+    #
+    # @else
+    #
+    # @brief Get the instance names of RTCs
+    #
+    # Walks the contexts under the given one and collects the names of
+    # bindings whose kind is rtc. list is called once per context; RTC
+    # references are neither resolved nor checked for liveness.
+    #
+    # @param self
+    # @param context context being walked
+    # @param names set of RTC instance names
+    #
+    # @endif
+
+    def getComponentNames(self, context, names):
+        self._rtcout.RTC_TRACE("getComponentNames()")
+        length = 65536
+        bl, bi = context.list(length)
+        bl = list(bl)
+        if not CORBA.is_nil(bi):
+            more = True
+            while more:
+                more, tmp_bl = bi.next_n(length)
+                bl.extend(tmp_bl)
+            bi.destroy()
+
+        for i in bl:
+            if i.binding_type == CosNaming.ncontext:
+                try:
+                    next_context = context.resolve(i.binding_name)
+                    self.getComponentNames(next_context, names)
+                except BaseException:
+                    self._rtcout.RTC_ERROR(
+                        OpenRTM_aist.Logger.print_exception())
+            elif i.binding_type == CosNaming.nobject:
+                if i.binding_name[0].kind == "rtc":
+                    names.add(i.binding_name[0].id)
+
     ##
     # @if jp
     #
@@ -9,7 +9,12 @@
 #
 
 
+import threading
+import time
+
 import OpenRTM_aist
+from omniORB import CORBA
+import CosNaming
 
 
 ##
@@ -19,9 +24,42 @@ import OpenRTM_aist
 # @brief オブジェクト生成時ネーミング・ポリシー(命名規則)管理用クラス
 #　ネーミングサービスからRTCを検索してナンバリングを行う
 #
+# manager.components.ns_unique.allocation により番号の割り当て方法を選ぶ。
+# - lookup: 番号毎にネーミングサービスでRTCを検索する(デフォルト)
+# - batch: ネーミングサービスのRTCの名前の一覧を一度だけ取得して
+#   使用済みの番号の集合を作り、空いている番号を割り当てる。一覧は
+#   manager.components.ns_unique.cache_ttl 秒の間再利用する。
+#   生存確認は行わないため、残っているバインディングの番号も使用済みとする。
+#
+# manager.components.ns_unique.reservation がYESの場合、batchモードでは
+# 割り当てた名前をkindがrtc_reservationのバインディングとして各ネーミング
+# サービスのルートコンテキストにbindして予約する。bindは既に同名の
+# バインディングがある場合に失敗するため、複数のマネージャが同時に
+# 番号を割り当てても同じ名前にはならない。予約はオブジェクト削除時に
+# 解放する。予約したマネージャが存在しない予約は削除する。
 #
 # @else
 #
+# @class NamingServiceNumberingPolicy
+# @brief Numbering policy that looks RTCs up in the naming service
+#
+# manager.components.ns_unique.allocation selects how numbers are
+# allocated.
+# - lookup: every candidate name is looked up in the naming service
+#   (default)
+# - batch: the names of RTCs in the naming services are listed once
+#   into a set of used numbers and a free number is handed out
+#   locally. The list is reused for
+#   manager.components.ns_unique.cache_ttl seconds. Liveness is not
+#   checked, so numbers of stale bindings count as used.
+#
+# With manager.components.ns_unique.reservation set to YES, batch mode
+# reserves the allocated name by binding it with kind rtc_reservation
+# in the root context of each naming service. bind fails if the
+# binding already exists, so managers allocating concurrently never
+# end up with the same name. The reservation is released when the
+# object is deleted, and reservations whose manager is gone are removed.
+#
 # @endif
 class NamingServiceNumberingPolicy(OpenRTM_aist.NumberingPolicy):
     """
@@ -45,6 +83,24 @@ class NamingServiceNumberingPolicy(OpenRTM_aist.NumberingPolicy):
         self._num = 0
         self._objects = []
         self._mgr = OpenRTM_aist.Manager.instance()
+        self._rtcout = self._mgr.getLogbuf("NamingServiceNumberingPolicy")
+        self._mutex = threading.RLock()
+        self._names = None
+        self._listed = 0.0
+        self._reserved = {}
+
+        config = self._mgr.getConfig()
+        self._batch = config.getProperty(
+            "manager.components.ns_unique.allocation", "lookup") == "batch"
+        self._ttl = 1.0
+        ret, ttl = OpenRTM_aist.stringTo(
+            self._ttl, config.getProperty("manager.components.ns_unique.cache_ttl",
+                                          "1.0"))
+        if ret:
+            self._ttl = ttl
+        self._reservation = OpenRTM_aist.toBool(
+            config.getProperty("manager.components.ns_unique.reservation"),
+            "YES", "NO", False)
 
     ##
     # @if jp
@@ -63,6 +119,8 @@ class NamingServiceNumberingPolicy(OpenRTM_aist.NumberingPolicy):
     # @endif
 
     def onCreate(self, obj):
+        if self._batch:
+            return self.allocate(obj.getTypeName())
         num = 0
         while True:
             num_str = OpenRTM_aist.otos(num)
@@ -88,7 +146,14 @@ class NamingServiceNumberingPolicy(OpenRTM_aist.NumberingPolicy):
     #
     # @endif
     def onDelete(self, obj):
-        pass
+        if not self._batch:
+            return
+        name = obj.getInstanceName()
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self._names is not None:
+            self._names.discard(name)
+        del guard
+        self.release(name)
 
     ##
     # @if jp
@@ -118,6 +183,292 @@ class NamingServiceNumberingPolicy(OpenRTM_aist.NumberingPolicy):
         else:
             return False
 
+    ##
+    # @if jp
+    #
+    # @brief 名前の一覧を使用した番号の割り当て
+    #
+    # @param self
+    # @param type_name 型名
+    #
+    # @return 割り当てた番号の文字列
+    #
+    # @else
+    #
+    # @brief Allocate a number from the list of names
+    #
+    # @param self
+    # @param type_name type name
+    #
+    # @return allocated number as a string
+    #
+    # @endif
+
+    def allocate(self, type_name):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        names = self.getNames()
+        used = set()
+        for name in names:
+            if name.startswith(type_name):
+                num_str = name[len(type_name):]
+                if num_str.isdigit():
+                    used.add(int(num_str))
+
+        num = 0
+        while True:
+            if num not in used:
+                name = type_name + OpenRTM_aist.otos(num)
+                if not self._reservation or self.reserve(name):
+                    names.add(name)
+                    return OpenRTM_aist.otos(num)
+                names.add(name)
+            num += 1
+
+    ##
+    # @if jp
+    #
+    # @brief ネーミングサービスに登録されたRTCの名前の集合の取得
+    #
+    # 前回の取得から manager.components.ns_unique.cache_ttl 秒以内の場合は
+    # 前回の結果を返す。
+    #
+    # @param self
+    #
+    # @return RTCの名前の集合
+    #
+    # @else
+    #
+    # @brief Get the set of RTC names in the naming services
+    #
+    # The previous result is returned within
+    # manager.components.ns_unique.cache_ttl seconds.
+    #
+    # @param self
+    #
+    # @return set of RTC names
+    #
+    # @endif
+
+    def getNames(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        now = time.time()
+        if self._names is not None and now - self._listed < self._ttl:
+            return self._names
+
+        names = set()
+        for ns in self.getNamingObjects():
+            try:
+                ns.getComponentNames(ns.getCorbaNaming().getRootContext(),
+                                     names)
+            except BaseException:
+                self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+        self._rtcout.RTC_DEBUG("%d RTC names listed.", len(names))
+        self._names = names
+        self._listed = now
+        return self._names
+
+    ##
+    # @if jp
+    #
+    # @brief CORBAネーミングサービスの一覧の取得
+    #
+    # @param self
+    #
+    # @return NamingOnCorbaのリスト
+    #
+    # @else
+    #
+    # @brief Get the CORBA naming services
+    #
+    # @param self
+    #
+    # @return list of NamingOnCorba
+    #
+    # @endif
+
+    def getNamingObjects(self):
+        return [n.ns for n in self._mgr.getNaming().getNameServices()
+                if isinstance(n.ns, OpenRTM_aist.NamingOnCorba)]
+
+    ##
+    # @if jp
+    #
+    # @brief 名前の予約
+    #
+    # 各ネーミングサービスのルートコンテキストに予約用のバインディングを
+    # bindする。既に予約されている場合は、このマネージャで行った予約を
+    # 取り消して失敗とする。
+    #
+    # @param self
+    # @param name 名前
+    #
+    # @return 予約に成功した場合はTrue
+    #
+    # @else
+    #
+    # @brief Reserve a name
+    #
+    # Binds a reservation in the root context of each naming service.
+    # If the name is already reserved, the bindings made here are
+    # removed again and the reservation fails.
+    #
+    # @param self
+    # @param name name
+    #
+    # @return True if reserved
+    #
+    # @endif
+
+    def reserve(self, name):
+        name_list = [CosNaming.NameComponent(name, "rtc_reservation")]
+        reserved = []
+        for ns in self.getNamingObjects():
+            cns = ns.getCorbaNaming()
+            try:
+                cns.getRootContext().bind(name_list, self.getOwner(cns))
+                reserved.append(cns)
+            except CosNaming.NamingContext.AlreadyBound:
+                self._rtcout.RTC_DEBUG("%s is already reserved.", name)
+                self.removeStale(cns, name_list)
+                for cns_ in reserved:
+                    self.unbind(cns_, name_list)
+                return False
+            except BaseException:
+                self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._reserved[name] = reserved
+        return True
+
+    ##
+    # @if jp
+    #
+    # @brief 名前の予約の解放
+    #
+    # @param self
+    # @param name 名前
+    #
+    # @else
+    #
+    # @brief Release the reservation of a name
+    #
+    # @param self
+    # @param name name
+    #
+    # @endif
+
+    def release(self, name):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        reserved = self._reserved.pop(name, [])
+        del guard
+        name_list = [CosNaming.NameComponent(name, "rtc_reservation")]
+        for cns in reserved:
+            self.unbind(cns, name_list)
+
+    ##
+    # @if jp
+    #
+    # @brief 予約の所有者として登録するオブジェクトの取得
+    #
+    # マネージャのオブジェクトリファレンスを使用する。マネージャの
+    # CORBAサーバントがない場合はルートコンテキストを使用する。
+    #
+    # @param self
+    # @param cns CorbaNaming
+    #
+    # @return オブジェクトリファレンス
+    #
+    # @else
+    #
+    # @brief Get the object bound as the owner of a reservation
+    #
+    # The manager reference is used. The root context is used when the
+    # manager has no CORBA servant.
+    #
+    # @param self
+    # @param cns CorbaNaming
+    #
+    # @return object reference
+    #
+    # @endif
+
+    def getOwner(self, cns):
+        servant = self._mgr.getManagerServant()
+        if servant:
+            return servant.getObjRef()
+        return cns.getRootContext()
+
+    ##
+    # @if jp
+    #
+    # @brief 所有者が存在しない予約の削除
+    #
+    # 削除した場合もその名前は使用しない。
+    #
+    # @param self
+    # @param cns CorbaNaming
+    # @param name_list 予約の名前
+    #
+    # @else
+    #
+    # @brief Remove a reservation whose owner is gone
+    #
+    # The name is not used even if the reservation was removed.
+    #
+    # @param self
+    # @param cns CorbaNaming
+    # @param name_list name of the reservation
+    #
+    # @endif
+
+    def removeStale(self, cns, name_list):
+        try:
+            owner = cns.getRootContext().resolve(name_list)
+            if not owner._non_existent():
+                return
+        except (CORBA.TRANSIENT, CORBA.OBJECT_NOT_EXIST, CORBA.COMM_FAILURE):
+            pass
+        except BaseException:
+            self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+            return
+        self._rtcout.RTC_INFO("Stale reservation %s removed.",
+                              name_list[0].id)
+        self.unbind(cns, name_list)
+
+    ##
+    # @if jp
+    #
+    # @brief 予約のバインディングの削除
+    #
+    # 削除に失敗した場合はログを出力して続行する。
+    #
+    # @param self
+    # @param cns CorbaNaming
+    # @param name_list 予約の名前
+    #
+    # @else
+    #
+    # @brief Unbind a reservation
+    #
+    # A failure is logged and otherwise ignored.
+    #
+    # @param self
+    # @param cns CorbaNaming
+    # @param name_list name of the reservation
+    #
+    # @endif
+
+    def unbind(self, cns, name_list):
+        try:
+            cns.unbind(name_list)
+        except (CORBA.SystemException,
+                CosNaming.NamingContext.NotFound,
+                CosNaming.NamingContext.CannotProceed,
+                CosNaming.NamingContext.InvalidName):
+            self._rtcout.RTC_ERROR("Failed to unbind reservation %s.",
+                                   name_list[0].id)
+            self._rtcout.RTC_DEBUG(OpenRTM_aist.Logger.print_exception())
+
 
 def NamingServiceNumberingPolicyInit():
     OpenRTM_aist.NumberingPolicyFactory.instance().addFactory("ns_unique",
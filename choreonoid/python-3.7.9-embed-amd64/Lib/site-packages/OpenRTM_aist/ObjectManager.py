@@ -193,3 +193,93 @@ class ObjectManager:
             predi(_obj)
 
         return predi
+
+
+##
+# @if jp
+#
+# @brief 索引付きオブジェクト管理用クラス
+#
+# ObjectManager と同じ操作を持ち、オブジェクトをキー(インスタンス名、
+# ファクトリのID等)毎の辞書でも管理する。検索用ファンクタは key() で
+# 検索条件のキーを返す必要がある。ファンクタが一致と判定するオブジェクトは
+# 同じキーを持つ必要がある。登録、登録解除、検索は同じキーのオブジェクト
+# のみを走査する。
+#
+# @else
+#
+# @brief Object management class with an index
+#
+# Provides the operations of ObjectManager and additionally keeps the
+# objects in a dictionary by key (instance name, factory id and so
+# on). The predicate must return the key of its condition from key(),
+# and objects it matches must share that key. Registration,
+# unregistration and lookup only scan the objects with the same key.
+#
+# @endif
+class IndexedObjectManager(ObjectManager):
+    """
+    """
+
+    ##
+    # @if jp
+    #
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param predicate オブジェクト検索用ファンクタ
+    #
+    # @else
+    #
+    # @brief Constructor
+    #
+    # @param self
+    # @param predicate predicate to find objects
+    #
+    # @endif
+    def __init__(self, predicate):
+        ObjectManager.__init__(self, predicate)
+        self._index = {}
+
+    def registerObject(self, obj):
+        guard = OpenRTM_aist.ScopedLock(self._objects._mutex)
+        predi = self._predicate(factory=obj)
+        bucket = self._index.setdefault(predi.key(), [])
+
+        for _obj in bucket:
+            if predi(_obj):
+                return False
+
+        bucket.append(obj)
+        self._objects._obj.append(obj)
+        return True
+
+    def unregisterObject(self, id):
+        guard = OpenRTM_aist.ScopedLock(self._objects._mutex)
+        predi = self._predicate(name=id)
+        bucket = self._index.get(predi.key())
+        if not bucket:
+            return None
+
+        for i, _obj in enumerate(bucket):
+            if predi(_obj):
+                del bucket[i]
+                if not bucket:
+                    del self._index[predi.key()]
+                self._objects._obj.remove(_obj)
+                return _obj
+
+        return None
+
+    def find(self, id):
+        guard = OpenRTM_aist.ScopedLock(self._objects._mutex)
+        if isinstance(id, str):
+            predi = self._predicate(name=id)
+        else:
+            predi = self._predicate(prop=id)
+
+        for _obj in self._index.get(predi.key(), ()):
+            if predi(_obj):
+                return _obj
+
+        return None
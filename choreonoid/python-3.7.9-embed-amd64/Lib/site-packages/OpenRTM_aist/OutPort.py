@@ -20,8 +20,8 @@
 from omniORB import any
 
 import OpenRTM_aist
-import threading
 import copy
+import itertools
 
 
 ##
@@ -114,9 +114,11 @@ class OutPort(OpenRTM_aist.OutPortBase):
         self.addConnectorDataListener(
             OpenRTM_aist.ConnectorDataListenerType.ON_SEND,
             OpenRTM_aist.Timestamp("on_send"))
-        self._directNewData = False
-        self._valueMutex = threading.RLock()
-        self._directValue = value
+        # latest sample for direct pull connectors: (sequence, data),
+        # replaced as a whole so that no lock is needed
+        self._directCount = itertools.count(1)
+        self._directSlot = (0, value)
+        self._directRead = 0
 
     def __del__(self, OutPortBase=OpenRTM_aist.OutPortBase):
         OutPortBase.__del__(self)
@@ -188,6 +190,8 @@ class OutPort(OpenRTM_aist.OutPortBase):
             value = self._OnWriteConvert(value)
 
         result = True
+        direct = False
+        direct_copy = False
 
         guard = OpenRTM_aist.ScopedLock(self._connector_mutex)
         for con in self._connectors:
@@ -198,9 +202,13 @@ class OutPort(OpenRTM_aist.OutPortBase):
                     if ret == self.CONNECTION_LOST:
                         self.disconnect(con.id())
             else:
-                guard = OpenRTM_aist.ScopedLock(self._valueMutex)
-                self._directValue = value
-                self._directNewData = True
+                direct = True
+                direct_copy = direct_copy or con.directCopy()
+        # one sample is shared by all direct connectors, copied if any
+        # of them asks for a copy
+        if direct:
+            self._directSlot = (next(self._directCount),
+                                copy.deepcopy(value) if direct_copy else value)
         del guard
 
         return result
@@ -321,16 +329,14 @@ class OutPort(OpenRTM_aist.OutPortBase):
     # void read(const DataType& data)
 
     def read(self):
-        guard = OpenRTM_aist.ScopedLock(self._valueMutex)
-        self._directNewData = False
-        data = self._directValue
+        seq, data = self._directSlot
+        self._directRead = seq
         if self._OnWriteConvert:
             data = self._OnWriteConvert(data)
-        del guard
         return data
 
     def isEmpty(self):
-        return (not self._directNewData)
+        return self._directSlot[0] == self._directRead
 
     class subscribe:
         def __init__(self, prof, subs=None):
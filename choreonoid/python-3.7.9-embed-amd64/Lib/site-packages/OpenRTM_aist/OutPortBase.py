@@ -325,6 +325,7 @@ class OutPortBase(OpenRTM_aist.PortBase, OpenRTM_aist.DataPortStatus):
         prop_list = []
         OpenRTM_aist.NVUtil.copyFromProperties(prop_list, self._properties)
         self._profile.properties.extend(prop_list)
+        self.profileChanged()
 
         self.configure()
 
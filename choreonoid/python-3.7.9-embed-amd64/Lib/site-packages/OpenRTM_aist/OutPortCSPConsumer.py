@@ -57,6 +57,7 @@ class OutPortCSPConsumer(OpenRTM_aist.OutPortCorbaCdrConsumer):
         OpenRTM_aist.CorbaConsumer.__init__(self, CSP.OutPortCsp)
         self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("OutPortCSPConsumer")
         self._properties = None
+        self._creditAvailable = False
         return
 
     ##
@@ -195,6 +196,69 @@ class OutPortCSPConsumer(OpenRTM_aist.OutPortCorbaCdrConsumer):
             self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
             return False
 
+    ##
+    # @if jp
+    # @brief データ送信通知への登録
+    #
+    # OutPortがクレジット通知(CSP::OutPortCspCredit)に対応している場合は
+    # CSP::OutPortCspCreditとしてオブジェクトリファレンスを取得する。
+    #
+    # @param self
+    # @param properties 登録情報
+    # @return 登録処理結果(登録成功:true、登録失敗:false)
+    #
+    # @else
+    # @brief Subscribe the data send notification
+    #
+    # The object reference is narrowed to CSP::OutPortCspCredit when the
+    # OutPort accepts credit notifications.
+    #
+    # @param self
+    # @param properties Information for subscription
+    # @return Subscription result (Successful:true, Failed:false)
+    #
+    # @endif
+    #
+    def subscribeInterface(self, properties):
+        self._creditAvailable = OpenRTM_aist.NVUtil.isStringValue(
+            properties, "dataport.csp_channel.credit", "YES")
+        if self._creditAvailable:
+            self._interfaceType = CSP.OutPortCspCredit
+        else:
+            self._interfaceType = CSP.OutPortCsp
+        return OpenRTM_aist.OutPortCorbaCdrConsumer.subscribeInterface(
+            self, properties)
+
+    ##
+    # @if jp
+    # @brief バッファの空き数を接続先のproviderに通知
+    #
+    # 接続先がクレジット通知に対応していない場合は何もしない。
+    #
+    # @param self
+    # @param credit バッファの空き数
+    #
+    # @else
+    # @brief Push the number of free buffer slots to the provider
+    #
+    # Does nothing if the provider does not accept credit notifications.
+    #
+    # @param self
+    # @param credit number of free slots
+    #
+    # @endif
+    #
+    def notifyCredit(self, credit):
+        if not self._creditAvailable:
+            return
+        self._rtcout.RTC_PARANOID("notifyCredit(%d)", credit)
+        try:
+            self._ptr().notify_credit(credit)
+        except BaseException:
+            self._rtcout.RTC_WARN(
+                "Exception caught from OutPort.notify_credit().")
+            self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+
 
 ##
 # @if jp
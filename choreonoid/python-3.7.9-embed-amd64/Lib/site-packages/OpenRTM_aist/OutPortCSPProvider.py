@@ -29,7 +29,7 @@ import CSP__POA
 #
 # @endif
 #
-class OutPortCSPProvider(OpenRTM_aist.OutPortProvider, CSP__POA.OutPortCsp):
+class OutPortCSPProvider(OpenRTM_aist.OutPortProvider, CSP__POA.OutPortCspCredit):
 
     """
     """
@@ -64,6 +64,9 @@ class OutPortCSPProvider(OpenRTM_aist.OutPortProvider, CSP__POA.OutPortCsp):
                                                           orb.object_to_string(self._objref)))
         self._properties.append(OpenRTM_aist.NVUtil.newNV("dataport.corba_cdr.outport_ref",
                                                           self._objref))
+        # InPort side may push credits (CSP::OutPortCspCredit)
+        self._properties.append(OpenRTM_aist.NVUtil.newNV("dataport.csp_channel.credit",
+                                                          "YES"))
         self._listeners = None
         self._connector = None
         self._profile = None
@@ -191,6 +194,31 @@ class OutPortCSPProvider(OpenRTM_aist.OutPortProvider, CSP__POA.OutPortCsp):
             return self._connector.isReadable(retry)
         return False
 
+    ##
+    # @if jp
+    # @brief InPort側からのクレジット通知
+    #
+    # InPort側のバッファの空き数をコネクタに設定する。
+    #
+    # @param self
+    # @param credit バッファの空き数
+    #
+    # @else
+    # @brief Credit notification from the InPort
+    #
+    # Passes the number of free slots of the InPort buffer to the
+    # connector.
+    #
+    # @param self
+    # @param credit number of free slots
+    #
+    # @endif
+    #
+    def notify_credit(self, credit):
+        self._rtcout.RTC_PARANOID("notify_credit(%d)", credit)
+        if self._connector:
+            self._connector.setCredit(credit)
+
     def onBufferRead(self, data):
         if self._listeners and self._profile:
             _, data = self._listeners.notifyData(
@@ -60,6 +60,8 @@ class OutPortConnector(OpenRTM_aist.ConnectorBase):
         self._profile = info
         self._endian = True
         self._directMode = False
+        self._directCopy = OpenRTM_aist.normalize(
+            info.properties.getProperty("direct.ownership", "share")) == "copy"
         self._dataType = None
         return
 
@@ -192,6 +194,44 @@ class OutPortConnector(OpenRTM_aist.ConnectorBase):
     def directMode(self):
         return self._directMode
 
+    ##
+    # @if jp
+    # @brief ダイレクト接続でデータを複製するかの判定
+    #
+    # ダイレクト接続では、データはシリアライズせずに同一プロセス内の
+    # 相手のポートへ渡される。データの所有権はコネクタプロファイルの
+    # direct.ownership で指定する。
+    # - share: (デフォルト) 書き込んだオブジェクトそのものを渡す。
+    #   書き込み側は書き込んだオブジェクトを変更してはならず、読み出し側は
+    #   読み出したオブジェクトを変更してはならない。書き込みごとに新しい
+    #   オブジェクトを生成し、書き込み後に参照を捨てれば、読み出し側に
+    #   所有権を移したことになる(読み出し側が1つの場合は変更してよい)。
+    # - copy: 書き込み時にディープコピーしたオブジェクトを渡す。
+    #   バインドした変数を使い回す書き込み側のためのモード。
+    #
+    # @return True：copy,False：share
+    #
+    # @else
+    # @brief Whether data is copied on a direct connection
+    #
+    # On a direct connection the data is passed to the peer port in the
+    # same process without serialization. Ownership of the data is
+    # chosen by direct.ownership of the connector profile:
+    # - share: (default) the written object itself is passed. The writer
+    #   must not modify an object once written, and readers must not
+    #   modify what they read. Writing a new object each time and
+    #   dropping the reference after write() moves the ownership to the
+    #   reader (which may then modify it if it is the only reader).
+    # - copy: a deep copy made on write is passed, for writers that
+    #   reuse the bound variable.
+    #
+    # @return True: copy, False: share
+    #
+    # @endif
+    #
+    def directCopy(self):
+        return self._directCopy
+
     def write(self, data):
         pass
 
@@ -78,6 +78,10 @@ class OutPortCorbaCdrConsumer(
         self._buffer = None
         self._profile = None
         self._listeners = None
+        self._seqAvailable = False
+        self._useSequence = True
+        self._pullTimeout = 0
+        self._lastSeq = 0
         return
 
     ##
@@ -108,6 +112,10 @@ class OutPortCorbaCdrConsumer(
     # 能性がある。したがって、この関数は複数回呼ばれることを想定して記
     # 述されるべきである。
     #
+    # - corba_cdr.pull_sequence: OutPort が対応していればシーケンス番号
+    #   付きの get_if_modified() を使う (YES/NO, デフォルト YES)
+    # - corba_cdr.pull_timeout: 新しいデータを待つ最大時間[s] (デフォルト 0)
+    #
     # @param prop 設定情報
     #
     # @else
@@ -121,6 +129,11 @@ class OutPortCorbaCdrConsumer(
     # connection sequence respectivly.  Therefore, this function
     # should be implemented assuming multiple call.
     #
+    # - corba_cdr.pull_sequence: use sequence numbered get_if_modified()
+    #   when the OutPort supports it (YES/NO, default YES)
+    # - corba_cdr.pull_timeout: maximum time to wait for new data [s]
+    #   (default 0)
+    #
     # @param prop Configuration information
     #
     # @endif
@@ -129,6 +142,18 @@ class OutPortCorbaCdrConsumer(
 
     def init(self, prop):
         self._rtcout.RTC_TRACE("init()")
+
+        if prop.getProperty("corba_cdr.pull_sequence"):
+            self._useSequence = OpenRTM_aist.toBool(
+                prop.getProperty("corba_cdr.pull_sequence"), "YES", "NO", True)
+
+        if prop.getProperty("corba_cdr.pull_timeout"):
+            try:
+                self._pullTimeout = int(
+                    float(prop.getProperty("corba_cdr.pull_timeout")) * 1000)
+            except ValueError:
+                self._rtcout.RTC_ERROR("invalid corba_cdr.pull_timeout: %s",
+                                       prop.getProperty("corba_cdr.pull_timeout"))
         return
 
     ##
@@ -201,7 +226,12 @@ class OutPortCorbaCdrConsumer(
         try:
             data = None
             outportcdr = self._ptr()
-            ret, cdr_data = outportcdr.get()
+            if self._seqAvailable and self._useSequence:
+                ret, seq, cdr_data = outportcdr.get_if_modified(
+                    self._lastSeq, self._pullTimeout)
+                self._lastSeq = seq
+            else:
+                ret, cdr_data = outportcdr.get()
 
             if ret == OpenRTM.PORT_OK:
                 self._rtcout.RTC_DEBUG("get() successful")
@@ -259,6 +289,16 @@ class OutPortCorbaCdrConsumer(
             self._rtcout.RTC_DEBUG("dataport.corba_cdr.outport_ior not found.")
             return False
 
+        # OutPort supports sequence numbered pull (OpenRTM::OutPortCdrSeq)
+        # Derived consumers with their own interface type are left as is.
+        if self._interfaceType in (OpenRTM.OutPortCdr, OpenRTM.OutPortCdrSeq):
+            self._seqAvailable = OpenRTM_aist.NVUtil.isStringValue(
+                properties, "dataport.corba_cdr.outport_seq", "YES")
+            if self._seqAvailable:
+                self._interfaceType = OpenRTM.OutPortCdrSeq
+            else:
+                self._interfaceType = OpenRTM.OutPortCdr
+
         if OpenRTM_aist.NVUtil.isString(
                 properties, "dataport.corba_cdr.outport_ior"):
             self._rtcout.RTC_DEBUG("dataport.corba_cdr.outport_ior found.")
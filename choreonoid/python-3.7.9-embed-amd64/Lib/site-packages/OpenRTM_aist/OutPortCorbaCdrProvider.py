@@ -48,7 +48,7 @@ import OpenRTM
 
 
 class OutPortCorbaCdrProvider(OpenRTM_aist.OutPortProvider,
-                              OpenRTM__POA.OutPortCdr):
+                              OpenRTM__POA.OutPortCdrSeq):
     ##
     # @if jp
     # @brief コンストラクタ
@@ -82,6 +82,9 @@ class OutPortCorbaCdrProvider(OpenRTM_aist.OutPortProvider,
                                                           orb.object_to_string(self._objref)))
         self._properties.append(OpenRTM_aist.NVUtil.newNV("dataport.corba_cdr.outport_ref",
                                                           self._objref))
+        # sequence numbered pull (OpenRTM::OutPortCdrSeq) is available
+        self._properties.append(OpenRTM_aist.NVUtil.newNV("dataport.corba_cdr.outport_seq",
+                                                          "YES"))
 
         self._listeners = None
         self._connector = None
@@ -303,6 +306,59 @@ class OutPortCorbaCdrProvider(OpenRTM_aist.OutPortProvider,
 
         return self.convertReturn(ret, cdr)
 
+    ##
+    # @if jp
+    # @brief [CORBA interface] 更新されたデータのみ取得する
+    #
+    # last_seq 以降に書き込まれたデータがあればバッファから取得する。
+    # なければ最大 timeout_msec ミリ秒待機し、それでもなければデータを
+    # 含まずに BUFFER_EMPTY (更新なし) を返す。
+    #
+    # @param last_seq 呼び出し側が最後に受け取ったシーケンス番号
+    # @param timeout_msec 最大待機時間[ms]
+    # @return (リターンコード, シーケンス番号, 取得データ)
+    #
+    # @else
+    # @brief [CORBA interface] Get data only if it was modified
+    #
+    # Reads the buffer if data was written after last_seq. Otherwise
+    # waits up to timeout_msec milliseconds and answers BUFFER_EMPTY
+    # (not modified) without a payload.
+    #
+    # @param last_seq sequence number last received by the caller
+    # @param timeout_msec maximum wait time [ms]
+    # @return (return code, sequence number, data)
+    #
+    # @endif
+    #
+    # virtual ::OpenRTM::PortStatus
+    #   get_if_modified(::CORBA::ULongLong last_seq,
+    #                   ::CORBA::ULong timeout_msec,
+    #                   ::CORBA::ULongLong_out seq,
+    #                   ::OpenRTM::CdrData_out data);
+    def get_if_modified(self, last_seq, timeout_msec):
+        self._rtcout.RTC_PARANOID("OutPortCorbaCdrProvider.get_if_modified()")
+
+        if not self._connector:
+            self.onSenderError()
+            return (OpenRTM.UNKNOWN_ERROR, last_seq, "")
+
+        try:
+            seq, readable = self._connector.waitReadable(
+                last_seq, timeout_msec / 1000.0)
+        except BaseException:
+            self._rtcout.RTC_TRACE(OpenRTM_aist.Logger.print_exception())
+            return (OpenRTM.UNKNOWN_ERROR, last_seq, "")
+
+        if not readable:
+            self._rtcout.RTC_PARANOID("not modified since %d", last_seq)
+            ret, _ = self.convertReturn(
+                OpenRTM_aist.BufferStatus.BUFFER_EMPTY, "")
+            return (ret, seq, "")
+
+        ret, data = self.get()
+        return (ret, seq, data)
+
     ##
     # @if jp
     # @brief ON_BUFFER_READ のリスナへ通知する。
@@ -84,6 +84,9 @@ class OutPortDuplexConnector(OpenRTM_aist.OutPortConnector):
         self._consumer = None
         self._isReadableCallback = None
         self._readCallback = None
+        self._credit = None
+        self._credit_mutex = threading.RLock()
+        self._creditCallback = None
 
         self._marshaling_type = info.properties.getProperty(
             "marshaling_type", "cdr")
@@ -141,7 +144,12 @@ class OutPortDuplexConnector(OpenRTM_aist.OutPortConnector):
         if self._consumer:
             ret, cdr_data = self.serializeData(data)
             if ret == self.PORT_OK:
-                return self._consumer.put(cdr_data)
+                ret = self._consumer.put(cdr_data)
+                if ret == self.PORT_OK:
+                    guard = OpenRTM_aist.ScopedLock(self._credit_mutex)
+                    if self._credit:
+                        self._credit -= 1
+                return ret
             else:
                 return ret
         else:
@@ -153,6 +161,9 @@ class OutPortDuplexConnector(OpenRTM_aist.OutPortConnector):
     #
     # 設定したConsumerオブジェクトによりInPort側にデー化書き込み可能かを確認する
     # 戻り値は設定したConsumerオブジェクトに依存する
+    # InPort側からクレジットの通知を受けている場合、クレジットが0であれば
+    # InPort側に確認せずにFalseを返す。1以上の場合もInPort側での書き込み
+    # 予約のためにInPort側に確認する
     #
     # @param self
     # @param retry True：再検索、False：通常の書き込み確認
@@ -169,10 +180,65 @@ class OutPortDuplexConnector(OpenRTM_aist.OutPortConnector):
     # @endif
     #
     def isWritable(self, retry=False):
+        # credit only rules out the remote call; is_writable reserves the
+        # InPort and wakes a reader waiting in select()
+        if self._credit is not None and self._credit <= 0:
+            return False
         if self._consumer:
             return self._consumer.isWritable(retry)
         return False
 
+    ##
+    # @if jp
+    # @brief InPort側からのクレジットの設定
+    #
+    # InPort側のバッファの空き数を設定する。書き込みが成功する毎に
+    # 1ずつ減らし、0の間はisWritable()でInPort側に確認しない。
+    # クレジットが1以上になった場合はクレジット通知のリスナを呼び出す。
+    #
+    # @param self
+    # @param credit バッファの空き数
+    #
+    # @else
+    #
+    # @brief Set the credit pushed by the InPort
+    #
+    # Sets the number of free slots of the InPort buffer. It is
+    # decremented by every successful write, and isWritable() does not
+    # ask the InPort while it is 0. The credit listener is called when
+    # the credit becomes positive.
+    #
+    # @param self
+    # @param credit number of free slots
+    #
+    # @endif
+    #
+    def setCredit(self, credit):
+        guard = OpenRTM_aist.ScopedLock(self._credit_mutex)
+        self._credit = credit
+        del guard
+        if credit > 0 and self._creditCallback:
+            self._creditCallback(self)
+
+    ##
+    # @if jp
+    # @brief クレジットの取得
+    #
+    # @param self
+    # @return クレジット、通知を受けていない場合はNone
+    #
+    # @else
+    #
+    # @brief Get the credit
+    #
+    # @param self
+    # @return credit, None if no credit was pushed
+    #
+    # @endif
+    #
+    def getCredit(self):
+        return self._credit
+
     ##
     # @if jp
     # @brief データ読み込み
@@ -267,6 +333,25 @@ class OutPortDuplexConnector(OpenRTM_aist.OutPortConnector):
     def setIsReadableListener(self, listener):
         self._isReadableCallback = listener
 
+    ##
+    # @if jp
+    # @brief クレジット通知時のリスナを登録
+    #
+    # @param self
+    # @param listener リスナ
+    #
+    # @else
+    #
+    # @brief Set the listener called on credit notification
+    #
+    # @param self
+    # @param listener listener
+    #
+    # @endif
+    #
+    def setCreditListener(self, listener):
+        self._creditCallback = listener
+
     ##
     # @if jp
     # @brief 接続解除
@@ -20,6 +20,7 @@
 
 import OpenRTM_aist
 import threading
+import time
 
 
 ##
@@ -158,6 +159,9 @@ class OutPortPullConnector(OpenRTM_aist.OutPortConnector):
 
         self._serializer = None
 
+        self._seq = 0
+        self._seq_cond = threading.Condition(threading.RLock())
+
         return
 
     ##
@@ -227,7 +231,14 @@ class OutPortPullConnector(OpenRTM_aist.OutPortConnector):
                     self._readready_worker._cond.wait()
                 self._readready_worker._cond.release()
 
-            self._buffer.write(cdr_data)
+            ret = self._buffer.write(cdr_data)
+
+            # only data actually buffered advances the sequence number
+            if ret == OpenRTM_aist.BufferStatus.BUFFER_OK:
+                self._seq_cond.acquire()
+                self._seq += 1
+                self._seq_cond.notify_all()
+                self._seq_cond.release()
 
             if self._sync_readwrite:
                 self._writecompleted_worker._completed = True
@@ -326,6 +337,51 @@ class OutPortPullConnector(OpenRTM_aist.OutPortConnector):
     def getBuffer(self):
         return self._buffer
 
+    ##
+    # @if jp
+    # @brief 新しいデータの書き込みを待つ
+    #
+    # バッファが空で、書き込みシーケンス番号が last_seq から進んでいない
+    # 間、最大 timeout 秒待機する。sync_readwrite が有効な場合は書き込み
+    # 側が読み出しを待つため、待機せずに直ちに返す。
+    #
+    # @param self
+    # @param last_seq 読み出し側が最後に受け取ったシーケンス番号
+    # @param timeout 最大待機時間[s]
+    # @return (現在のシーケンス番号, 読み出し可能かどうか)
+    #
+    # @else
+    # @brief Wait for newly written data
+    #
+    # Waits up to timeout seconds while the buffer is empty and the
+    # write sequence number has not advanced from last_seq. Returns
+    # immediately when sync_readwrite is enabled, because the writer
+    # is waiting for the reader in that mode.
+    #
+    # @param self
+    # @param last_seq sequence number last received by the reader
+    # @param timeout maximum wait time [s]
+    # @return (current sequence number, whether data can be read)
+    #
+    # @endif
+    #
+    def waitReadable(self, last_seq, timeout=0.0):
+        if self._sync_readwrite:
+            return self._seq, True
+        self._seq_cond.acquire()
+        try:
+            if timeout > 0:
+                deadline = time.time() + timeout
+                while self._seq == last_seq and self._buffer.empty():
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._seq_cond.wait(remaining)
+            readable = self._seq != last_seq or not self._buffer.empty()
+            return self._seq, readable
+        finally:
+            self._seq_cond.release()
+
     ##
     # @if jp
     # @brief アクティブ化
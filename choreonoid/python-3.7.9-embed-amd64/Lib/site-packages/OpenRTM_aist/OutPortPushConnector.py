@@ -18,6 +18,8 @@
 #
 
 
+import copy
+
 import OpenRTM_aist
 
 
@@ -239,27 +241,16 @@ class OutPortPushConnector(OpenRTM_aist.OutPortConnector):
     # template<class DataType>
     # virtual ReturnCode write(const DataType& data);
     def write(self, data):
-        self._rtcout.RTC_TRACE("write()")
-
+        # direct mode: no serialization, no logging and no listener
+        # calls per sample
         if self._directInPort is not None:
-            if self._directInPort.isNew():
-                #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_BUFFER_OVERWRITE, self._profile, data)
-                #self._inPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_BUFFER_OVERWRITE, self._profile, data)
-                #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVER_FULL, self._profile, data)
-                #self._inPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVER_FULL, self._profile, data)
-                self._rtcout.RTC_TRACE("ONBUFFER_OVERWRITE(InPort,OutPort), ")
-                self._rtcout.RTC_TRACE("ON_RECEIVER_FULL(InPort,OutPort) ")
-                self._rtcout.RTC_TRACE("callback called in direct mode.")
-            #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_BUFFER_WRITE, self._profile, data)
-            #self._inPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_BUFFER_WRITE, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_BUFFER_WRITE(InPort,OutPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
+            if self._directCopy:
+                data = copy.deepcopy(data)
             self._directInPort.write(data)
-            #self._listeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVED, self._profile, data)
-            #self._inPortListeners.notifyData(OpenRTM_aist.ConnectorDataListenerType.ON_RECEIVED, self._profile, data)
-            self._rtcout.RTC_TRACE("ON_RECEIVED(InPort,OutPort), ")
-            self._rtcout.RTC_TRACE("callback called in direct mode.")
             return self.PORT_OK
+
+        self._rtcout.RTC_TRACE("write()")
+
         # data -> (conversion) -> CDR stream
         if self._serializer is None:
             self._rtcout.RTC_ERROR("serializer creation failure.")
@@ -147,11 +147,11 @@ class PeriodicExecutionContext(OpenRTM_aist.ExecutionContextBase,
         self._rtcout.RTC_TRACE("svc()")
         count_ = 0
 
-        if self._cpu:
-            ret = OpenRTM_aist.setThreadAffinity(self._cpu)
-            if ret == False:
-                self._rtcout.RTC_ERROR("CPU affinity mask setting failed")
-                
+        ret = OpenRTM_aist.placeThread("ec", self.__class__.__name__,
+                                       self._cpu)
+        if ret == False:
+            self._rtcout.RTC_ERROR("CPU affinity mask setting failed")
+
         while self.threadRunning():
             OpenRTM_aist.ExecutionContextBase.invokeWorkerPreDo(self)
             # Thread will stopped when all RTCs are INACTIVE.
@@ -189,6 +189,7 @@ class PeriodicExecutionContext(OpenRTM_aist.ExecutionContextBase,
                 count_ = 0
             count_ += 1
 
+        OpenRTM_aist.ThreadPlacement.instance().unplace()
         self._rtcout.RTC_DEBUG("Thread terminated.")
         return 0
 
@@ -771,15 +772,9 @@ class PeriodicExecutionContext(OpenRTM_aist.ExecutionContextBase,
         if affinity_str:
             self._rtcout.RTC_DEBUG("CPU affinity property: %s", affinity_str)
 
-            tmp = affinity_str.split(",")
-            self._cpu = []
-            for num in tmp:
-                try:
-                    self._cpu.append(int(num))
-                    self._rtcout.RTC_DEBUG(
-                        "CPU affinity int value: %d added.", int(num))
-                except ValueError:
-                    pass
+            self._cpu = OpenRTM_aist.parseCPUList(affinity_str)
+            self._rtcout.RTC_DEBUG("CPU affinity int value: %s",
+                                   ",".join([str(n) for n in self._cpu]))
 
     ##
     # @if jp
@@ -79,6 +79,10 @@ class PeriodicTask(OpenRTM_aist.Task):
         self._periodStat = self.statistics_t()
         self._periodTime = OpenRTM_aist.TimeMeasure()
 
+        # thread placement
+        self._role = ""
+        self._roleName = ""
+
         return
 
     ##
@@ -324,6 +328,27 @@ class PeriodicTask(OpenRTM_aist.Task):
         self._periodCountMax = n
         return
 
+    ##
+    # @if jp
+    # @brief 計測結果を保持するサンプル数
+    #
+    # タスク関数実行時間、タスク周期時間の統計を計算するサンプル数
+    # (デフォルト100)。activate() の前に呼び出す。
+    #
+    # @else
+    # @brief Number of samples kept for the measurement
+    #
+    # Number of samples the statistics of the execution time and the
+    # period time are computed over (default 100). Call this before
+    # activate().
+    #
+    # @endif
+    #
+    def measurementBufferLength(self, n):
+        self._execTime = OpenRTM_aist.TimeMeasure(n)
+        self._periodTime = OpenRTM_aist.TimeMeasure(n)
+        return
+
     ##
     # @if jp
     # @brief タスク関数実行時間計測結果を取得
@@ -335,7 +360,10 @@ class PeriodicTask(OpenRTM_aist.Task):
 
     def getExecStat(self):
         guard = OpenRTM_aist.ScopedLock(self._execStat.mutex)
-        return self._execStat.stat
+        stat = self._execStat.stat
+        del guard
+        # percentiles are O(N), so they are computed here, not in svc()
+        return self._execTime.addPercentiles(stat)
 
     ##
     # @if jp
@@ -348,7 +376,43 @@ class PeriodicTask(OpenRTM_aist.Task):
 
     def getPeriodStat(self):
         guard = OpenRTM_aist.ScopedLock(self._periodStat.mutex)
-        return self._periodStat.stat
+        stat = self._periodStat.stat
+        del guard
+        return self._periodTime.addPercentiles(stat)
+
+    ##
+    # @if jp
+    # @brief スレッドの役割の設定
+    #
+    # 役割を設定すると、タスクのスレッドは開始時に ThreadPlacement に
+    # 登録され、役割のCPUの集合に配置される。activate() の前に呼び出す。
+    #
+    # @param role 役割(publisher 等)
+    # @param name スレッドの名前
+    #
+    # @else
+    # @brief Set the role of the thread
+    #
+    # With a role set, the task thread registers itself to
+    # ThreadPlacement when it starts and is placed on the CPU set of the
+    # role. Call this before activate().
+    #
+    # @param role role (publisher etc.)
+    # @param name thread name
+    #
+    # @endif
+    #
+    def setRole(self, role, name=""):
+        self._role = role
+        self._roleName = name
+
+    def svc_run(self):
+        if self._role:
+            OpenRTM_aist.placeThread(self._role, self._roleName)
+        OpenRTM_aist.Task.svc_run(self)
+        if self._role:
+            OpenRTM_aist.ThreadPlacement.instance().unplace()
+        return
 
     # virtual int svc();
     def svc(self):
@@ -405,7 +469,8 @@ class PeriodicTask(OpenRTM_aist.Task):
         if self._execCount > self._execCountMax:
             guard = OpenRTM_aist.ScopedLock(self._execStat.mutex)
 
-            self._execStat.stat = self._execTime.getStatistics()
+            self._execStat.stat = self._execTime.getStatistics(
+                percentiles=False)
             self._execCount = 0
 
         self._execCount += 1
@@ -416,7 +481,8 @@ class PeriodicTask(OpenRTM_aist.Task):
     def updatePeriodStat(self):
         if self._periodCount > self._periodCountMax:
             guard = OpenRTM_aist.ScopedLock(self._periodStat.mutex)
-            self._periodStat.stat = self._periodTime.getStatistics()
+            self._periodStat.stat = self._periodTime.getStatistics(
+                percentiles=False)
             self._periodCount = 0
 
         self._periodCount += 1
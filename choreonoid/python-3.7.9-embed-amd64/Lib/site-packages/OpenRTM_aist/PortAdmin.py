@@ -56,6 +56,9 @@ class PortAdmin:
             name_ = obj.getProfile().name
             return self._name == name_
 
+        def key(self):
+            return self._name
+
     ##
     # @if jp
     # @class find_port_name
@@ -120,8 +123,15 @@ class PortAdmin:
         # Portのオブジェクトリファレンスのリスト. PortServiceList
         self._portRefs = []
 
+        # Port名からオブジェクトリファレンスとサーバント(リファレンスで
+        # 登録されたPortの場合はNone)への辞書
+        self._portIndex = {}
+
+        # Portの登録、登録解除の度に増加するバージョン
+        self._version = 0
+
         # サーバントを直接格納するオブジェクトマネージャ
-        self._portServants = OpenRTM_aist.ObjectManager(self.comp_op)
+        self._portServants = OpenRTM_aist.IndexedObjectManager(self.comp_op)
 
         self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("PortAdmin")
 
@@ -172,11 +182,52 @@ class PortAdmin:
 
     def getPortProfileList(self):
         ret = []
-        for p in self._portRefs:
-            ret.append(p.get_port_profile())
+        for p, port in list(self._portIndex.values()):
+            if port is not None:
+                ret.append(port.get_port_profile())
+            else:
+                ret.append(p.get_port_profile())
 
         return ret
 
+    ##
+    # @if jp
+    #
+    # @brief Port のプロファイルのバージョンの取得
+    #
+    # Port の登録、登録解除と、各 Port の PortProfile の変更に応じて変化
+    # する値を返す。値が変わらない間は getPortProfileList() の結果も変わ
+    # らない。オブジェクト参照で登録された Port がある場合は変更を検出
+    # できないため None を返す。
+    #
+    # @param self
+    #
+    # @return バージョン(比較可能な値)、もしくはNone
+    #
+    # @else
+    #
+    # @brief Get the version of the port profiles
+    #
+    # Returns a value that changes when a Port is registered or
+    # unregistered or when the PortProfile of any Port changes. While it
+    # stays the same, getPortProfileList() returns the same result.
+    # Returns None when Ports registered by object reference exist,
+    # since their changes cannot be detected.
+    #
+    # @param self
+    #
+    # @return version (a comparable value) or None
+    #
+    # @endif
+    #
+    def getProfileVersion(self):
+        version = [self._version]
+        for _, port in list(self._portIndex.values()):
+            if port is None:
+                return None
+            version.append(port.getProfileVersion())
+        return tuple(version)
+
     ##
     # @if jp
     #
@@ -205,10 +256,9 @@ class PortAdmin:
     # @endif
 
     def getPortRef(self, port_name):
-        index = OpenRTM_aist.CORBA_SeqUtil.find(
-            self._portRefs, self.find_port_name(port_name))
-        if index >= 0:
-            return self._portRefs[index]
+        entry = self._portIndex.get(port_name)
+        if entry is not None:
+            return entry[0]
         return None
 
     ##
@@ -281,18 +331,21 @@ class PortAdmin:
     # void addPort(PortBase& port);
     def addPort(self, port):
         if isinstance(port, RTC._objref_PortService):
-            index = OpenRTM_aist.CORBA_SeqUtil.find(self._portRefs,
-                                                    self.find_port_name(port.get_port_profile().name))
-            if index >= 0:
+            name = port.get_port_profile().name
+            if name in self._portIndex:
                 return False
             self._portRefs.append(port)
+            self._portIndex[name] = (port, None)
+            self._version += 1
             return True
         else:
-            index = OpenRTM_aist.CORBA_SeqUtil.find(self._portRefs,
-                                                    self.find_port_name(port.getName()))
-            if index >= 0:
+            name = port.getName()
+            if name in self._portIndex:
                 return False
-            self._portRefs.append(port.getPortRef())
+            port_ref = port.getPortRef()
+            self._portRefs.append(port_ref)
+            self._portIndex[name] = (port_ref, port)
+            self._version += 1
             return self._portServants.registerObject(port)
 
     # new interface. since 1.0.0-RELEASE
@@ -336,12 +389,19 @@ class PortAdmin:
             if isinstance(port, RTC._objref_PortService):
                 OpenRTM_aist.CORBA_SeqUtil.erase_if(
                     self._portRefs, self.find_port(port))
+                for name, entry in list(self._portIndex.items()):
+                    if entry[1] is None and port._is_equivalent(entry[0]):
+                        del self._portIndex[name]
+                        self._version += 1
                 return True
 
             port.disconnect_all()
             tmp = port.getProfile().name
-            OpenRTM_aist.CORBA_SeqUtil.erase_if(
-                self._portRefs, self.find_port_name(tmp))
+            entry = self._portIndex.pop(tmp, None)
+            if entry is not None:
+                if entry[0] in self._portRefs:
+                    self._portRefs.remove(entry[0])
+                self._version += 1
 
             self._poa.deactivate_object(self._poa.servant_to_id(port))
             port.setPortRef(RTC.PortService._nil)
@@ -157,6 +157,8 @@ class PortBase(RTC__POA.PortService):
         self._profile.port_ref = self._objref
         self._profile.owner = RTC.RTObject._nil
         self._profile_mutex = threading.RLock()
+        self._profileVersion = 0
+        self._profileCache = None
         self._connection_mutex = threading.RLock()
         self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf(name)
         self._onPublishInterfaces = None
@@ -209,6 +211,7 @@ class PortBase(RTC__POA.PortService):
 
     def exit(self):
         self._rtcout.RTC_TRACE("PortBase.__del__()")
+        OpenRTM_aist.PortLivenessMonitor.instance().unregisterPort(self)
         # try:
         #  poa = OpenRTM_aist.Manager.instance().getPOA()
         #  oid = poa.servant_to_id(self)
@@ -266,15 +269,73 @@ class PortBase(RTC__POA.PortService):
 
         guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
 
+        if self._profileCache is not None and \
+                self._profileCache[0] == self._profileVersion:
+            return self._profileCache[1]
+
         prof = RTC.PortProfile(self._profile.name,
-                               self._profile.interfaces,
+                               list(self._profile.interfaces),
                                self._profile.port_ref,
-                               self._profile.connector_profiles,
+                               list(self._profile.connector_profiles),
                                self._profile.owner,
-                               self._profile.properties)
+                               list(self._profile.properties))
+        self._profileCache = (self._profileVersion, prof)
 
         return prof
 
+    ##
+    # @if jp
+    #
+    # @brief PortProfile の更新を通知する
+    #
+    # PortProfile のバージョンを更新し、get_port_profile() が返す
+    # PortProfile のキャッシュを無効にする。PortProfile の名前、
+    # インターフェース、ConnectorProfile、プロパティ等を変更した場合に
+    # 呼び出す。
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Notify that the PortProfile changed
+    #
+    # Bumps the PortProfile version, which invalidates the PortProfile
+    # cached by get_port_profile(). Call this after changing the name,
+    # interfaces, ConnectorProfiles, properties and so on.
+    #
+    # @param self
+    #
+    # @endif
+    def profileChanged(self):
+        guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
+        self._profileVersion += 1
+
+    ##
+    # @if jp
+    #
+    # @brief PortProfile のバージョンを取得する
+    #
+    # PortProfile が変更される度に増加する。
+    #
+    # @param self
+    #
+    # @return バージョン
+    #
+    # @else
+    #
+    # @brief Get the PortProfile version
+    #
+    # Increases every time the PortProfile changes.
+    #
+    # @param self
+    #
+    # @return version
+    #
+    # @endif
+    def getProfileVersion(self):
+        guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
+        return self._profileVersion
+
     ##
     # @if jp
     #
@@ -771,6 +832,8 @@ class PortBase(RTC__POA.PortService):
         else:
             self._profile.connector_profiles[index] = connector_profile
             self._rtcout.RTC_PARANOID("Existing connector_id. Updated.")
+        self.profileChanged()
+        OpenRTM_aist.PortLivenessMonitor.instance().registerPort(self)
 
         for ret in retval:
             if ret != RTC.RTC_OK:
@@ -1005,6 +1068,7 @@ class PortBase(RTC__POA.PortService):
 
         OpenRTM_aist.CORBA_SeqUtil.erase(
             self._profile.connector_profiles, index)
+        self.profileChanged()
 
         self.onDisconnected(self.getName(), prof, retval)
         return retval
@@ -1079,6 +1143,7 @@ class PortBase(RTC__POA.PortService):
         self._rtcout.RTC_TRACE("setName(%s)", name)
         guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
         self._profile.name = name
+        self.profileChanged()
         return
 
     ##
@@ -1146,6 +1211,7 @@ class PortBase(RTC__POA.PortService):
         self._rtcout.RTC_TRACE("setPortRef()")
         guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
         self._profile.port_ref = port_ref
+        self.profileChanged()
 
     ##
     # @if jp
@@ -1212,6 +1278,7 @@ class PortBase(RTC__POA.PortService):
 
         self._profile.owner = owner
         self._profile.name = portname
+        self.profileChanged()
 
     # ============================================================
     # callbacks
@@ -2053,6 +2120,7 @@ class PortBase(RTC__POA.PortService):
                                                  connector_profile)
         else:
             self._profile.connector_profiles[index] = connector_profile
+        self.profileChanged()
 
     ##
     # @if jp
@@ -2092,6 +2160,7 @@ class PortBase(RTC__POA.PortService):
 
         OpenRTM_aist.CORBA_SeqUtil.erase(
             self._profile.connector_profiles, index)
+        self.profileChanged()
 
         return True
 
@@ -2157,6 +2226,7 @@ class PortBase(RTC__POA.PortService):
         # setup PortInterfaceProfile
         prof = RTC.PortInterfaceProfile(instance_name, type_name, pol)
         OpenRTM_aist.CORBA_SeqUtil.push_back(self._profile.interfaces, prof)
+        self.profileChanged()
 
         return True
 
@@ -2198,6 +2268,7 @@ class PortBase(RTC__POA.PortService):
             return False
 
         OpenRTM_aist.CORBA_SeqUtil.erase(self._profile.interfaces, index)
+        self.profileChanged()
         return True
 
     ##
@@ -2226,6 +2297,7 @@ class PortBase(RTC__POA.PortService):
     def addProperty(self, key, value):
         OpenRTM_aist.CORBA_SeqUtil.push_back(self._profile.properties,
                                              OpenRTM_aist.NVUtil.newNV(key, value))
+        self.profileChanged()
 
     ##
     # @if jp
@@ -2251,20 +2323,34 @@ class PortBase(RTC__POA.PortService):
     def appendProperty(self, key, value):
         OpenRTM_aist.NVUtil.appendStringValue(
             self._profile.properties, key, value)
+        self.profileChanged()
 
     ##
     # @if jp
     #
     # @brief 存在しないポートをdisconnectする。
     #
+    # PortLivenessMonitor が有効な場合は接続先の確認を要求するのみで、
+    # リモート呼び出しは行わない。存在しないポートの接続は
+    # PortLivenessMonitor のスレッドで probeConnectors() により切断される。
+    #
     # @else
     #
     # @brief Disconnect ports that doesn't exist.
     #
+    # With PortLivenessMonitor enabled, this only requests a probe and
+    # makes no remote call. Connectors to dead ports are disconnected by
+    # probeConnectors() on the PortLivenessMonitor threads.
+    #
     # @endif
     # void updateConnectors()
 
     def updateConnectors(self):
+        monitor = OpenRTM_aist.PortLivenessMonitor.instance()
+        if monitor.isEnabled():
+            monitor.request(self)
+            return
+
         guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
 
         connector_ids = []
@@ -2281,6 +2367,45 @@ class PortBase(RTC__POA.PortService):
 
         return
 
+    ##
+    # @if jp
+    #
+    # @brief 接続先のポートを確認し、存在しないポートの接続を切断する。
+    #
+    # PortLivenessMonitor のスレッドから呼び出される。接続先の確認は
+    # PortProfile のロックを保持せずに行う。
+    #
+    # @return true:全ての接続先が存在する,false:切断した接続がある
+    #
+    # @else
+    #
+    # @brief Probe the peer ports and disconnect connectors to dead ones.
+    #
+    # Called from PortLivenessMonitor threads. The peers are checked
+    # without holding the PortProfile lock.
+    #
+    # @return true:all peers exist,false:some connectors were disconnected
+    #
+    # @endif
+    # bool probeConnectors()
+
+    def probeConnectors(self):
+        guard = OpenRTM_aist.ScopedLock(self._profile_mutex)
+        clist = [(cprof.connector_id, cprof.ports)
+                 for cprof in self._profile.connector_profiles]
+        del guard
+
+        connector_ids = []
+        for cid, ports in clist:
+            if not self.checkPorts(ports):
+                connector_ids.append(cid)
+                self._rtcout.RTC_WARN("Dead connection: %s", cid)
+
+        for cid in connector_ids:
+            self.disconnect(cid)
+
+        return not connector_ids
+
     ##
     # @if jp
     #
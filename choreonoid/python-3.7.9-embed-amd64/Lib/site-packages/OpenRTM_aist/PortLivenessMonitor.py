@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file PortLivenessMonitor.py
+# @brief Background liveness monitor of connected ports
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+
+import time
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import OpenRTM_aist
+
+
+portlivenessmonitor = None
+
+
+##
+# @if jp
+# @class PortLivenessMonitor
+# @brief 接続先ポートの生存監視
+#
+# 接続を持つポートを登録し、専用のスレッドから周期的に
+# PortBase.probeConnectors() を呼び出して接続先ポートの生存を確認する。
+# 確認は同時実行数を制限したスレッドプールで行い、接続先が全て生存して
+# いたポートは確認の間隔を最大間隔まで倍にしていく。接続の変更や
+# プロファイルの問い合わせがあると間隔を最小間隔に戻す。
+# これにより get_port_profile() 等の問い合わせはリモート呼び出しで
+# ブロックせず、切断されたポートの接続は非同期に削除される。
+#
+# manager.liveness_monitor 以下で設定する。
+# - enable: 有効にするかどうか(YES/NO)
+# - interval: 確認の最小間隔[s]
+# - max_interval: 確認の最大間隔[s]
+# - concurrency: 同時に確認するポートの数
+#
+# @else
+# @class PortLivenessMonitor
+# @brief Liveness monitor of connected ports
+#
+# Ports with connectors are registered, and a dedicated thread calls
+# PortBase.probeConnectors() periodically to check that the peer ports
+# are alive. Probes run on a thread pool with bounded concurrency. When
+# all peers of a port are alive, its interval doubles up to the maximum
+# interval. A connector change or a profile query resets the interval
+# to the minimum. Queries such as get_port_profile() therefore never
+# block on remote calls, and dead connectors are reaped asynchronously.
+#
+# Configured by manager.liveness_monitor:
+# - enable: enable or not (YES/NO)
+# - interval: minimum probe interval [s]
+# - max_interval: maximum probe interval [s]
+# - concurrency: number of ports probed at the same time
+#
+# @endif
+#
+class PortLivenessMonitor:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief ポートごとの監視状態
+    # @else
+    # @brief Monitoring state of a port
+    # @endif
+    class PortState:
+        __slots__ = ("interval", "next", "last", "busy")
+
+        def __init__(self, interval, now):
+            self.interval = interval
+            self.next = now
+            self.last = now
+            self.busy = False
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._mutex = threading.RLock()
+        self._cond = threading.Condition(self._mutex)
+        self._ports = weakref.WeakKeyDictionary()
+        self._enabled = False
+        self._interval = 1.0
+        self._maxInterval = 10.0
+        self._concurrency = 4
+        self._thread = None
+        self._executor = None
+        self._running = False
+        self._rtcout = None
+
+    ##
+    # @if jp
+    # @brief 初期化
+    #
+    # @param self
+    # @param prop manager.liveness_monitor のプロパティ
+    #
+    # @else
+    # @brief Initialize
+    #
+    # @param self
+    # @param prop manager.liveness_monitor properties
+    #
+    # @endif
+    #
+    def init(self, prop):
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("PortLivenessMonitor")
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._enabled = OpenRTM_aist.toBool(prop.getProperty("enable"),
+                                            "YES", "NO", True)
+        try:
+            self._interval = max(float(prop.getProperty("interval", "1.0")), 0.01)
+            self._maxInterval = max(float(prop.getProperty("max_interval", "10.0")),
+                                    self._interval)
+            self._concurrency = max(int(prop.getProperty("concurrency", "4")), 1)
+        except ValueError:
+            self._rtcout.RTC_WARN("invalid manager.liveness_monitor settings")
+
+    ##
+    # @if jp
+    # @brief 監視が有効かどうか
+    # @else
+    # @brief Whether monitoring is enabled
+    # @endif
+    #
+    def isEnabled(self):
+        return self._enabled
+
+    ##
+    # @if jp
+    # @brief ポートを登録する
+    #
+    # 登録済みの場合は確認の間隔を最小間隔に戻し、すぐに確認する。
+    # 監視スレッドは最初の登録時に開始する。
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @else
+    # @brief Register a port
+    #
+    # An already registered port gets its interval reset and is probed
+    # immediately. The monitor thread starts on the first registration.
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @endif
+    #
+    def registerPort(self, port):
+        if not self._enabled:
+            return
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        now = time.monotonic()
+        state = self._ports.get(port)
+        if state is None:
+            self._ports[port] = PortLivenessMonitor.PortState(self._interval, now)
+        else:
+            state.interval = self._interval
+            state.next = now
+        if self._thread is None and not self._running:
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self._concurrency)
+            self._thread = threading.Thread(target=self.run)
+            self._thread.daemon = True
+            self._thread.start()
+        self._cond.notify()
+
+    ##
+    # @if jp
+    # @brief ポートの登録を解除する
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @else
+    # @brief Unregister a port
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @endif
+    #
+    def unregisterPort(self, port):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._ports.pop(port, None)
+
+    ##
+    # @if jp
+    # @brief ポートの確認を要求する
+    #
+    # 確認の間隔を最小間隔に戻し、前回の確認から最小間隔が経過して
+    # いれば次の周期で確認する。呼び出し元はブロックしない。
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @else
+    # @brief Request a probe of a port
+    #
+    # Resets the interval to the minimum, so that the port is probed
+    # once the minimum interval has passed since the last probe. The
+    # caller never blocks.
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @endif
+    #
+    def request(self, port):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        state = self._ports.get(port)
+        if state is None:
+            return
+        next_ = state.last + self._interval
+        if state.next > next_:
+            state.interval = self._interval
+            state.next = next_
+            self._cond.notify()
+
+    ##
+    # @if jp
+    # @brief 監視スレッド
+    #
+    # 確認の時刻になったポートをスレッドプールに投入する。
+    #
+    # @else
+    # @brief Monitor thread
+    #
+    # Submits the ports whose probe time has come to the thread pool.
+    #
+    # @endif
+    #
+    def run(self):
+        OpenRTM_aist.placeThread("liveness", "PortLivenessMonitor")
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        while self._running:
+            now = time.monotonic()
+            wait = self._maxInterval
+            for port, state in list(self._ports.items()):
+                if state.busy:
+                    continue
+                if state.next <= now:
+                    state.busy = True
+                    state.next = float("inf")
+                    self._executor.submit(self.probe, port)
+                else:
+                    wait = min(wait, state.next - now)
+            self._cond.wait(wait)
+        del guard
+        OpenRTM_aist.ThreadPlacement.instance().unplace()
+
+    ##
+    # @if jp
+    # @brief ポートの接続先を確認する
+    #
+    # スレッドプールで実行する。
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @else
+    # @brief Probe the peers of a port
+    #
+    # Runs on the thread pool.
+    #
+    # @param self
+    # @param port PortBase
+    #
+    # @endif
+    #
+    def probe(self, port):
+        alive = False
+        try:
+            alive = port.probeConnectors()
+        except BaseException:
+            self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        state = self._ports.get(port)
+        if state is None:
+            return
+        now = time.monotonic()
+        state.busy = False
+        state.last = now
+        if alive:
+            state.interval = min(state.interval * 2.0, self._maxInterval)
+        else:
+            state.interval = self._interval
+        state.next = min(state.next, now + state.interval)
+        self._cond.notify()
+
+    ##
+    # @if jp
+    # @brief 監視を終了する
+    # @else
+    # @brief Stop monitoring
+    # @endif
+    #
+    def exit(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._enabled = False
+        self._running = False
+        self._ports.clear()
+        self._cond.notify()
+        thread = self._thread
+        executor = self._executor
+        self._thread = None
+        self._executor = None
+        del guard
+        if thread is not None:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    ##
+    # @if jp
+    # @brief インスタンスの取得
+    # @else
+    # @brief Get the instance
+    # @endif
+    #
+    def instance():
+        global portlivenessmonitor
+        if portlivenessmonitor is None:
+            portlivenessmonitor = PortLivenessMonitor()
+        return portlivenessmonitor
+
+    instance = staticmethod(instance)
@@ -17,7 +17,10 @@
 
 
 import OpenRTM_aist
+import os
+import re
 import sys
+import threading
 
 if sys.version_info[0] == 2:
     maxint = sys.maxsize
@@ -748,42 +751,8 @@ class Properties:
     # @endif
 
     def load(self, inStream):
-        pline = ""
-        for readStr in inStream:
-            if not readStr:
-                continue
-
-            _str = OpenRTM_aist.eraseHeadBlank(readStr)
-
-            if _str[0] == "#" or _str[0] == "!" or _str[0] == "\n" or (
-                    _str[0] == "\r" and _str[1] == "\n"):
-                continue
-
-            _str = _str.rstrip('\r\n')
-            _str = _str.rstrip('\n')
-
-            if not _str:
-                continue
-
-            if _str[len(
-                    _str) - 1] == "\\" and not OpenRTM_aist.isEscaped(_str, len(_str) - 1):
-                pline += OpenRTM_aist.eraseTailBlank(_str[0:len(_str) - 1])
-                continue
-            pline += _str
-            # if pline == "":
-            # continue
-
-            key = []
-            value = []
-            self.splitKeyValue(pline, key, value)
-            key[0] = OpenRTM_aist.unescape(key[0])
-            key[0] = key[0].strip()
-
-            value[0] = OpenRTM_aist.unescape(value[0])
-            value[0] = value[0].strip()
-
-            self.setProperty(key[0], value[0])
-            pline = ""
+        for key, value in parseProperties(inStream):
+            self.setProperty(key, value)
 
     ##
     # @if jp
@@ -1137,28 +1106,9 @@ class Properties:
     # @endif
 
     def splitKeyValue(self, _str, key, value):
-        i = 0
-        length = len(_str)
-
-        while i < length:
-            if (_str[i] == ":" or _str[i] ==
-                    "=") and not OpenRTM_aist.isEscaped(_str, i):
-                key.append(_str[0:i])
-                value.append(_str[i + 1:])
-                return
-            i += 1
-
-        # If no ':' or '=' exist, ' ' would be delimiter.
-        i = 0
-        while i < length:
-            if (_str[i] == " ") and not OpenRTM_aist.isEscaped(_str, i):
-                key.append(_str[0:i])
-                value.append(_str[i + 1:])
-                return
-            i += 1
-
-        key.append(_str)
-        value.append("")
+        k, v = _splitKeyValue(_str)
+        key.append(k)
+        value.append(v)
         return
 
     ##
@@ -1185,6 +1135,10 @@ class Properties:
         if _str == "":
             return False
 
+        if "\\" not in _str:
+            value.extend(_str.split(delim))
+            return True
+
         begin_it = end_it = 0
 
         length = len(_str)
@@ -1369,3 +1323,231 @@ class Properties:
     def __str__(self):
         string = [""]
         return self._dump(string, self, 0)
+
+
+_key_delim_re = re.compile(r"(?:[^\\:=]|\\.)*", re.S)
+_space_delim_re = re.compile(r"(?:[^\\ ]|\\.)*", re.S)
+
+
+def _findDelimiter(pattern, _str, delims):
+    end = pattern.match(_str).end()
+    if end < len(_str) and _str[end] in delims:
+        return end
+    return -1
+
+
+##
+# @if jp
+# @brief 文字列をキーと値のペアに分割する
+#
+# Properties.splitKeyValue() と同じ規則で分割する。エスケープ文字を
+# 含まない場合は str.find() で、含む場合は正規表現で区切り文字を探す。
+#
+# @param _str 分割対象文字列
+# @return (キー, 値)
+#
+# @else
+# @brief Split a string into a key and a value
+#
+# Same rules as Properties.splitKeyValue(). The delimiter is found with
+# str.find() when there is no escape character, and with a regular
+# expression otherwise.
+#
+# @param _str string to split
+# @return (key, value)
+#
+# @endif
+def _splitKeyValue(_str):
+    if "\\" not in _str:
+        pos = _str.find(":")
+        eq = _str.find("=")
+        if pos < 0 or 0 <= eq < pos:
+            pos = eq
+        if pos < 0:
+            pos = _str.find(" ")
+    else:
+        pos = _findDelimiter(_key_delim_re, _str, ":=")
+        if pos < 0:
+            pos = _findDelimiter(_space_delim_re, _str, " ")
+    if pos < 0:
+        return _str, ""
+    return _str[:pos], _str[pos + 1:]
+
+
+##
+# @if jp
+# @brief ストリームからキーと値のペアを読み込む
+#
+# Properties.load() の字句解析部分。コメント行、空行を読み飛ばし、
+# 行末の '\\' による継続行を連結して、エスケープを戻したキーと値の
+# ペアをファイル中の順に返す。
+#
+# @param inStream 入力ストリーム(行のイテラブル)
+# @return (キー, 値) のジェネレータ
+#
+# @else
+# @brief Read key and value pairs from a stream
+#
+# The tokenizer of Properties.load(). Comment and blank lines are
+# skipped, lines continued by a trailing '\\' are joined, and the
+# unescaped key and value pairs are yielded in file order.
+#
+# @param inStream input stream (iterable of lines)
+# @return generator of (key, value)
+#
+# @endif
+def parseProperties(inStream):
+    pline = ""
+    for readStr in inStream:
+        _str = readStr.lstrip("\t ")
+        if not _str or _str[0] == "#" or _str[0] == "!":
+            continue
+
+        _str = _str.rstrip("\r\n")
+        if not _str:
+            continue
+
+        if _str[-1] == "\\" and (len(_str) - len(_str.rstrip("\\"))) % 2:
+            pline += OpenRTM_aist.eraseTailBlank(_str[:-1])
+            continue
+        pline += _str
+
+        key, value = _splitKeyValue(pline)
+        yield OpenRTM_aist.unescape(key).strip(), OpenRTM_aist.unescape(value).strip()
+        pline = ""
+
+
+propertiesfilecache = None
+
+
+##
+# @if jp
+# @class PropertiesFileCache
+# @brief 解析済みプロパティファイルのキャッシュ
+#
+# rtc.conf やコンポーネントの設定ファイルを解析した結果(キーと値の
+# ペアの列)をファイルのパス毎に保持する。ファイルの更新時刻とサイズが
+# 変わっていなければ再解析しない。キャッシュした結果は変更せず、
+# load() で呼び出し側のプロパティにコピーして書き込む。
+#
+# @else
+# @class PropertiesFileCache
+# @brief Cache of parsed property files
+#
+# Keeps the parsed contents (the sequence of key and value pairs) of
+# rtc.conf and component configuration files by path. A file is parsed
+# again only when its modification time or size changes. Cached
+# results are never modified; load() copies them into the caller's
+# properties.
+#
+# @endif
+#
+class PropertiesFileCache:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._mutex = threading.RLock()
+        self._entries = {}
+
+    ##
+    # @if jp
+    # @brief ファイルの解析結果を取得する
+    #
+    # キャッシュにない場合、もしくはファイルが更新されている場合は
+    # ファイルを解析する。
+    #
+    # @param self
+    # @param filename ファイル名
+    # @return (キー, 値) のタプル
+    # @exception IOError ファイルが開けない場合
+    #
+    # @else
+    # @brief Get the parsed contents of a file
+    #
+    # The file is parsed when it is not cached or has been modified.
+    #
+    # @param self
+    # @param filename file name
+    # @return tuple of (key, value)
+    # @exception IOError the file cannot be opened
+    #
+    # @endif
+    #
+    def getPairs(self, filename):
+        path = os.path.abspath(filename)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        del guard
+        with open(path) as f:
+            pairs = tuple(parseProperties(f))
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._entries[path] = (stamp, pairs)
+        return pairs
+
+    ##
+    # @if jp
+    # @brief ファイルの内容をプロパティに読み込む
+    #
+    # Properties.load() と同じ結果になる。
+    #
+    # @param self
+    # @param prop 読み込み先のプロパティ
+    # @param filename ファイル名
+    # @return prop
+    # @exception IOError ファイルが開けない場合
+    #
+    # @else
+    # @brief Load the contents of a file into properties
+    #
+    # Same result as Properties.load().
+    #
+    # @param self
+    # @param prop properties to load into
+    # @param filename file name
+    # @return prop
+    # @exception IOError the file cannot be opened
+    #
+    # @endif
+    #
+    def load(self, prop, filename):
+        for key, value in self.getPairs(filename):
+            prop.setProperty(key, value)
+        return prop
+
+    ##
+    # @if jp
+    # @brief キャッシュを破棄する
+    # @else
+    # @brief Clear the cache
+    # @endif
+    #
+    def clear(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._entries = {}
+
+    ##
+    # @if jp
+    # @brief インスタンスの取得
+    # @else
+    # @brief Get the instance
+    # @endif
+    #
+    def instance():
+        global propertiesfilecache
+        if propertiesfilecache is None:
+            propertiesfilecache = PropertiesFileCache()
+        return propertiesfilecache
+
+    instance = staticmethod(instance)
@@ -199,6 +199,8 @@ class PublisherNew(OpenRTM_aist.PublisherBase):
 
         # setting task function
         self._task.setTask(self.svc)
+        if hasattr(self._task, "setRole"):
+            self._task.setRole("publisher", "PublisherNew")
         self._task.setPeriod(0.0)
         self._task.executionMeasure(OpenRTM_aist.toBool(mprop.getProperty("exec_time"),
                                                         "enable", "disable", True))
@@ -216,6 +218,12 @@ class PublisherNew(OpenRTM_aist.PublisherBase):
         if ret:
             self._task.periodicMeasureCount(pcount)
 
+        blength = 0
+        ret, blength = OpenRTM_aist.stringTo(
+            blength, mprop.getProperty("buffer_length"))
+        if ret and blength > 0 and hasattr(self._task, "measurementBufferLength"):
+            self._task.measurementBufferLength(blength)
+
         self._task.suspend()
         self._task.activate()
         self._task.suspend()
@@ -241,6 +249,7 @@ class PublisherNew(OpenRTM_aist.PublisherBase):
     # - measurement.exec_count: タスク関数実行時間計測周期 (数値, 回数)
     # - measurement.period_time: タスク周期時間計測 (enable/disable)
     # - measurement.period_count: タスク周期時間計測周期 (数値, 回数)
+    # - measurement.buffer_length: 統計を計算するサンプル数 (数値, 個数)
     #
     # @param property 本Publisherの駆動制御情報を設定したPropertyオブジェクト
     # @return ReturnCode PORT_OK 正常終了
@@ -266,6 +275,8 @@ class PublisherNew(OpenRTM_aist.PublisherBase):
     # - measurement.period_time: Task period time measurement (enable/disable)
     # - measurement.period_count: Task period time measurement count
     #                             (number, count)
+    # - measurement.buffer_length: Number of samples the statistics are
+    #                              computed over (number, count)
     #
     # @param property Property objects that includes the control information
     #                 of this Publisher
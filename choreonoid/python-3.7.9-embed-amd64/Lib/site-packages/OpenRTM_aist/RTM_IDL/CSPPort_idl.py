@@ -132,6 +132,55 @@ omniORB.registerSkeleton(OutPortCsp._NP_RepositoryId, OutPortCsp)
 del OutPortCsp
 __name__ = "CSP"
 
+# interface OutPortCspCredit
+_0_CSP._d_OutPortCspCredit = (omniORB.tcInternal.tv_objref, "IDL:openrtm.aist.go.jp/CSP/OutPortCspCredit:1.0", "OutPortCspCredit")
+omniORB.typeMapping["IDL:openrtm.aist.go.jp/CSP/OutPortCspCredit:1.0"] = _0_CSP._d_OutPortCspCredit
+_0_CSP.OutPortCspCredit = omniORB.newEmptyClass()
+class OutPortCspCredit (_0_CSP.OutPortCsp):
+    _NP_RepositoryId = _0_CSP._d_OutPortCspCredit[1]
+
+    def __init__(self, *args, **kw):
+        raise RuntimeError("Cannot construct objects of this type.")
+
+    _nil = CORBA.Object._nil
+
+
+_0_CSP.OutPortCspCredit = OutPortCspCredit
+_0_CSP._tc_OutPortCspCredit = omniORB.tcInternal.createTypeCode(_0_CSP._d_OutPortCspCredit)
+omniORB.registerType(OutPortCspCredit._NP_RepositoryId, _0_CSP._d_OutPortCspCredit, _0_CSP._tc_OutPortCspCredit)
+
+# OutPortCspCredit operations and attributes
+OutPortCspCredit._d_notify_credit = ((omniORB.tcInternal.tv_ulong, ), None, None)
+
+# OutPortCspCredit object reference
+class _objref_OutPortCspCredit (_0_CSP._objref_OutPortCsp):
+    _NP_RepositoryId = OutPortCspCredit._NP_RepositoryId
+
+    def __init__(self, obj):
+        _0_CSP._objref_OutPortCsp.__init__(self, obj)
+
+    def notify_credit(self, *args):
+        return self._obj.invoke("notify_credit", _0_CSP.OutPortCspCredit._d_notify_credit, args)
+
+omniORB.registerObjref(OutPortCspCredit._NP_RepositoryId, _objref_OutPortCspCredit)
+_0_CSP._objref_OutPortCspCredit = _objref_OutPortCspCredit
+del OutPortCspCredit, _objref_OutPortCspCredit
+
+# OutPortCspCredit skeleton
+__name__ = "CSP__POA"
+class OutPortCspCredit (_0_CSP__POA.OutPortCsp):
+    _NP_RepositoryId = _0_CSP.OutPortCspCredit._NP_RepositoryId
+
+
+    _omni_op_d = {"notify_credit": _0_CSP.OutPortCspCredit._d_notify_credit}
+    _omni_op_d.update(_0_CSP__POA.OutPortCsp._omni_op_d)
+
+OutPortCspCredit._omni_skeleton = OutPortCspCredit
+_0_CSP__POA.OutPortCspCredit = OutPortCspCredit
+omniORB.registerSkeleton(OutPortCspCredit._NP_RepositoryId, OutPortCspCredit)
+del OutPortCspCredit
+__name__ = "CSP"
+
 #
 # End of module "CSP"
 #
@@ -144,6 +144,55 @@ omniORB.registerSkeleton(OutPortCdr._NP_RepositoryId, OutPortCdr)
 del OutPortCdr
 __name__ = "OpenRTM"
 
+# interface OutPortCdrSeq
+_0_OpenRTM._d_OutPortCdrSeq = (omniORB.tcInternal.tv_objref, "IDL:OpenRTM/OutPortCdrSeq:1.0", "OutPortCdrSeq")
+omniORB.typeMapping["IDL:OpenRTM/OutPortCdrSeq:1.0"] = _0_OpenRTM._d_OutPortCdrSeq
+_0_OpenRTM.OutPortCdrSeq = omniORB.newEmptyClass()
+class OutPortCdrSeq (_0_OpenRTM.OutPortCdr):
+    _NP_RepositoryId = _0_OpenRTM._d_OutPortCdrSeq[1]
+
+    def __init__(self, *args, **kw):
+        raise RuntimeError("Cannot construct objects of this type.")
+
+    _nil = CORBA.Object._nil
+
+
+_0_OpenRTM.OutPortCdrSeq = OutPortCdrSeq
+_0_OpenRTM._tc_OutPortCdrSeq = omniORB.tcInternal.createTypeCode(_0_OpenRTM._d_OutPortCdrSeq)
+omniORB.registerType(OutPortCdrSeq._NP_RepositoryId, _0_OpenRTM._d_OutPortCdrSeq, _0_OpenRTM._tc_OutPortCdrSeq)
+
+# OutPortCdrSeq operations and attributes
+OutPortCdrSeq._d_get_if_modified = ((omniORB.tcInternal.tv_ulonglong, omniORB.tcInternal.tv_ulong), (omniORB.typeMapping["IDL:OpenRTM/PortStatus:1.0"], omniORB.tcInternal.tv_ulonglong, omniORB.typeMapping["IDL:OpenRTM/CdrData:1.0"]), None)
+
+# OutPortCdrSeq object reference
+class _objref_OutPortCdrSeq (_0_OpenRTM._objref_OutPortCdr):
+    _NP_RepositoryId = OutPortCdrSeq._NP_RepositoryId
+
+    def __init__(self, obj):
+        _0_OpenRTM._objref_OutPortCdr.__init__(self, obj)
+
+    def get_if_modified(self, *args):
+        return self._obj.invoke("get_if_modified", _0_OpenRTM.OutPortCdrSeq._d_get_if_modified, args)
+
+omniORB.registerObjref(OutPortCdrSeq._NP_RepositoryId, _objref_OutPortCdrSeq)
+_0_OpenRTM._objref_OutPortCdrSeq = _objref_OutPortCdrSeq
+del OutPortCdrSeq, _objref_OutPortCdrSeq
+
+# OutPortCdrSeq skeleton
+__name__ = "OpenRTM__POA"
+class OutPortCdrSeq (_0_OpenRTM__POA.OutPortCdr):
+    _NP_RepositoryId = _0_OpenRTM.OutPortCdrSeq._NP_RepositoryId
+
+
+    _omni_op_d = {"get_if_modified": _0_OpenRTM.OutPortCdrSeq._d_get_if_modified}
+    _omni_op_d.update(_0_OpenRTM__POA.OutPortCdr._omni_op_d)
+
+OutPortCdrSeq._omni_skeleton = OutPortCdrSeq
+_0_OpenRTM__POA.OutPortCdrSeq = OutPortCdrSeq
+omniORB.registerSkeleton(OutPortCdrSeq._NP_RepositoryId, OutPortCdrSeq)
+del OutPortCdrSeq
+__name__ = "OpenRTM"
+
 #
 # End of module "OpenRTM"
 #
@@ -108,6 +108,7 @@ class RTObject_impl:
             self._properties.getNode("conf"))
         self._profile = RTC.ComponentProfile(
             "", "", "", "", "", "", [], None, [])
+        self._profileCache = None
 
         self.setInstanceName(str(OpenRTM_aist.uuid1()))
 
@@ -908,6 +909,8 @@ class RTObject_impl:
     # @brief [RTObject CORBA interface] コンポーネントプロファイルを取得する
     #
     # 当該コンポーネントのプロファイル情報を返す。
+    # 生成したプロファイルは、Port の登録、登録解除や PortProfile の変更、
+    # 名前等の変更があるまで再利用する。
     #
     # @param self
     #
@@ -917,7 +920,9 @@ class RTObject_impl:
     #
     # @brief [RTObject CORBA interface] Get RTC's profile
     #
-    # This operation returns the ComponentProfile of the RTC
+    # This operation returns the ComponentProfile of the RTC.
+    # The profile is reused until a Port is registered or unregistered,
+    # a PortProfile changes, or the names change.
     #
     # @return ComponentProfile
     #
@@ -926,16 +931,28 @@ class RTObject_impl:
 
     def get_component_profile(self):
         self._rtcout.RTC_TRACE("get_component_profile()")
-        prop_ = RTC.ComponentProfile(self._properties.getProperty("instance_name"),
-                                     self._properties.getProperty("type_name"),
-                                     self._properties.getProperty(
-                                         "description"),
-                                     self._properties.getProperty("version"),
-                                     self._properties.getProperty("vendor"),
-                                     self._properties.getProperty("category"),
-                                     self._portAdmin.getPortProfileList(),
-                                     self._profile.parent,
-                                     self._profile.properties)
+        version_ = (self._portAdmin.getProfileVersion(),
+                    self._properties.getProperty("instance_name"),
+                    self._properties.getProperty("type_name"),
+                    self._properties.getProperty("description"),
+                    self._properties.getProperty("version"),
+                    self._properties.getProperty("vendor"),
+                    self._properties.getProperty("category"),
+                    id(self._profile.parent))
+        if version_[0] is not None and self._profileCache is not None and \
+                self._profileCache[0] == version_:
+            prop_ = self._profileCache[1]
+        else:
+            prop_ = RTC.ComponentProfile(version_[1],
+                                         version_[2],
+                                         version_[3],
+                                         version_[4],
+                                         version_[5],
+                                         version_[6],
+                                         self._portAdmin.getPortProfileList(),
+                                         self._profile.parent,
+                                         self._profile.properties)
+            self._profileCache = (version_, prop_)
         OpenRTM_aist.NVUtil.copyFromProperties(
             self._profile.properties, self._properties)
         return prop_
@@ -4783,6 +4800,64 @@ class RTObject_impl:
         self._fsmActionListeners.removeStructureListener(listener_type, listener)
         return
 
+    ##
+    # @if jp
+    # @brief FsmTransitionListener リスナを追加する
+    #
+    # FSMの状態遷移が完了する毎に、遷移元の状態名、遷移先の状態名、
+    # イベント名を引数としてコールバックされるリスナを設定する。
+    # 状態遷移中の各アクションでコールバックされる
+    # PreFsmActionListener、PostFsmActionListener と異なり、1回の
+    # 状態遷移について1回だけ呼び出される。
+    #
+    # @param memfunc 関数オブジェクト
+    # @return リスナオブジェクト
+    #
+    # @else
+    # @brief Adding FsmTransitionListener type listener
+    #
+    # This operation adds a listener called with the source state
+    # name, the target state name and the event name every time an FSM
+    # state transition completes. Unlike PreFsmActionListener and
+    # PostFsmActionListener, which are called on each action during
+    # the transition, it is called once per state transition.
+    #
+    # @param memfunc function object
+    # @return listener object
+    #
+    # @endif
+    #
+    def addFsmTransitionListener(self, memfunc):
+        class Noname(OpenRTM_aist.FsmTransitionListener):
+            def __init__(self, memfunc):
+                self._memfunc = memfunc
+                return
+
+            def __call__(self, from_, to, event):
+                self._memfunc(from_, to, event)
+                return
+
+        listener = Noname(memfunc)
+        self._fsmActionListeners.addTransitionListener(listener)
+        return listener
+
+    ##
+    # @if jp
+    # @brief FsmTransitionListener リスナを削除する
+    #
+    # @param listener リスナオブジェクト
+    #
+    # @else
+    # @brief Removing FsmTransitionListener type listener
+    #
+    # @param listener A listener object
+    #
+    # @endif
+    #
+    def removeFsmTransitionListener(self, listener):
+        self._fsmActionListeners.removeTransitionListener(listener)
+        return
+
     ##
     # @if jp
     #
@@ -5036,6 +5111,15 @@ class RTObject_impl:
             OpenRTM_aist.PostFsmActionListenerType.POST_ON_STATE_CHANGE, state, ret)
         return
 
+    def onFsmTransition(self, from_, to, event):
+        self._fsmActionListeners.notifyTransition(from_, to, event)
+        return
+
+    def onSetFsmStructure(self, fsm_structure):
+        self._fsmActionListeners.notifyStructure(
+            OpenRTM_aist.FsmStructureListenerType.SET_FSM_STRUCTURE, fsm_structure)
+        return
+
     # ReturnCode_t getInheritedECOptions(coil::Properties& default_opts);
 
     def getInheritedECOptions(self, default_opts):
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file SamplingProfiler.py
+# @brief Sampling profiler of RTC callbacks
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+
+import os
+import sys
+import threading
+
+import OpenRTM_aist
+
+
+samplingprofiler = None
+
+
+##
+# @if jp
+# @class SamplingProfiler
+# @brief RTCのコールバックのサンプリングプロファイラ
+#
+# 専用のスレッドから一定の間隔で全スレッドのスタックを取得し、RTCの
+# コールバック(on_execute、onExecute、onStateUpdate、preOnExecute 等の
+# リスナの呼び出し)を実行中のスタックのみを、コンポーネント名と
+# コールバック名ごとに集計する。集計結果は flamegraph.pl 等でそのまま
+# 使用できる folded 形式("コンポーネント;コールバック;関数;... 回数")で
+# ファイルに出力する。
+#
+# コールバックは、名前が on、preOn、postOn で始まり、self が
+# RTObject_impl であるメソッドのうち最も内側のものとする。
+#
+# manager.profiler 以下で設定する。
+# - enable: 有効にするかどうか(YES/NO、デフォルトNO)
+# - interval: サンプリングの間隔[s]
+# - components: 対象のRTCのインスタンス名(カンマ区切り、空の場合は全て)
+# - max_depth: コールバックより内側で記録する関数の数
+# - max_stacks: 集計するスタックの種類の上限
+# - output_file: 出力ファイル名(%p 等はマネージャの書式で置換する)
+#
+# ファイルへの出力は、マネージャの終了時と、ManagerServant の
+# set_configuration() で manager.profiler.dump にファイル名(空の場合は
+# output_file)を設定した時に行う。
+#
+# @else
+# @class SamplingProfiler
+# @brief Sampling profiler of RTC callbacks
+#
+# A dedicated thread takes the stacks of all threads at a fixed
+# interval and aggregates only the stacks running an RTC callback
+# (on_execute, onExecute, onStateUpdate, listener calls such as
+# preOnExecute, ...) by component name and callback name. The result is
+# written in the folded format ("component;callback;function;... count")
+# that flamegraph.pl and similar tools take as is.
+#
+# The callback is the innermost method whose name starts with "on",
+# "preOn" or "postOn" and whose self is an RTObject_impl.
+#
+# Configured by manager.profiler:
+# - enable: enable or not (YES/NO, default NO)
+# - interval: sampling interval [s]
+# - components: instance names of the target RTCs (comma separated,
+#   all if empty)
+# - max_depth: number of functions recorded inside the callback
+# - max_stacks: maximum number of distinct stacks
+# - output_file: output file name (%p and the like are replaced in the
+#   manager's format)
+#
+# The file is written when the manager shuts down, and when
+# manager.profiler.dump is set through set_configuration() of the
+# ManagerServant, to a file name (output_file if empty).
+#
+# @endif
+#
+class SamplingProfiler:
+    """
+    """
+
+    CALLBACK_PREFIXES = ("on", "preOn", "postOn")
+    TRUNCATED = "[truncated]"
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._mutex = threading.RLock()
+        self._cond = threading.Condition(self._mutex)
+        self._stacks = {}
+        self._samples = 0
+        self._enabled = False
+        self._interval = 0.01
+        self._components = set()
+        self._maxDepth = 64
+        self._maxStacks = 10000
+        self._codes = {}
+        self._thread = None
+        self._running = False
+        self._rtcout = None
+
+    ##
+    # @if jp
+    # @brief 初期化
+    #
+    # @param self
+    # @param prop manager.profiler のプロパティ
+    #
+    # @else
+    # @brief Initialize
+    #
+    # @param self
+    # @param prop manager.profiler properties
+    #
+    # @endif
+    #
+    def init(self, prop):
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("SamplingProfiler")
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._enabled = OpenRTM_aist.toBool(prop.getProperty("enable"),
+                                            "YES", "NO", False)
+        self._components = set([c.strip() for c in
+                                prop.getProperty("components").split(",")
+                                if c.strip()])
+        try:
+            self._interval = max(float(prop.getProperty("interval", "0.01")), 0.001)
+            self._maxDepth = max(int(prop.getProperty("max_depth", "64")), 0)
+            self._maxStacks = max(int(prop.getProperty("max_stacks", "10000")), 1)
+        except ValueError:
+            self._rtcout.RTC_WARN("invalid manager.profiler settings")
+
+    ##
+    # @if jp
+    # @brief プロファイラが有効かどうか
+    # @else
+    # @brief Whether the profiler is enabled
+    # @endif
+    #
+    def isEnabled(self):
+        return self._enabled
+
+    ##
+    # @if jp
+    # @brief サンプリングを開始する
+    # @else
+    # @brief Start sampling
+    # @endif
+    #
+    def start(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if not self._enabled or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    ##
+    # @if jp
+    # @brief サンプリングスレッド
+    # @else
+    # @brief Sampling thread
+    # @endif
+    #
+    def run(self):
+        OpenRTM_aist.placeThread("profiler", "SamplingProfiler")
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        while self._running:
+            self._cond.wait(self._interval)
+            if not self._running:
+                break
+            try:
+                self.sample()
+            except BaseException:
+                self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+        del guard
+        OpenRTM_aist.ThreadPlacement.instance().unplace()
+
+    ##
+    # @if jp
+    # @brief 全スレッドのスタックを1回サンプリングする
+    # @else
+    # @brief Sample the stacks of all threads once
+    # @endif
+    #
+    def sample(self):
+        frames = sys._current_frames()
+        # own frame would make a reference cycle keeping the guard alive
+        del frames[threading.get_ident()]
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._samples += 1
+        for frame in frames.values():
+            key = self.fold(frame)
+            if key is None:
+                continue
+            if key in self._stacks:
+                self._stacks[key] += 1
+            elif len(self._stacks) < self._maxStacks:
+                self._stacks[key] = 1
+            else:
+                key = ";".join(key.split(";", 2)[:2] + [SamplingProfiler.TRUNCATED])
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+
+    ##
+    # @if jp
+    # @brief コールバックの候補となる関数かどうか
+    #
+    # 名前が on、preOn、postOn で始まり、第1引数が self の関数。
+    # コードオブジェクトごとに結果を保持する。
+    #
+    # @else
+    # @brief Whether a function may be a callback
+    #
+    # A function whose name starts with "on", "preOn" or "postOn" and
+    # whose first argument is self. The result is kept per code object.
+    #
+    # @endif
+    #
+    def isCandidate(self, code):
+        ret = self._codes.get(code)
+        if ret is None:
+            ret = code.co_name.startswith(SamplingProfiler.CALLBACK_PREFIXES) and \
+                code.co_argcount > 0 and code.co_varnames[0] == "self"
+            self._codes[code] = ret
+        return ret
+
+    ##
+    # @if jp
+    # @brief スタックを folded 形式の文字列にする
+    #
+    # @param frame 最も内側のフレーム
+    # @return "コンポーネント;コールバック;関数;..."(RTCのコールバックを
+    # 実行していない場合、対象外のRTCの場合はNone)
+    #
+    # @else
+    # @brief Convert a stack into a folded string
+    #
+    # @param frame innermost frame
+    # @return "component;callback;function;..." (None when no RTC
+    # callback is running or the RTC is not a target)
+    #
+    # @endif
+    #
+    def fold(self, frame):
+        inner = []
+        while frame is not None:
+            code = frame.f_code
+            if self.isCandidate(code):
+                obj = frame.f_locals.get("self")
+                if isinstance(obj, OpenRTM_aist.RTObject_impl):
+                    name = obj.getInstanceName()
+                    if self._components and name not in self._components:
+                        return None
+                    inner.reverse()
+                    del inner[self._maxDepth:]
+                    return ";".join([name, code.co_name] + inner)
+            inner.append("%s (%s:%d)" % (code.co_name,
+                                         os.path.basename(code.co_filename),
+                                         code.co_firstlineno))
+            frame = frame.f_back
+        return None
+
+    ##
+    # @if jp
+    # @brief 集計結果の取得
+    #
+    # @return (folded 形式のスタック, 回数) のリスト
+    #
+    # @else
+    # @brief Get the aggregated stacks
+    #
+    # @return list of (folded stack, count)
+    #
+    # @endif
+    #
+    def getStacks(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        return sorted(self._stacks.items())
+
+    ##
+    # @if jp
+    # @brief 集計結果の消去
+    # @else
+    # @brief Clear the aggregated stacks
+    # @endif
+    #
+    def clear(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._stacks = {}
+        self._samples = 0
+
+    ##
+    # @if jp
+    # @brief 集計結果を folded 形式でファイルに出力する
+    #
+    # @param filename ファイル名
+    # @return 成功した場合にTrue
+    #
+    # @else
+    # @brief Write the aggregated stacks to a file in the folded format
+    #
+    # @param filename file name
+    # @return True if succeeded
+    #
+    # @endif
+    #
+    def dump(self, filename):
+        stacks = self.getStacks()
+        try:
+            with open(filename, "w") as f:
+                for key, count in stacks:
+                    f.write("%s %d\n" % (key, count))
+        except (IOError, OSError):
+            self._rtcout.RTC_ERROR("failed to write %s", filename)
+            return False
+        self._rtcout.RTC_INFO("%d stacks (%d samples) written to %s",
+                              (len(stacks), self._samples, filename))
+        return True
+
+    ##
+    # @if jp
+    # @brief サンプリングを終了する
+    # @else
+    # @brief Stop sampling
+    # @endif
+    #
+    def exit(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._running = False
+        self._cond.notify()
+        thread = self._thread
+        self._thread = None
+        del guard
+        if thread is not None:
+            thread.join()
+
+    ##
+    # @if jp
+    # @brief インスタンスの取得
+    # @else
+    # @brief Get the instance
+    # @endif
+    #
+    def instance():
+        global samplingprofiler
+        if samplingprofiler is None:
+            samplingprofiler = SamplingProfiler()
+        return samplingprofiler
+
+    instance = staticmethod(instance)
@@ -13,6 +13,9 @@
 #         Advanced Industrial Science and Technology (AIST), Japan
 #     All rights reserved.
 
+import threading
+import collections
+
 import OpenRTM_aist
 import OpenRTM_aist.Macho
 import RTC
@@ -153,6 +156,11 @@ def FSM_SUBSTATE(SUPERSTATE):
 # run_event関数を呼び出すことでバッファ内のイベントを実行する必要がある
 # バッファは全てのEventPortで共有される
 #
+# precompute に True を指定するか、RTCのプロパティ fsm.engine に
+# precomputed を指定した場合は、状態遷移の経路を生成時に計算しておき
+# (Macho.Machine.precomputeTransitions())、イベントのバッファには
+# ロックを使用しない EventQueue を使用する。
+#
 # @since 2.0.0
 #
 # @else
@@ -161,6 +169,11 @@ def FSM_SUBSTATE(SUPERSTATE):
 #
 # @brief
 #
+# When precompute is True, or the RTC property fsm.engine is
+# "precomputed", the transition paths are computed at construction
+# (Macho.Machine.precomputeTransitions()) and the lock free EventQueue
+# is used as the event buffer.
+#
 # @since 2.0.0
 #
 #
@@ -175,6 +188,8 @@ class Machine(OpenRTM_aist.Macho.Machine):
     # @param self
     # @param TOP 最上位状態
     # @param comp RTC
+    # @param precompute 状態遷移の経路を事前に計算する場合にTrue
+    # (Noneの場合はRTCのプロパティ fsm.engine で決める)
     #
     # @else
     #
@@ -183,14 +198,23 @@ class Machine(OpenRTM_aist.Macho.Machine):
     # @param self
     # @param TOP
     # @param comp
+    # @param precompute True to precompute the transition paths
+    # (None to follow the RTC property fsm.engine)
     #
     # @endif
     #
-    def __init__(self, TOP, comp):
+    def __init__(self, TOP, comp, precompute=None):
         #super(Machine,self).__init__(TOP, OpenRTM_aist.Macho.TopBase(TOP))
         self._rtComponent = comp
-        super(Machine, self).__init__(TOP)
-        self._buffer = OpenRTM_aist.CdrBufferFactory.instance().createObject("ring_buffer")
+        if precompute is None:
+            precompute = comp is not None and \
+                comp.getProperties().getProperty("fsm.engine") == "precomputed"
+        super(Machine, self).__init__(TOP, precompute=precompute)
+        if precompute:
+            self._buffer = EventQueue()
+        else:
+            self._buffer = OpenRTM_aist.CdrBufferFactory.instance().createObject("ring_buffer")
+        self._scheduler = None
     ##
     # @if jp
     #
@@ -255,28 +279,363 @@ class Machine(OpenRTM_aist.Macho.Machine):
 
     def getComp(self):
         return self._rtComponent
+
+    ##
+    # @if jp
+    #
+    # @brief イベントのディスパッチ
+    # RTCを設定している場合は、状態が変化した時にRTCの onFsmTransition()
+    # に遷移元、遷移先の状態名とイベント名を通知する
+    #
+    # @param self
+    # @param event イベント
+    # @param destroy
+    #
+    # @else
+    #
+    # @brief Dispatch an event
+    # When the RTC is set and the state has changed, the source and target
+    # state names and the event name are passed to onFsmTransition() of
+    # the RTC
+    #
+    # @param self
+    # @param event event
+    # @param destroy
+    #
+    # @endif
+    #
+    def dispatch(self, event, destroy=True):
+        comp = self._rtComponent
+        if comp is None:
+            super(Machine, self).dispatch(event, destroy)
+            return
+        # the states are read under the lock of the transition itself
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        previous = self.myCurrentState
+        super(Machine, self).dispatch(event, destroy)
+        current = self.myCurrentState
+        del guard
+        if current is not previous:
+            handler = getattr(event, "myHandler", None)
+            comp.onFsmTransition(previous.name(), current.name(),
+                                 handler.__name__ if handler else "")
+
+    ##
+    # @if jp
+    #
+    # @brief 優先度付きイベントのスケジューラの取得
+    # 最初の呼び出し時に生成する
+    #
+    # @param self
+    # @return EventScheduler
+    #
+    # @else
+    #
+    # @brief Get the scheduler of prioritized events
+    # Created on the first call
+    #
+    # @param self
+    # @return EventScheduler
+    #
+    # @endif
+    #
+    def getEventScheduler(self):
+        if self._scheduler is None:
+            self._scheduler = EventScheduler()
+        return self._scheduler
     ##
     # @if jp
     #
     # @brief イベント実行
     # バッファが空になるまでイベントを実行する
     #
+    # EventScheduler に登録されたイベントがある場合は、1つ実行する毎に
+    # 優先度を確認し、優先度が正のイベント、バッファのイベント(優先度0)、
+    # 優先度が0以下のイベントの順に実行する。実行中に到着した優先度の
+    # 高いイベントは残りのイベントより先に実行する。
+    #
     # @param self
     #
     # @else
     #
     # @brief
     #
+    # When events are registered to the EventScheduler, the priority is
+    # checked after every event: events with a positive priority run
+    # first, then the buffered events (priority 0), then the events with
+    # priority 0 or below. A high priority event arriving meanwhile runs
+    # before the remaining events.
+    #
     # @param self
     #
     # @endif
     #
 
     def run_event(self):
-        while self._buffer.readable() > 0:
-            _, event = self._buffer.get()
+        scheduler = self._scheduler
+        if scheduler is None:
+            if isinstance(self._buffer, EventQueue):
+                self._buffer.run()
+                return
+            while self._buffer.readable() > 0:
+                _, event = self._buffer.get()
+                event()
+                self._buffer.advanceRptr()
+            return
+
+        while True:
+            source = scheduler.pop(0)
+            if source is not None:
+                source.deliver()
+            elif self._buffer.readable() > 0:
+                if isinstance(self._buffer, EventQueue):
+                    self._buffer.runOne()
+                else:
+                    _, event = self._buffer.get()
+                    event()
+                    self._buffer.advanceRptr()
+            else:
+                source = scheduler.pop()
+                if source is None:
+                    return
+                source.deliver()
+
+
+##
+# @if jp
+#
+# @class EventQueue
+#
+# @brief イベントのキュー
+#
+# collections.deque によるイベントのキュー。RingBuffer と同じ
+# write()、init() を持つが、ロックを使用せず、取り出し時に読み出し
+# ポインタを進める必要がない。append()、popleft() はスレッド間で
+# 安全に呼び出せる。
+#
+# バッファの設定(コネクタの buffer 以下)のうち以下を使用する。
+# - length: キューの長さ(デフォルト8)
+# - write.full_policy: overwrite(古いイベントを捨てる、デフォルト)、
+#   do_nothing(新しいイベントを捨てる)。block は do_nothing として扱う。
+#
+# @since 2.0.0
+#
+# @else
+#
+# @class EventQueue
+#
+# @brief Event queue
+#
+# Event queue based on collections.deque. It has the same write() and
+# init() as RingBuffer, but takes no lock and needs no read pointer
+# advance. append() and popleft() are safe to call across threads.
+#
+# The following buffer settings (under the connector's buffer) are used.
+# - length: queue length (default 8)
+# - write.full_policy: overwrite (drop the oldest event, default) or
+#   do_nothing (drop the new event). block is treated as do_nothing.
+#
+# @since 2.0.0
+#
+# @endif
+#
+class EventQueue:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @param self
+    # @param length キューの長さ
+    # @else
+    # @brief Constructor
+    # @param self
+    # @param length queue length
+    # @endif
+    #
+    def __init__(self, length=OpenRTM_aist.RingBuffer.RINGBUFFER_DEFAULT_LENGTH):
+        self._queue = collections.deque(maxlen=length)
+        self._overwrite = True
+
+    ##
+    # @if jp
+    # @brief 設定初期化
+    # @param self
+    # @param prop バッファの設定
+    # @else
+    # @brief Initialize
+    # @param self
+    # @param prop buffer properties
+    # @endif
+    #
+    def init(self, prop):
+        if prop is None:
+            return
+        length = self._queue.maxlen
+        if prop.getProperty("length"):
+            ret, n = OpenRTM_aist.stringTo(0, prop.getProperty("length"))
+            if ret and n > 0:
+                length = n
+        policy = OpenRTM_aist.normalize(prop.getProperty("write.full_policy"))
+        if policy:
+            self._overwrite = policy == "overwrite"
+        if length != self._queue.maxlen:
+            self._queue = collections.deque(self._queue, maxlen=length)
+
+    ##
+    # @if jp
+    # @brief イベントを追加する
+    # @param self
+    # @param event イベント
+    # @return BUFFER_OK、もしくはキューが一杯で捨てた場合 BUFFER_FULL
+    # @else
+    # @brief Append an event
+    # @param self
+    # @param event event
+    # @return BUFFER_OK, or BUFFER_FULL if dropped because the queue is full
+    # @endif
+    #
+    def write(self, event, sec=-1, nsec=0):
+        queue = self._queue
+        if not self._overwrite and len(queue) >= queue.maxlen:
+            return OpenRTM_aist.BufferStatus.BUFFER_FULL
+        queue.append(event)
+        return OpenRTM_aist.BufferStatus.BUFFER_OK
+
+    ##
+    # @if jp
+    # @brief 読み出し可能なイベントの数
+    # @else
+    # @brief Number of readable events
+    # @endif
+    #
+    def readable(self):
+        return len(self._queue)
+
+    ##
+    # @if jp
+    # @brief キューが空になるまでイベントを実行する
+    # @else
+    # @brief Run the events until the queue is empty
+    # @endif
+    #
+    def run(self):
+        popleft = self._queue.popleft
+        while True:
+            try:
+                event = popleft()
+            except IndexError:
+                return
             event()
-            self._buffer.advanceRptr()
+
+    ##
+    # @if jp
+    # @brief イベントを1つ実行する
+    # @return 実行した場合にTrue
+    # @else
+    # @brief Run one event
+    # @return True if an event was run
+    # @endif
+    #
+    def runOne(self):
+        try:
+            event = self._queue.popleft()
+        except IndexError:
+            return False
+        event()
+        return True
+
+
+##
+# @if jp
+#
+# @class EventScheduler
+#
+# @brief 優先度付きイベントのスケジューラ
+#
+# 実行待ちのイベントを持つイベント源(EventPort.EventSlot)を優先度毎の
+# キューで保持する。Machine.run_event() は優先度の高いイベント源から
+# 1つずつイベントを取り出して実行する。同じ優先度のイベント源は
+# 順番に実行する。
+#
+# @since 2.0.0
+#
+# @else
+#
+# @class EventScheduler
+#
+# @brief Scheduler of prioritized events
+#
+# Keeps the event sources (EventPort.EventSlot) with pending events in
+# one queue per priority. Machine.run_event() takes one event at a time
+# from the highest priority source. Sources of the same priority take
+# turns.
+#
+# @since 2.0.0
+#
+# @endif
+#
+class EventScheduler:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._levels = {}
+        self._priorities = []
+
+    ##
+    # @if jp
+    # @brief 実行待ちのイベントを持つイベント源を登録する
+    # @param self
+    # @param source deliver() を持つイベント源
+    # @param priority 優先度(大きいほど先に実行する)
+    # @else
+    # @brief Register a source with pending events
+    # @param self
+    # @param source event source with deliver()
+    # @param priority priority (higher runs first)
+    # @endif
+    #
+    def ready(self, source, priority):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        level = self._levels.get(priority)
+        if level is None:
+            level = collections.deque()
+            self._levels[priority] = level
+            self._priorities = sorted(self._levels, reverse=True)
+        level.append(source)
+
+    ##
+    # @if jp
+    # @brief 最も優先度の高いイベント源を取り出す
+    # @param self
+    # @param above 指定した場合はこの値より優先度の高いものだけを対象とする
+    # @return イベント源(ない場合はNone)
+    # @else
+    # @brief Take the highest priority source
+    # @param self
+    # @param above if given, only priorities above this value are taken
+    # @return event source (None if there is none)
+    # @endif
+    #
+    def pop(self, above=None):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        for priority in self._priorities:
+            if above is not None and priority <= above:
+                return None
+            level = self._levels[priority]
+            if level:
+                return level.popleft()
+        return None
 
 
 ##
@@ -16,6 +16,7 @@
 
 import os
 import sys
+import re
 import glob
 
 if sys.version_info[0] == 3:
@@ -202,7 +203,18 @@ def escape(_str):
 # "\"" -> "  <br>
 # @endif
 def unescape(_str):
-    return for_each(_str, unescape_functor())._str
+    if "\\" not in _str:
+        return _str
+    return _unescape_re.sub(_unescape_char, _str)
+
+
+_unescape_re = re.compile(r"\\(.?)", re.S)
+_unescape_map = {"t": "\t", "n": "\n", "f": "\f", "r": "\r"}
+
+
+def _unescape_char(m):
+    c = m.group(1)
+    return _unescape_map.get(c, c)
 
 
 ##
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ThreadPlacement.py
+# @brief Thread placement by role
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+
+import os
+import threading
+
+import OpenRTM_aist
+
+
+threadplacement = None
+
+
+##
+# @if jp
+# @class ThreadPlacement
+# @brief スレッドの役割ごとのCPU配置
+#
+# スレッドの役割(ec, publisher, orb, logger 等)ごとに割り当てるCPUの
+# 集合を manager.thread_placement.<役割>.cpu_affinity で指定する。
+# CPUの集合は "0-3,8" のような番号と範囲、"node1" のような NUMA
+# ノードで指定する。各スレッドは開始時に place() を呼び出して自身を
+# 登録し、役割のCPUの集合に配置される。
+#
+# manager.thread_placement.other.cpu_affinity を指定した場合は、
+# 登録されていないスレッド(omniORB のワーカースレッド、メインスレッド
+# 等)を placeOthers() でそのCPUの集合に配置する(Linuxのみ)。
+#
+# report() で各スレッドの実際のCPUアフィニティ、最後に実行されたCPU
+# と NUMA ノードを取得できる。
+#
+# @else
+# @class ThreadPlacement
+# @brief CPU placement of threads by role
+#
+# The CPU set of each thread role (ec, publisher, orb, logger, ...) is
+# given by manager.thread_placement.<role>.cpu_affinity, as numbers and
+# ranges such as "0-3,8" or NUMA nodes such as "node1". Each thread
+# registers itself by calling place() when it starts and is moved to
+# the CPU set of its role.
+#
+# When manager.thread_placement.other.cpu_affinity is given,
+# placeOthers() moves the threads that did not register (omniORB worker
+# threads, the main thread and so on) to that CPU set (Linux only).
+#
+# report() returns the actual CPU affinity, the CPU last run on and the
+# NUMA node of each thread.
+#
+# @endif
+#
+class ThreadPlacement:
+    """
+    """
+
+    OTHER = "other"
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    # @else
+    # @brief Constructor
+    # @endif
+    #
+    def __init__(self):
+        self._mutex = threading.RLock()
+        self._policies = {}
+        self._threads = {}
+        self._defaultCpus = []
+        self._rtcout = None
+
+    ##
+    # @if jp
+    # @brief 初期化
+    #
+    # manager.thread_placement 以下の設定から役割ごとのCPUの集合を
+    # 取得する。呼び出したスレッドのCPUアフィニティを、CPUの集合が
+    # 指定されていない役割の既定値として保持する。
+    #
+    # @param self
+    # @param prop manager.thread_placement のプロパティ
+    #
+    # @else
+    # @brief Initialize
+    #
+    # Reads the CPU set of each role from the manager.thread_placement
+    # properties. The CPU affinity of the calling thread is kept as the
+    # default of roles without a CPU set.
+    #
+    # @param self
+    # @param prop manager.thread_placement properties
+    #
+    # @endif
+    #
+    def init(self, prop):
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("ThreadPlacement")
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._policies = {}
+        self._defaultCpus = OpenRTM_aist.getThreadAffinity()
+        for node in prop.getLeaf():
+            affinity_str = node.getProperty("cpu_affinity")
+            if not affinity_str:
+                continue
+            cpus = OpenRTM_aist.parseCPUList(affinity_str)
+            if cpus:
+                self._policies[node.getName()] = cpus
+                self._rtcout.RTC_DEBUG("thread placement %s: %s",
+                                       (node.getName(), str(cpus)))
+            else:
+                self._rtcout.RTC_WARN("invalid cpu_affinity for %s: %s",
+                                      (node.getName(), affinity_str))
+
+    ##
+    # @if jp
+    # @brief 役割のCPUの集合を取得
+    #
+    # @param self
+    # @param role 役割
+    # @return CPUの番号リスト(指定がない場合は空)
+    #
+    # @else
+    # @brief Get the CPU set of a role
+    #
+    # @param self
+    # @param role role
+    # @return list of CPU numbers (empty if not given)
+    #
+    # @endif
+    #
+    def getPolicy(self, role):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        return list(self._policies.get(role, []))
+
+    ##
+    # @if jp
+    # @brief 呼び出したスレッドを登録して配置する
+    #
+    # CPUの番号リストを指定した場合は、役割のCPUの集合の代わりに使用する。
+    # 役割のCPUの集合が指定されていない場合は、生成元のスレッドから
+    # 引き継いだアフィニティを初期化時の既定値に戻す。いずれの役割にも
+    # CPUの集合が指定されていない場合は登録のみ行う。
+    #
+    # @param self
+    # @param role 役割
+    # @param name スレッドの名前
+    # @param cpu_num_list CPUの番号リスト
+    # @return 配置に成功、もしくは配置不要の場合にTrue
+    #
+    # @else
+    # @brief Register and place the calling thread
+    #
+    # A given CPU list overrides the CPU set of the role. A role without
+    # a CPU set gets the default affinity taken at initialization back,
+    # rather than keeping the one inherited from the creating thread.
+    # If no role has a CPU set the thread is only registered.
+    #
+    # @param self
+    # @param role role
+    # @param name thread name
+    # @param cpu_num_list list of CPU numbers
+    # @return True if placed or nothing to place
+    #
+    # @endif
+    #
+    def place(self, role, name="", cpu_num_list=None):
+        tid = OpenRTM_aist.getThreadId()
+        cpus = cpu_num_list if cpu_num_list else self.getPolicy(role)
+        if not cpus:
+            guard = OpenRTM_aist.ScopedLock(self._mutex)
+            if self._policies:
+                cpus = list(self._defaultCpus)
+            del guard
+        ret = True
+        if cpus:
+            ret = OpenRTM_aist.setThreadAffinity(cpus)
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._threads[tid] = (role, name or threading.current_thread().name)
+        return ret
+
+    ##
+    # @if jp
+    # @brief 呼び出したスレッドの登録を解除する
+    #
+    # スレッドの終了前に呼び出す。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Unregister the calling thread
+    #
+    # Call this before the thread exits.
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def unplace(self):
+        tid = OpenRTM_aist.getThreadId()
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        self._threads.pop(tid, None)
+
+    ##
+    # @if jp
+    # @brief 登録されていないスレッドを配置する
+    #
+    # other のCPUの集合が指定されている場合に、登録されていない
+    # スレッドをそのCPUの集合に配置する。マネージャのタイマーから
+    # 周期的に呼び出す。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Place the threads that did not register
+    #
+    # Moves the unregistered threads to the CPU set of "other" when it
+    # is given. Called periodically from the manager timer.
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def placeOthers(self):
+        cpus = self.getPolicy(ThreadPlacement.OTHER)
+        if not cpus:
+            return
+        cpuset = set(cpus)
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        registered = set(self._threads)
+        del guard
+        for tid in self.getThreadIds():
+            if tid in registered:
+                continue
+            if set(OpenRTM_aist.getThreadAffinity(tid)) == cpuset:
+                continue
+            if not OpenRTM_aist.setThreadAffinity(cpus, tid):
+                self._rtcout.RTC_DEBUG("failed to place thread %d", tid)
+
+    ##
+    # @if jp
+    # @brief プロセスの全スレッドのIDを取得
+    #
+    # @param self
+    # @return スレッドIDのリスト(取得できない場合は登録済みのスレッド)
+    #
+    # @else
+    # @brief Get the IDs of all threads of the process
+    #
+    # @param self
+    # @return list of thread IDs (registered threads if unavailable)
+    #
+    # @endif
+    #
+    def getThreadIds(self):
+        try:
+            return sorted(int(t) for t in os.listdir("/proc/self/task"))
+        except (IOError, OSError, ValueError):
+            guard = OpenRTM_aist.ScopedLock(self._mutex)
+            return sorted(self._threads)
+
+    ##
+    # @if jp
+    # @brief スレッドとCPUの対応の取得
+    #
+    # 各スレッドについて、スレッドID、役割、名前、CPUアフィニティ、
+    # 最後に実行されたCPUとその NUMA ノードを取得する。
+    # 登録されていないスレッドの役割は other とする。
+    #
+    # @param self
+    # @return 辞書のリスト
+    #
+    # @else
+    # @brief Get the thread to CPU mapping
+    #
+    # For each thread, returns the thread ID, role, name, CPU affinity,
+    # the CPU last run on and its NUMA node. Unregistered threads have
+    # the role "other".
+    #
+    # @param self
+    # @return list of dicts
+    #
+    # @endif
+    #
+    def report(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        threads = dict(self._threads)
+        del guard
+        result = []
+        for tid in self.getThreadIds():
+            role, name = threads.get(tid, (ThreadPlacement.OTHER, ""))
+            if not name:
+                try:
+                    with open("/proc/self/task/%d/comm" % tid) as f:
+                        name = f.read().strip()
+                except (IOError, OSError):
+                    pass
+            cpu = OpenRTM_aist.getThreadCPU(tid)
+            result.append({"tid": tid,
+                           "role": role,
+                           "name": name,
+                           "affinity": OpenRTM_aist.getThreadAffinity(tid),
+                           "cpu": cpu,
+                           "node": OpenRTM_aist.getCPUNode(cpu) if cpu >= 0 else -1})
+        return result
+
+    ##
+    # @if jp
+    # @brief スレッドとCPUの対応を文字列で取得
+    #
+    # @param self
+    # @return 1行に1スレッドの文字列
+    #
+    # @else
+    # @brief Get the thread to CPU mapping as a string
+    #
+    # @param self
+    # @return string with one line per thread
+    #
+    # @endif
+    #
+    def toString(self):
+        lines = []
+        for th in self.report():
+            lines.append("%d %s %s affinity=%s cpu=%d node=%d" %
+                         (th["tid"], th["role"], th["name"],
+                          ",".join([str(c) for c in th["affinity"]]),
+                          th["cpu"], th["node"]))
+        return "\n".join(lines)
+
+    ##
+    # @if jp
+    # @brief インスタンスの取得
+    # @else
+    # @brief Get the instance
+    # @endif
+    #
+    def instance():
+        global threadplacement
+        if threadplacement is None:
+            threadplacement = ThreadPlacement()
+        return threadplacement
+
+    instance = staticmethod(instance)
+
+
+##
+# @if jp
+# @brief 呼び出したスレッドを役割のCPUの集合に配置する
+#
+# @param role 役割
+# @param name スレッドの名前
+# @param cpu_num_list 役割の代わりに使用するCPUの番号リスト
+# @return 配置に成功、もしくは配置不要の場合にTrue
+#
+# @else
+# @brief Place the calling thread on the CPU set of its role
+#
+# @param role role
+# @param name thread name
+# @param cpu_num_list list of CPU numbers overriding the role
+# @return True if placed or nothing to place
+#
+# @endif
+#
+def placeThread(role, name="", cpu_num_list=None):
+    return ThreadPlacement.instance().place(role, name, cpu_num_list)
@@ -23,9 +23,29 @@ import sys
 import time
 import math
 import os
+import array
+import collections
 
 import OpenRTM_aist
 
+_numpy_module = None
+
+
+##
+# @brief NumPy if available, None otherwise.
+#
+# Imported on first use so as not to slow down importing OpenRTM_aist.
+#
+def _numpy():
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
 ULLONG_MAX = 0xffffffffffffffff
 
 if sys.version_info[0] == 3:
@@ -189,12 +209,23 @@ class Time:
 # Using get_stat you can get maximum, minimum, mean and standard
 # deviation time for code execution.
 #
+# Intervals are kept as doubles [s] in a fixed-capacity ring
+# (array('d')), so that tick()/tack() are O(1) without allocation. The
+# mean and the standard deviation are updated on every tack() with
+# Welford's algorithm over the window, and the maximum and the minimum
+# with monotonic deques, so getStatistics(percentiles=False) is O(1).
+# Only the percentiles are computed from the ring, vectorized with NumPy
+# when it is available, and only when asked for. Windows of 100k
+# samples are therefore cheap enough to keep the measurement enabled.
+#
 
 
 class TimeMeasure:
     """
     """
 
+    PERCENTILES = (50, 90, 99)
+
     ##
     # @brief Time statictics object for profiling.
     #
@@ -202,16 +233,18 @@ class TimeMeasure:
     #
     def __init__(self, buflen=100):
         self._countMax = buflen + 1
-        self._record = [
-            OpenRTM_aist.TimeValue(
-                0,
-                0) for i in range(
-                self._countMax)]
-        self._begin = Time().gettimeofday()
-        self._end = Time().gettimeofday()
+        self._record = array.array("d", bytes(8 * self._countMax))
+        self._begin = 0.0
+        self._end = 0.0
         self._count = 0
         self._recurred = False
-        self._interval = OpenRTM_aist.TimeValue(0.0)
+        self._interval = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        # (sample number, interval) candidates for the maximum/minimum
+        self._total = 0
+        self._maxq = collections.deque()
+        self._minq = collections.deque()
         return
 
     ##
@@ -220,7 +253,7 @@ class TimeMeasure:
     # Begin time measurement for time statistics
     #
     def tick(self):
-        self._begin = Time().gettimeofday()
+        self._begin = time.perf_counter()
         return
 
     ##
@@ -229,12 +262,37 @@ class TimeMeasure:
     # End of time measurement for time statistics
     #
     def tack(self):
-        if self._begin.sec() == 0:
+        if self._begin == 0.0:
             return
 
-        self._interval = Time().gettimeofday() - self._begin
-        self._end = Time().gettimeofday()
-        self._record[self._count] = self._interval
+        self._end = time.perf_counter()
+        x = self._end - self._begin
+        self._interval = x
+        mean = self._mean
+        if self._recurred:
+            # replace the oldest sample in the window
+            old = self._record[self._count]
+            self._mean = mean + (x - old) / self._countMax
+            self._m2 = max(self._m2 + (x - old) *
+                           (x - self._mean + old - mean), 0.0)
+        else:
+            self._mean = mean + (x - mean) / (self._count + 1)
+            self._m2 += (x - mean) * (x - self._mean)
+        self._record[self._count] = x
+        n = self._total
+        self._total += 1
+        maxq = self._maxq
+        while maxq and maxq[-1][1] <= x:
+            maxq.pop()
+        maxq.append((n, x))
+        if maxq[0][0] <= n - self._countMax:
+            maxq.popleft()
+        minq = self._minq
+        while minq and minq[-1][1] >= x:
+            minq.pop()
+        minq.append((n, x))
+        if minq[0][0] <= n - self._countMax:
+            minq.popleft()
         self._count += 1
         if self._count == self._countMax:
             self._count = 0
@@ -242,12 +300,17 @@ class TimeMeasure:
         return
 
     def interval(self):
-        return self._interval
+        return OpenRTM_aist.TimeValue(self._interval)
 
     def reset(self):
         self._count = 0
         self._recurred = False
-        self._begin = OpenRTM_aist.TimeValue(0.0)
+        self._begin = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._total = 0
+        self._maxq.clear()
+        self._minq.clear()
         return
 
     ##
@@ -263,14 +326,51 @@ class TimeMeasure:
         else:
             return self._count
 
+    ##
+    # @brief Get the measured intervals [s] in the window.
+    #
+    # A NumPy array sharing the ring when NumPy is available, otherwise
+    # a copy of the ring. Not in chronological order.
+    #
+    def values(self):
+        len_ = self.count()
+        numpy = _numpy()
+        if numpy is not None:
+            return numpy.frombuffer(self._record, numpy.float64, len_)
+        return self._record[:len_]
+
+    ##
+    # @brief Get percentiles of the intervals in the window.
+    #
+    # Percentiles [s] with linear interpolation, for each percent in
+    # percents (None for each when nothing is measured yet).
+    #
+    def getPercentiles(self, percents=PERCENTILES):
+        len_ = self.count()
+        if len_ == 0:
+            return [None for p in percents]
+        numpy = _numpy()
+        if numpy is not None:
+            return [float(v) for v in numpy.percentile(self.values(), percents)]
+        values = sorted(self.values())
+        ret = []
+        for p in percents:
+            k = (len_ - 1) * p / 100.0
+            f = int(k)
+            c = min(f + 1, len_ - 1)
+            ret.append(values[f] + (values[c] - values[f]) * (k - f))
+        return ret
+
     ##
     # @brief Get total statistics.
     # Get total statistics
     # max_interval, min_interval, mean_interval [ns]
+    # The percentiles, the only part that is O(N), are left out of the
+    # returned Statistics when percentiles is False.
     #
 
     def getStatistics(self, max_interval=None, min_interval=None,
-                      mean_interval=None, stddev=None):
+                      mean_interval=None, stddev=None, percentiles=True):
         global ULLONG_MAX
 
         if not max_interval and not min_interval and not mean_interval and not stddev:
@@ -279,38 +379,45 @@ class TimeMeasure:
             mean_i = [0.0]
             stdd = [0.0]
 
-            self.getStatistics(max_i, min_i, mean_i, stdd)
-            return self.Statistics(max_i[0], min_i[0], mean_i[0], stdd[0])
+            if not self.getStatistics(max_i, min_i, mean_i, stdd):
+                return self.Statistics()
+            if not percentiles:
+                return self.Statistics(max_i[0], min_i[0], mean_i[0], stdd[0])
+            return self.Statistics(max_i[0], min_i[0], mean_i[0], stdd[0],
+                                   dict(zip(self.PERCENTILES,
+                                            self.getPercentiles())))
 
         max_interval[0] = 0.0
         min_interval[0] = ULLONG_MAX
 
-        sum_ = 0.0
-        sq_sum_ = 0.0
         len_ = self.count()
 
         if len_ == 0:
             return False
 
-        for i in range(len_):
-            trecord_ = self._record[i].toDouble()
-            sum_ += trecord_
-            sq_sum_ += (trecord_ * trecord_)
-
-            if trecord_ > max_interval[0]:
-                max_interval[0] = trecord_
-
-            if trecord_ < min_interval[0]:
-                min_interval[0] = trecord_
-
-        mean_interval[0] = sum_ / len_
-        stddev[0] = math.sqrt(
-            sq_sum_ / len_ - (mean_interval[0] * mean_interval[0]))
+        max_interval[0] = self._maxq[0][1]
+        min_interval[0] = self._minq[0][1]
+        mean_interval[0] = self._mean
+        stddev[0] = math.sqrt(self._m2 / len_)
 
         return True
 
+    ##
+    # @brief Add the percentiles of the window to statistics.
+    #
+    # Returns a copy of stat, taken with getStatistics(percentiles=False),
+    # with the percentiles of the current window.
+    #
+    def addPercentiles(self, stat):
+        return self.Statistics(stat._max_interval, stat._min_interval,
+                               stat._mean_interval, stat._std_deviation,
+                               dict(zip(self.PERCENTILES,
+                                        self.getPercentiles())))
+
     class Statistics:
-        def __init__(self, max=None, min=None, mean=None, stdd=None):
+        def __init__(self, max=None, min=None, mean=None, stdd=None,
+                     percentiles=None):
+            self._percentiles = dict(percentiles) if percentiles else {}
             if not max and not min and not mean and not stdd:
                 self._max_interval = 0.0
                 self._min_interval = 0.0
@@ -323,3 +430,9 @@ class TimeMeasure:
             self._mean_interval = mean
             self._std_deviation = stdd
             return
+
+        ##
+        # @brief Get a percentile [s] (None if not computed).
+        #
+        def percentile(self, p):
+            return self._percentiles.get(p)
@@ -1,5 +1,6 @@
 # Add path to OpenRTM_aist/RTM_IDL if need be 2008/06/06
 import sys,os
+import importlib
 _openrtm_path = os.path.dirname(__file__)
 
 if _openrtm_path not in sys.path:
@@ -13,6 +14,181 @@ if _openrtm_idl_path not in sys.path:
 del _openrtm_idl_path
 
 
+##
+# @if jp
+# @brief 遅延インポートするモジュールと公開名の対応表
+#
+# データポートのトランスポート(Direct, SHM, DataService, CSP)、FSM関連、
+# 付加的なナンバリングポリシー等は使用時に初めてインポートする。
+# 表中の名前が参照された時点で対応するモジュールをインポートし、
+# 表中の名前をこのパッケージに登録する。
+#
+# @else
+# @brief Table of lazily imported modules and their public names
+#
+# Data port transports (Direct, SHM, DataService, CSP), the FSM
+# machinery, optional numbering policies and the like are imported on
+# first use. Referring to one of the names below imports its module
+# and binds the listed names into this package.
+#
+# @endif
+_lazy_modules = {
+    "InPortDirectConsumer": ("InPortDirectConsumer", "InPortDirectConsumerInit"),
+    "InPortDirectProvider": ("InPortDirectProvider", "InPortDirectProviderInit"),
+    "OutPortDirectConsumer": ("OutPortDirectConsumer", "OutPortDirectConsumerInit"),
+    "OutPortDirectProvider": ("OutPortDirectProvider", "OutPortDirectProviderInit"),
+    "SharedMemory": ("SharedMemory",),
+    "InPortSHMConsumer": ("InPortSHMConsumer", "InPortSHMConsumerInit"),
+    "InPortSHMProvider": ("InPortSHMProvider", "InPortSHMProviderInit"),
+    "OutPortSHMConsumer": ("OutPortSHMConsumer", "OutPortSHMConsumerInit"),
+    "OutPortSHMProvider": ("OutPortSHMProvider", "OutPortSHMProviderInit"),
+    "OutPortDSConsumer": ("OutPortDSConsumer", "OutPortDSConsumerInit"),
+    "OutPortDSProvider": ("OutPortDSProvider", "OutPortDSProviderInit"),
+    "InPortDSConsumer": ("InPortDSConsumer", "InPortDSConsumerInit"),
+    "InPortDSProvider": ("InPortDSProvider", "InPortDSProviderInit"),
+    "InPortCSPConsumer": ("InPortCSPConsumer", "InPortCSPConsumerInit"),
+    "OutPortCSPConsumer": ("OutPortCSPConsumer", "OutPortCSPConsumerInit"),
+    "InPortCSPProvider": ("InPortCSPProvider", "InPortCSPProviderInit"),
+    "OutPortCSPProvider": ("OutPortCSPProvider", "OutPortCSPProviderInit"),
+    "InPortDuplexConnector": ("InPortDuplexConnector", "WriteListenerBase",
+                              "IsWritableListenerBase"),
+    "OutPortDuplexConnector": ("OutPortDuplexConnector", "ReadListenerBase",
+                               "IsReadableListenerBase"),
+    "CSPInPort": ("CSPInPort",),
+    "CSPOutPort": ("CSPOutPort",),
+    "CSPManager": ("CSPManager",),
+    "FsmActionListener": ("PreFsmActionListenerType", "PreFsmActionListener",
+                          "PostFsmActionListenerType", "PostFsmActionListener",
+                          "FsmProfileListenerType", "FsmProfileListener",
+                          "FsmStructureListenerType", "FsmStructureListener",
+                          "PreFsmActionListenerHolder",
+                          "PostFsmActionListenerHolder",
+                          "FsmProfileListenerHolder",
+                          "FsmStructureListenerHolder", "FsmTransitionListener",
+                          "FsmTransitionListenerHolder", "FsmActionListeners"),
+    "StaticFSM": ("fsm_topstate", "fsm_substate", "FSM_TOPSTATE", "FSM_SUBSTATE",
+                  "Machine", "Link", "State", "deephistory", "Event",
+                  "EventQueue", "EventScheduler"),
+    "EventPort": ("Event0", "Event1", "EventSlot", "EventBinder0",
+                  "EventBinder1", "EventConnListener", "EventInPort"),
+    "FsmObject": ("FsmObject_impl",),
+    "FiniteStateMachineComponent": ("FiniteStateMachineComponent_impl",),
+    "NodeNumberingPolicy": ("NodeNumberingPolicy", "NodeNumberingPolicyInit"),
+    "NamingServiceNumberingPolicy": ("NamingServiceNumberingPolicy",
+                                     "NamingServiceNumberingPolicyInit"),
+    "PublisherPeriodic": ("PublisherPeriodic", "PublisherPeriodicInit"),
+    "PeriodicECSharedComposite": ("periodicecsharedcomposite_spec",
+                                  "stringToStrVec", "setCallback",
+                                  "addCallback", "PeriodicECOrganization",
+                                  "PeriodicECSharedComposite",
+                                  "PeriodicECSharedCompositeInit"),
+    "CORBA_RTCUtil": ("get_component_profile", "is_existing",
+                      "is_alive_in_default_ec", "get_actual_ec", "get_ec_id",
+                      "activate", "deactivate", "reset", "get_state",
+                      "is_in_inactive", "is_in_active", "is_in_error",
+                      "get_default_rate", "set_default_rate",
+                      "get_current_rate", "set_current_rate",
+                      "add_rtc_to_default_ec", "remove_rtc_to_default_ec",
+                      "get_participants_rtc", "get_port_names",
+                      "get_inport_names", "get_outport_names",
+                      "get_svcport_names", "get_port_by_name",
+                      "get_connector_names_by_portref", "get_connector_names",
+                      "get_connector_ids_by_portref", "get_connector_ids",
+                      "create_connector", "already_connected", "connect",
+                      "connect_multi", "create_connector_template",
+                      "create_connector_by_template", "connect_bulk",
+                      "find_port", "connect_by_name",
+                      "disconnect", "disconnect_by_portref_connector_name",
+                      "disconnect_by_portname_connector_name",
+                      "disconnect_by_portref_connector_id",
+                      "disconnect_by_portname_connector_id",
+                      "disconnect_all_by_ref", "disconnect_all_by_name",
+                      "get_port_by_url", "disconnect_by_port_name",
+                      "get_configuration", "get_parameter_by_key",
+                      "get_active_configuration_name",
+                      "get_active_configuration", "set_configuration",
+                      "set_active_configuration",
+                      "set_configuration_parameter", "CorbaURI",
+                      "RTCURIObject"),
+    "CPUAffinity": ("listToCUPNUM", "setProcessAffinity", "setThreadAffinity",
+                    "parseCPUList", "getNumaNodes", "getCPUNode",
+                    "getThreadId", "getThreadAffinity", "getThreadCPU"),
+    "ThreadPlacement": ("ThreadPlacement", "placeThread"),
+    "PortLivenessMonitor": ("PortLivenessMonitor",),
+    "SamplingProfiler": ("SamplingProfiler",)
+}
+
+##
+# @if jp
+# @brief モジュールとして参照する遅延インポート対象
+# @else
+# @brief Lazily imported modules referred to as modules
+# @endif
+_lazy_submodules = ("Macho",)
+
+_lazy_names = {}
+for _modname, _names in _lazy_modules.items():
+    for _name in _names:
+        _lazy_names[_name] = _modname
+del _modname, _names, _name
+
+
+##
+# @if jp
+# @brief 遅延インポート対象の名前の解決
+#
+# 対応表にない名前の場合はAttributeErrorを送出する。
+#
+# @param name 名前
+# @return 名前に対応するオブジェクト
+#
+# @else
+# @brief Resolve a lazily imported name
+#
+# AttributeError is raised for names not in the table.
+#
+# @param name name
+# @return object bound to the name
+#
+# @endif
+def __getattr__(name):
+    if name in _lazy_submodules:
+        return importlib.import_module(__name__ + "." + name)
+    modname = _lazy_names.get(name)
+    if modname is None:
+        raise AttributeError("module %r has no attribute %r" %
+                             (__name__, name))
+    module = importlib.import_module(modname)
+    g = globals()
+    for n in _lazy_modules[modname]:
+        g[n] = getattr(module, n)
+    return g[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | set(_lazy_submodules))
+
+
+##
+# @if jp
+# @brief 遅延インポート対象のモジュールを全てインポートする
+#
+# from OpenRTM_aist import * で全ての名前が必要な場合等に使用する。
+#
+# @else
+# @brief Import all lazily imported modules
+#
+# Useful when every name is needed up front, e.g. before
+# "from OpenRTM_aist import *".
+#
+# @endif
+def importAll():
+    for modname in _lazy_modules:
+        __getattr__(_lazy_modules[modname][0])
+    for modname in _lazy_submodules:
+        __getattr__(modname)
+
+
 from version import *
 from DefaultConfiguration import *
 import CORBA_SeqUtil
@@ -54,6 +230,7 @@ from ManagerServant import *
 from Manager import *
 from ManagerConfig import *
 from Timer import *
+from ModuleProfileIndex import *
 from ModuleManager import *
 from NamingManager import *
 from ExecutionContextProfile import *
@@ -83,7 +260,6 @@ from SdoServiceConsumerBase import *
 from SdoServiceProviderBase import *
 from SdoServiceAdmin import *
 from ConfigurationListener import *
-from PeriodicECSharedComposite import *
 from RTCUtil import *
 from OutPortBase import *
 from InPort import *
@@ -105,48 +281,15 @@ from OutPortCorbaCdrProvider import *
 from OutPortPullConnector import *
 from OutPortPushConnector import *
 from PublisherNew import *
-from PublisherPeriodic import *
 from FactoryInit import *
-from InPortDirectConsumer import *
-from InPortDirectProvider import *
-from OutPortDirectConsumer import *
-from OutPortDirectProvider import *
-from SharedMemory import *
-from InPortSHMConsumer import *
-from InPortSHMProvider import *
-from OutPortSHMConsumer import *
-from OutPortSHMProvider import *
-from CORBA_RTCUtil import *
 from NumberingPolicyBase import *
 from NumberingPolicy import *
-from NodeNumberingPolicy import *
-from NamingServiceNumberingPolicy import *
-from CPUAffinity import *
 from LogstreamBase import *
 from LogstreamFile import *
 from SimulatorExecutionContext import *
-from FsmActionListener import *
-from StaticFSM import *
-from EventPort import *
 from Timestamp import *
-from OutPortDSConsumer import *
-from OutPortDSProvider import *
-from InPortDSConsumer import *
-from InPortDSProvider import *
-from FsmObject import *
-from FiniteStateMachineComponent import *
-import Macho
 from Timestamp import *
 from MultilayerCompositeEC import *
 #from MultilayerCompositeChildEC import *
 from ByteDataStreamBase import *
 from CORBA_CdrMemoryStream import *
-from InPortCSPConsumer import *
-from OutPortCSPConsumer import *
-from InPortCSPProvider import *
-from OutPortCSPProvider import *
-from InPortDuplexConnector import *
-from OutPortDuplexConnector import *
-from CSPInPort import *
-from CSPOutPort import *
-from CSPManager import *
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ConnectorChurn.py
+# @brief Connect/disconnect churn and id generation benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.ConnectorChurn [-n count] [-c count]
+#
+#  -n count : number of ids generated per measurement (default 100000)
+#  -c count : number of connect/disconnect cycles (default 1000)
+#
+# Measures the id generation used for connector, SDO and instance ids
+# (uuid1() with the cached node and clock sequence, and the field based
+# path taken when the node is given explicitly), then connects and
+# disconnects an OutPort and an InPort in a local manager and reports
+# the cycles per second and the share of time spent generating ids.
+#
+
+import sys
+import time
+import getopt
+
+import OpenRTM_aist
+import RTC
+
+
+def rate(count, elapsed):
+    if elapsed <= 0.0:
+        return float("inf")
+    return count / elapsed
+
+
+##
+# @if jp
+# @brief ID生成の速度を計測する
+#
+# @param count 生成数
+# @return (キャッシュ版, フィールド版) の毎秒の生成数
+#
+# @else
+# @brief Measure the id generation rate
+#
+# @param count number of ids
+# @return (cached, field based) ids per second
+#
+# @endif
+def measure_ids(count):
+    node = OpenRTM_aist.getnode()
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        str(OpenRTM_aist.uuid1())
+    cached = rate(count, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        str(OpenRTM_aist.uuid1(node))
+    fields = rate(count, time.perf_counter() - t0)
+
+    return cached, fields
+
+
+##
+# @if jp
+# @brief 接続と切断の速度を計測する
+#
+# @param count 接続と切断の回数
+# @return (毎秒の接続と切断の回数, ID生成の時間の割合[%])
+#
+# @else
+# @brief Measure the connect/disconnect rate
+#
+# @param count number of connect/disconnect cycles
+# @return (cycles per second, share of id generation time[%])
+#
+# @endif
+def measure_churn(count):
+    outport = OpenRTM_aist.OutPort("out", RTC.TimedLong(RTC.Time(0, 0), 0))
+    inport = OpenRTM_aist.InPort("in", RTC.TimedLong(RTC.Time(0, 0), 0))
+    prop = OpenRTM_aist.Properties()
+    prop.setProperty("dataport.dataflow_type", "push")
+    prop.setProperty("dataport.interface_type", "corba_cdr")
+    cprof = OpenRTM_aist.CORBA_RTCUtil.create_connector(
+        "churn", prop, outport.getPortRef(), inport.getPortRef())
+
+    getUUID = outport.getUUID
+    spent = [0.0]
+
+    def timedUUID():
+        t = time.perf_counter()
+        uuid = getUUID()
+        spent[0] += time.perf_counter() - t
+        return uuid
+    outport.getUUID = timedUUID
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        cprof.connector_id = ""
+        ret, prof = outport.getPortRef().connect(cprof)
+        if ret != RTC.RTC_OK:
+            print("connect failed: %s" % str(ret))
+            break
+        outport.getPortRef().disconnect(prof.connector_id)
+    elapsed = time.perf_counter() - t0
+
+    outport.deactivateInterfaces()
+    inport.deactivateInterfaces()
+    return rate(count, elapsed), 100.0 * spent[0] / elapsed if elapsed > 0.0 else 0.0
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    count = 100000
+    cycles = 1000
+    try:
+        opts, args = getopt.getopt(argv[1:], "n:c:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-n":
+            count = max(int(arg), 1)
+        elif opt == "-c":
+            cycles = max(int(arg), 1)
+
+    print("%-24s %14s" % ("id generator", "ids/s"))
+    cached, fields = measure_ids(count)
+    print("%-24s %14.0f" % ("uuid1 (cached node)", cached))
+    print("%-24s %14.0f" % ("uuid1 (fields)", fields))
+
+    manager = OpenRTM_aist.Manager.init([argv[0],
+                                         "-o", "naming.enable:NO",
+                                         "-o", "logger.enable:NO",
+                                         "-o", "manager.corba_servant:NO",
+                                         "-o", "timer.enable:NO"])
+    manager.activateManager()
+    manager.runManager(True)
+    try:
+        churn, share = measure_churn(cycles)
+        print("%-24s %14s %14s" % ("connector churn", "cycles/s", "id time[%]"))
+        print("%-24s %14.0f %14.2f" % ("push corba_cdr", churn, share))
+    finally:
+        manager.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file DataFlow.py
+# @brief Data port throughput and latency benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.DataFlow [-n count] [-i interfaces]
+#            [-p publishers] [-b policies] [-t types] [-f fanouts]
+#            [-r rate] [-o file]
+#
+#  -n count      : number of samples per combination (default 1000, reduced
+#                  to count / 100 for data larger than 64 kB)
+#  -i interfaces : comma separated interface types, or "queue" for a
+#                  plain queue handoff without ports as the baseline
+#                  (default queue,corba_cdr,shared_memory,direct,csp_channel)
+#  -p publishers : comma separated publisher types (default flush,new,periodic)
+#  -b policies   : comma separated buffer full policies (default overwrite)
+#  -t types      : comma separated data types, TimedLong or
+#                  TimedOctetSeq:<bytes> or CameraImage:<bytes>
+#                  (default TimedLong,TimedOctetSeq:1024,CameraImage:4194304)
+#  -f fanouts    : comma separated numbers of InPorts per OutPort (default 1,4)
+#  -r rate       : push rate of the periodic publisher [Hz] (default 1000)
+#  -o file       : write the results as JSON to file ("-" for stdout)
+#
+# Starts a local manager in-process, then for every combination of the
+# axes connects one OutPort to fan-out InPorts, writes samples one at a
+# time and waits until every InPort has received each sample, yielding
+# the CPU while it waits. Reports the throughput, the p50/p99 latency
+# from write() to the InPort, the CPU time per sample and the peak
+# memory allocated while sending (a separate pass under tracemalloc).
+# Combinations that cannot connect (e.g. shared memory unavailable) are
+# reported with their error. The queue baseline ignores the publisher
+# and the policy and is measured once per type and fan-out.
+#
+# csp_channel connects a CSPOutPort to a CSPInPort (duplex data flow)
+# and reads every sample with the blocking CSPInPort.read(). It has no
+# publisher either and is measured once per type. A CSP channel hands
+# each sample to only one of its readers, so fan-outs above 1 are
+# reported as not applicable.
+#
+# Two CPU times are reported per sample:
+#  cpu_us_per_sample       : CPU time of the whole process (publisher and
+#                            ORB threads, the receiving InPorts and the
+#                            waiting loop)
+#  write_cpu_us_per_sample : CPU time the writing thread spent inside
+#                            OutPort.write()
+#
+
+import sys
+import time
+import json
+import queue
+import getopt
+import platform
+import tracemalloc
+
+import OpenRTM_aist
+import RTC
+
+
+def rate(count, elapsed):
+    if elapsed <= 0.0:
+        return float("inf")
+    return count / elapsed
+
+
+##
+# @if jp
+# @brief 基準として計測するキューによる受け渡し
+# @else
+# @brief Queue handoff measured as the baseline
+# @endif
+class QueuePort:
+    def __init__(self, peers=()):
+        self._queue = queue.SimpleQueue()
+        self._peers = list(peers)
+
+    def write(self, data):
+        for peer in self._peers:
+            peer._queue.put(data)
+
+    def isNew(self):
+        return not self._queue.empty()
+
+    def read(self):
+        return self._queue.get_nowait()
+
+
+##
+# @if jp
+# @brief パーセンタイルを計算する
+#
+# @param values ソート済みの値のリスト
+# @param p パーセント
+# @return パーセンタイル(空の場合はNone)
+#
+# @else
+# @brief Compute a percentile
+#
+# @param values sorted list of values
+# @param p percent
+# @return percentile (None if empty)
+#
+# @endif
+def percentile(values, p):
+    if not values:
+        return None
+    k = (len(values) - 1) * p / 100.0
+    f = int(k)
+    c = min(f + 1, len(values) - 1)
+    return values[f] + (values[c] - values[f]) * (k - f)
+
+
+##
+# @if jp
+# @brief 計測対象のデータを生成する
+#
+# @param spec TimedLong、TimedOctetSeq:<バイト数>、CameraImage:<バイト数>
+# @return (データ, データのバイト数)
+#
+# @else
+# @brief Create the data to measure
+#
+# @param spec TimedLong, TimedOctetSeq:<bytes> or CameraImage:<bytes>
+# @return (data, size of the data in bytes)
+#
+# @endif
+def sample(spec):
+    name, _, size = spec.partition(":")
+    size = int(size) if size else 0
+    tm = RTC.Time(0, 0)
+    if name == "TimedLong":
+        return RTC.TimedLong(tm, 0), 4
+    if name == "TimedOctetSeq":
+        return RTC.TimedOctetSeq(tm, b"\0" * size), size
+    if name == "CameraImage":
+        side = max(int((size // 3) ** 0.5), 1)
+        return RTC.CameraImage(tm, side, side, 24, "rgb8", 0.0,
+                               b"\0" * (side * side * 3)), side * side * 3
+    raise ValueError("unknown data type: %s" % spec)
+
+
+##
+# @if jp
+# @brief 1つの組み合わせを計測する
+#
+# @param setting 組み合わせ(辞書)
+# @param count サンプル数
+# @param push_rate periodic パブリッシャの送信周期[Hz]
+# @return 結果(辞書)
+#
+# @else
+# @brief Measure one combination
+#
+# @param setting combination (dict)
+# @param count number of samples
+# @param push_rate push rate of the periodic publisher [Hz]
+# @return result (dict)
+#
+# @endif
+def measure(setting, count, push_rate):
+    result = dict(setting)
+    data, size = sample(setting["type"])
+    result["bytes"] = size
+    result["samples"] = count
+
+    csp = setting["interface"] == "csp_channel"
+    if csp and setting["fanout"] > 1:
+        result["error"] = "not applicable: a CSP channel has one reader per sample"
+        return result
+
+    baseline = setting["interface"] == "queue"
+    if baseline:
+        inports = [QueuePort() for i in range(setting["fanout"])]
+        outport = QueuePort(inports)
+    else:
+        if csp:
+            outport = OpenRTM_aist.CSPOutPort("out", data)
+            inports = [OpenRTM_aist.CSPInPort("in0", sample(setting["type"])[0])]
+        else:
+            outport = OpenRTM_aist.OutPort("out", data)
+            inports = [OpenRTM_aist.InPort("in%d" % i,
+                                           sample(setting["type"])[0])
+                       for i in range(setting["fanout"])]
+        # as RTObject_impl.addInPort()/addOutPort() do
+        port_prop = OpenRTM_aist.Properties()
+        port_prop.setProperty("channel_timeout", "1")
+        outport.init(OpenRTM_aist.Properties(prop=port_prop))
+        for inport in inports:
+            inport.init(OpenRTM_aist.Properties(prop=port_prop))
+    prop = OpenRTM_aist.Properties()
+    prop.setProperty("dataport.dataflow_type", "duplex" if csp else "push")
+    prop.setProperty("dataport.interface_type", setting["interface"])
+    prop.setProperty("dataport.subscription_type", setting["publisher"])
+    prop.setProperty("dataport.publisher.push_rate", str(push_rate))
+    prop.setProperty("dataport.buffer.write.full_policy", setting["policy"])
+    prop.setProperty("dataport.buffer.read.empty_policy", "do_nothing")
+
+    try:
+        for i, inport in enumerate(inports if not baseline else []):
+            ret = OpenRTM_aist.connect("bench%d" % i, prop,
+                                       outport.getPortRef(), inport.getPortRef())
+            if ret != RTC.RTC_OK:
+                result["error"] = "connect failed: %s" % str(ret)
+                return result
+
+        def receive(inport, deadline):
+            if csp:
+                # blocks until the channel delivers, up to channel_timeout
+                return inport.read()
+            while not inport.isNew():
+                if time.perf_counter() > deadline:
+                    return None
+                time.sleep(0)
+            return inport.read()
+
+        def send(n, latencies):
+            lost = 0
+            write_cpu = 0.0
+            for _ in range(n):
+                t = time.perf_counter_ns()
+                data.tm.sec, data.tm.nsec = divmod(t, 1000000000)
+                c = time.thread_time()
+                outport.write(data)
+                write_cpu += time.thread_time() - c
+                deadline = time.perf_counter() + 1.0
+                for inport in inports:
+                    value = receive(inport, deadline)
+                    if value is None:
+                        lost += 1
+                        continue
+                    if latencies is not None:
+                        latencies.append(
+                            (time.perf_counter_ns() -
+                             (value.tm.sec * 1000000000 + value.tm.nsec)) / 1000.0)
+            return lost, write_cpu
+
+        send(min(count, 10), None)
+
+        latencies = []
+        c0 = time.process_time()
+        t0 = time.perf_counter()
+        lost, write_cpu = send(count, latencies)
+        elapsed = time.perf_counter() - t0
+        cpu = time.process_time() - c0
+
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        send(min(count, 100), None)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies.sort()
+        result["lost"] = lost
+        result["throughput"] = rate(count, elapsed)
+        result["latency_p50_us"] = percentile(latencies, 50)
+        result["latency_p99_us"] = percentile(latencies, 99)
+        result["cpu_us_per_sample"] = 1000000.0 * cpu / count
+        result["write_cpu_us_per_sample"] = 1000000.0 * write_cpu / count
+        result["alloc_peak_bytes"] = peak - base
+    except Exception:
+        result["error"] = OpenRTM_aist.Logger.print_exception()
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if not baseline:
+            outport.disconnect_all()
+            for inport in inports:
+                inport.disconnect_all()
+            outport.deactivateInterfaces()
+            for inport in inports:
+                inport.deactivateInterfaces()
+    return result
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    count = 1000
+    interfaces = ["queue", "corba_cdr", "shared_memory", "direct",
+                  "csp_channel"]
+    publishers = ["flush", "new", "periodic"]
+    policies = ["overwrite"]
+    types = ["TimedLong", "TimedOctetSeq:1024", "CameraImage:4194304"]
+    fanouts = [1, 4]
+    push_rate = 1000.0
+    output = None
+    try:
+        opts, args = getopt.getopt(argv[1:], "n:i:p:b:t:f:r:o:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-n":
+            count = max(int(arg), 1)
+        elif opt == "-i":
+            interfaces = [s.strip() for s in arg.split(",") if s.strip()]
+        elif opt == "-p":
+            publishers = [s.strip() for s in arg.split(",") if s.strip()]
+        elif opt == "-b":
+            policies = [s.strip() for s in arg.split(",") if s.strip()]
+        elif opt == "-t":
+            types = [s.strip() for s in arg.split(",") if s.strip()]
+        elif opt == "-f":
+            fanouts = [max(int(s), 1) for s in arg.split(",") if s.strip()]
+        elif opt == "-r":
+            push_rate = float(arg)
+        elif opt == "-o":
+            output = arg
+
+    manager = OpenRTM_aist.Manager.init([argv[0],
+                                         "-o", "naming.enable:NO",
+                                         "-o", "logger.enable:NO",
+                                         "-o", "manager.corba_servant:NO",
+                                         "-o", "timer.enable:NO"])
+    manager.activateManager()
+    manager.runManager(True)
+
+    results = []
+    table = output != "-"
+    if table:
+        print("%-14s %-9s %-10s %-22s %3s %12s %10s %10s %10s %10s %12s" %
+              ("interface", "publisher", "policy", "type", "N", "samples/s",
+               "p50[us]", "p99[us]", "cpu[us]", "write[us]", "alloc[B]"))
+    try:
+        for interface in interfaces:
+            for publisher in publishers:
+                for policy in policies:
+                    for type_ in types:
+                        for fanout in fanouts:
+                            if interface in ("queue", "csp_channel") and \
+                                    (publisher, policy) != (publishers[0], policies[0]):
+                                continue
+                            setting = {"interface": interface,
+                                       "publisher": publisher,
+                                       "policy": policy,
+                                       "type": type_,
+                                       "fanout": fanout}
+                            n = count if sample(type_)[1] <= 65536 \
+                                else max(count // 100, 1)
+                            r = measure(setting, n, push_rate)
+                            results.append(r)
+                            if not table:
+                                continue
+                            if "error" in r:
+                                print("%-14s %-9s %-10s %-22s %3d %s" %
+                                      (interface, publisher, policy, type_,
+                                       fanout, r["error"].strip().splitlines()[-1]))
+                            else:
+                                print("%-14s %-9s %-10s %-22s %3d %12.0f %10.1f %10.1f %10.1f %10.1f %12d" %
+                                      (interface, publisher, policy, type_, fanout,
+                                       r["throughput"], r["latency_p50_us"] or 0.0,
+                                       r["latency_p99_us"] or 0.0,
+                                       r["cpu_us_per_sample"],
+                                       r["write_cpu_us_per_sample"],
+                                       r["alloc_peak_bytes"]))
+    finally:
+        manager.shutdown()
+
+    if output:
+        report = {"python": platform.python_version(),
+                  "platform": platform.platform(),
+                  "version": OpenRTM_aist.openrtm_version,
+                  "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                  "count": count,
+                  "push_rate": push_rate,
+                  "results": results}
+        if output == "-":
+            json.dump(report, sys.stdout, indent=1)
+            print("")
+        else:
+            with open(output, "w") as f:
+                json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
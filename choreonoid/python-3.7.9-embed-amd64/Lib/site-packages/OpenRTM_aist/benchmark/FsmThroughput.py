@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file FsmThroughput.py
+# @brief Static FSM event throughput benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.FsmThroughput [-n count] [-l levels]
+#
+#  -n count  : number of events per measurement (default 100000)
+#  -l levels : comma separated hierarchy depths (default 3,6)
+#
+# For each depth, builds a state machine whose top state has two chains
+# of substates down to two leaf states, so that every event exits and
+# enters depth - 1 states. Events alternate between the leaves and are
+# measured both dispatched directly and passed through the event buffer
+# and run_event(), with the default engine and the precomputed engine
+# (precomputed transition paths and EventQueue).
+#
+
+import sys
+import time
+import getopt
+import functools
+
+import OpenRTM_aist
+
+
+def rate(count, elapsed):
+    if elapsed <= 0.0:
+        return float("inf")
+    return count / elapsed
+
+
+##
+# @if jp
+# @brief 指定した深さの状態階層を生成する
+#
+# @param levels 階層の深さ(最上位状態を含む)
+# @return 最上位状態
+#
+# @else
+# @brief Build a state hierarchy of the given depth
+#
+# @param levels depth including the top state
+# @return top state
+#
+# @endif
+def build(levels):
+    def toggle(self):
+        pass
+
+    top = OpenRTM_aist.fsm_topstate(
+        type("Top%d" % levels, (OpenRTM_aist.Link,), {"toggle": toggle}))
+
+    def toggle(self):
+        self.set_state(self.OTHER)
+
+    leaves = []
+    for branch in ("A", "B"):
+        parent = top
+        for i in range(1, levels - 1):
+            parent = OpenRTM_aist.fsm_substate(parent)(
+                type("%s%d_%d" % (branch, levels, i), (OpenRTM_aist.Link,), {}))
+        leaves.append(OpenRTM_aist.fsm_substate(parent)(
+            type("%s%d_leaf" % (branch, levels), (OpenRTM_aist.Link,),
+                 {"toggle": toggle})))
+    leaves[0].OTHER = leaves[1]
+    leaves[1].OTHER = leaves[0]
+    top.FIRST = leaves[0]
+    return top
+
+
+##
+# @if jp
+# @brief イベントの処理速度を計測する
+#
+# @param top 最上位状態
+# @param count イベント数
+# @param precompute 状態遷移の経路を事前に計算する場合にTrue
+# @return (直接ディスパッチ, バッファ経由) の毎秒のイベント数
+#
+# @else
+# @brief Measure the event rate
+#
+# @param top top state
+# @param count number of events
+# @param precompute True to precompute the transition paths
+# @return (direct dispatch, through the buffer) events per second
+#
+# @endif
+def measure(top, count, precompute):
+    machine = OpenRTM_aist.Machine(top, None, precompute)
+    event = OpenRTM_aist.Macho.Event(top.toggle)
+    machine.dispatch(OpenRTM_aist.Macho.Event(OpenRTM_aist.Link.set_state, top.FIRST))
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        machine.dispatch(event)
+    direct = rate(count, time.perf_counter() - t0)
+
+    buf = machine.getBuffer()
+    record = functools.partial(machine.dispatch, event)
+    batch = OpenRTM_aist.RingBuffer.RINGBUFFER_DEFAULT_LENGTH
+    t0 = time.perf_counter()
+    for _ in range(count // batch):
+        for _ in range(batch):
+            buf.write(record)
+        machine.run_event()
+    queued = rate(count // batch * batch, time.perf_counter() - t0)
+
+    return direct, queued
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    count = 100000
+    levels = [3, 6]
+    try:
+        opts, args = getopt.getopt(argv[1:], "n:l:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-n":
+            count = max(int(arg), 1)
+        elif opt == "-l":
+            levels = [max(int(l), 2) for l in arg.split(",") if l.strip()]
+
+    tops = [(l, build(l)) for l in levels]
+
+    print("%-8s %-12s %14s %14s" % ("levels", "engine", "dispatch/s", "queued/s"))
+    for l, top in tops:
+        for precompute in (False, True):
+            direct, queued = measure(top, count, precompute)
+            print("%-8d %-12s %14.0f %14.0f" %
+                  (l, "precomputed" if precompute else "default", direct, queued))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
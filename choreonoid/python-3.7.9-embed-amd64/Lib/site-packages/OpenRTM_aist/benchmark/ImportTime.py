@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ImportTime.py
+# @brief OpenRTM_aist package import time benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.ImportTime [-n count] [-a] [-t top]
+#
+#  -n count : number of fresh interpreters to measure (default 10)
+#  -a       : also measure with all lazily imported modules loaded
+#  -t top   : print the top slowest modules from "python -X importtime"
+#
+
+import sys
+import getopt
+import subprocess
+
+
+_measure_script = """
+import sys, time
+t0 = time.perf_counter()
+import OpenRTM_aist
+%s
+t1 = time.perf_counter()
+print("%%f %%d" %% (t1 - t0, len(sys.modules)))
+"""
+
+
+##
+# @if jp
+# @brief 新しいインタプリタでのインポート時間の計測
+#
+# @param count 計測回数
+# @param import_all 遅延インポート対象も全てインポートする場合はTrue
+# @return (インポート時間のリスト[秒], インポート済みモジュール数)
+#
+# @else
+# @brief Measure the import time in fresh interpreters
+#
+# @param count number of measurements
+# @param import_all True to import the lazily imported modules as well
+# @return (list of import times [s], number of loaded modules)
+#
+# @endif
+def measure(count, import_all=False):
+    script = _measure_script % ("OpenRTM_aist.importAll()" if import_all else "")
+    times = []
+    nmod = 0
+    for _ in range(count):
+        out = subprocess.check_output([sys.executable, "-c", script])
+        t, n = out.decode().split()
+        times.append(float(t))
+        nmod = int(n)
+    return times, nmod
+
+
+##
+# @if jp
+# @brief python -X importtime の結果から累積時間の大きいモジュールを取得
+#
+# @param top 取得するモジュール数
+# @return (累積時間[us], モジュール名) のリスト
+#
+# @else
+# @brief Get the slowest modules reported by python -X importtime
+#
+# @param top number of modules
+# @return list of (cumulative time [us], module name)
+#
+# @endif
+def slowest(top):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                           "import OpenRTM_aist"],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    result = []
+    for line in proc.stderr.decode().splitlines():
+        if not line.startswith("import time:"):
+            continue
+        cols = line[len("import time:"):].split("|")
+        if len(cols) != 3 or not cols[1].strip().isdigit():
+            continue
+        result.append((int(cols[1]), cols[2].strip()))
+    result.sort(reverse=True)
+    return result[:top]
+
+
+def report(label, times, nmod):
+    times = sorted(times)
+    print("%-8s min %8.2f ms  median %8.2f ms  max %8.2f ms  modules %d" %
+          (label, times[0] * 1000.0, times[len(times) // 2] * 1000.0,
+           times[-1] * 1000.0, nmod))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    count = 10
+    import_all = False
+    top = 0
+    try:
+        opts, args = getopt.getopt(argv[1:], "n:at:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-n":
+            count = max(int(arg), 1)
+        elif opt == "-a":
+            import_all = True
+        elif opt == "-t":
+            top = int(arg)
+
+    times, nmod = measure(count)
+    report("lazy", times, nmod)
+    if import_all:
+        times, nmod = measure(count, True)
+        report("all", times, nmod)
+    for usec, name in slowest(top):
+        print("%10.2f ms  %s" % (usec / 1000.0, name))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file Marshalling.py
+# @brief CORBA CDR marshalling benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.Marshalling [-n count] [-s sizes]
+#
+#  -n count : number of samples per measurement (default 10000)
+#  -s sizes : comma separated sequence lengths (default 16,100000)
+#
+# Compares the CDR serializer bound to the data type (the TypeCode is
+# cached per repository id) against looking the TypeCode up from the
+# value on every sample.
+#
+
+import sys
+import time
+import getopt
+
+import OpenRTM_aist
+import RTC
+from omniORB import any
+from omniORB import cdrMarshal
+from omniORB import cdrUnmarshal
+
+
+##
+# @if jp
+# @brief 計測対象のデータを生成する
+#
+# @param size シーケンス型の要素数
+# @return (名前, データ) のリスト
+#
+# @else
+# @brief Create the data to measure
+#
+# @param size length of sequence types
+# @return list of (name, data)
+#
+# @endif
+def samples(size):
+    tm = RTC.Time(0, 0)
+    pose = RTC.Pose3D(RTC.Point3D(1.0, 2.0, 3.0),
+                      RTC.Orientation3D(0.1, 0.2, 0.3))
+    return [("TimedLong", RTC.TimedLong(tm, 1)),
+            ("TimedString[%d]" % size, RTC.TimedString(tm, "a" * size)),
+            ("TimedDoubleSeq[%d]" % size,
+             RTC.TimedDoubleSeq(tm, [float(i) for i in range(size)])),
+            ("TimedOctetSeq[%d]" % size,
+             RTC.TimedOctetSeq(tm, b"\0" * size)),
+            ("TimedPose3D", RTC.TimedPose3D(tm, pose)),
+            ("TimedPoint3D", RTC.TimedPoint3D(tm, RTC.Point3D(1.0, 2.0, 3.0)))]
+
+
+def rate(count, elapsed):
+    if elapsed <= 0.0:
+        return float("inf")
+    return count / elapsed
+
+
+##
+# @if jp
+# @brief 符号化、復号化の速度を計測する
+#
+# @param data データ
+# @param count 計測回数
+# @return (バインド済み符号化, 逐次符号化, バインド済み復号化, 逐次復号化)
+# の毎秒の処理数
+#
+# @else
+# @brief Measure encode and decode rates
+#
+# @param data data
+# @param count number of samples
+# @return (bound encode, per sample encode, bound decode, per sample decode)
+# in samples per second
+#
+# @endif
+def measure(data, count):
+    serializer = OpenRTM_aist.SerializerFactories.instance().createSerializer("cdr",
+                                                                             data)
+    serializer.isLittleEndian(True)
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        _, cdr = serializer.serialize(data)
+    bound_enc = rate(count, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        cdr = cdrMarshal(any.to_any(data).typecode(), data, True)
+    plain_enc = rate(count, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        serializer.deserialize(cdr, data)
+    bound_dec = rate(count, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        cdrUnmarshal(any.to_any(data).typecode(), cdr, True)
+    plain_dec = rate(count, time.perf_counter() - t0)
+
+    return bound_enc, plain_enc, bound_dec, plain_dec
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    count = 10000
+    sizes = [16, 100000]
+    try:
+        opts, args = getopt.getopt(argv[1:], "n:s:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-n":
+            count = max(int(arg), 1)
+        elif opt == "-s":
+            sizes = [int(s) for s in arg.split(",") if s.strip()]
+
+    OpenRTM_aist.CORBA_CdrMemoryStreamInit()
+    print("%-24s %14s %14s %14s %14s" % ("type", "enc bound/s", "enc any/s",
+                                         "dec bound/s", "dec any/s"))
+    names = set()
+    for size in sizes:
+        for name, data in samples(size):
+            if name in names:
+                continue
+            names.add(name)
+            n = count if size <= 1024 else max(count // 100, 1)
+            print("%-24s %14.0f %14.0f %14.0f %14.0f" %
+                  ((name,) + measure(data, n)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
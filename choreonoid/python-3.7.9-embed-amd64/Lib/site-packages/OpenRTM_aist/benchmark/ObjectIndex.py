@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ObjectIndex.py
+# @brief ObjectManager scaling benchmark
+# @date $Date$
+#
+# Copyright (C) 2006-2008
+#     Task-intelligence Research Group,
+#     Intelligent Systems Research Institute,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# Usage: python -m OpenRTM_aist.benchmark.ObjectIndex [-s sizes]
+#
+#  -s sizes : comma separated numbers of objects (default 10,100,1000,10000)
+#
+# Registers, finds and unregisters the given number of components with
+# the predicate used by the manager, once with ObjectManager and once
+# with IndexedObjectManager.
+#
+
+import sys
+import time
+import getopt
+
+import OpenRTM_aist
+
+
+##
+# @if jp
+# @brief 計測用のコンポーネントの代替クラス
+# @else
+# @brief Stand-in for a component
+# @endif
+class Component:
+    def __init__(self, name):
+        self._name = name
+
+    def getInstanceName(self):
+        return self._name
+
+
+##
+# @if jp
+# @brief 登録、検索、登録解除に要した時間を計測する
+#
+# @param manager_class ObjectManagerクラス
+# @param size オブジェクト数
+# @return (登録, 検索, 登録解除) の合計時間[s]
+#
+# @else
+# @brief Measure registration, lookup and unregistration
+#
+# @param manager_class ObjectManager class
+# @param size number of objects
+# @return total time[s] of (register, find, unregister)
+#
+# @endif
+def measure(manager_class, size):
+    manager = manager_class(OpenRTM_aist.Manager.InstanceName)
+    comps = [Component("comp%d" % i) for i in range(size)]
+
+    t0 = time.perf_counter()
+    for comp in comps:
+        manager.registerObject(comp)
+    t_reg = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for comp in comps:
+        manager.find(comp.getInstanceName())
+    t_find = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for comp in comps:
+        manager.unregisterObject(comp.getInstanceName())
+    t_unreg = time.perf_counter() - t0
+
+    return t_reg, t_find, t_unreg
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    sizes = [10, 100, 1000, 10000]
+    try:
+        opts, args = getopt.getopt(argv[1:], "s:")
+    except getopt.GetoptError as e:
+        print(e)
+        return 1
+    for opt, arg in opts:
+        if opt == "-s":
+            sizes = [int(s) for s in arg.split(",") if s.strip()]
+
+    print("%-22s %8s %12s %12s %12s" % ("class", "objects", "register[s]",
+                                         "find[s]", "unregister[s]"))
+    for size in sizes:
+        for manager_class in (OpenRTM_aist.ObjectManager,
+                              OpenRTM_aist.IndexedObjectManager):
+            print("%-22s %8d %12.6f %12.6f %12.6f" %
+                  ((manager_class.__name__, size) +
+                   measure(manager_class, size)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,8 +16,10 @@
 #
 
 import sys
+import threading
 
 from omniORB import CORBA, PortableServer
+from omniORB import any
 import RTC
 import RTC__POA
 import OpenRTM
@@ -27,12 +29,49 @@ import OpenRTM_aist
 import OpenRTM_aist.NVUtil
 
 
+##
+# @if jp
+# @class ExtendedFsmServiceProvider
+# @brief ExtendedFsmService の実装
+#
+# FsmStructure を1つ保持し、内容が変化する毎にバージョンを1つ増やす。
+# バージョンは FsmStructure の properties のキー
+# "fsm_structure.version" に格納する。内容が同じ FsmStructure の設定は
+# バージョンを変えず、FsmStructureListener にも通知しない。
+# get_fsm_structure_since() に取得済みのバージョンを渡すと、変化して
+# いない場合は FsmStructure を返さない。
+#
+# FSMの状態は RTObject の FsmTransitionListener により、状態遷移毎に
+# (遷移元, 遷移先, イベント) の差分のみを受け取る。
+#
+# @else
+# @class ExtendedFsmServiceProvider
+# @brief Implementation of ExtendedFsmService
+#
+# Holds one FsmStructure and increments its version every time the
+# content changes. The version is stored under the key
+# "fsm_structure.version" of the FsmStructure properties. Setting an
+# FsmStructure with the same content keeps the version and notifies no
+# FsmStructureListener. get_fsm_structure_since() given a known version
+# returns no FsmStructure when it is unchanged.
+#
+# The FSM state is tracked by a FsmTransitionListener of the RTObject,
+# which receives only the (from, to, event) delta of each transition.
+#
+# @endif
+#
 class ExtendedFsmServiceProvider(
         RTC__POA.ExtendedFsmService, OpenRTM_aist.SdoServiceProviderBase):
+    VERSION_KEY = "fsm_structure.version"
+
     def __init__(self):
         self._rtobj = None
         self._profile = None
         self._fsmState = ""
+        self._lastTransition = ("", "", "")
+        self._transitionListener = None
+        self._mutex = threading.RLock()
+        self._version = 0
         structure = """
 <scxml xmlns=\"http://www.w3.org/2005/07/scxml\
            version=\"1.0\"
@@ -57,6 +96,7 @@ class ExtendedFsmServiceProvider(
         nv = OpenRTM_aist.NVUtil.newNV("fsm_structure.format", "scxml")
         self._fsmStructure = RTC.FsmStructure(
             "dummy_name", "", [event_profile], [nv])
+        self.updateVersion()
 
     ##
     # @if jp
@@ -68,6 +108,7 @@ class ExtendedFsmServiceProvider(
     def init(self, rtobj, profile):
         self._rtobj = rtobj
         self._profile = profile
+        self.setFSMStatusListeners()
         return True
 
     ##
@@ -99,7 +140,7 @@ class ExtendedFsmServiceProvider(
     # @endif
     #
     def finalize(self):
-        pass
+        self.unsetFSMStatusListeners()
 
     ##
     # @if jp
@@ -157,7 +198,17 @@ class ExtendedFsmServiceProvider(
     # @endif
     #
     def set_fsm_structure(self, fsm_structure):
-        self._fsmStructure = fsm_structure
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self.isSameStructure(fsm_structure):
+            return RTC.RTC_OK
+        # the version is added to a copy, not to the caller's properties
+        self._fsmStructure = RTC.FsmStructure(
+            fsm_structure.name, fsm_structure.structure,
+            list(fsm_structure.event_profiles),
+            list(fsm_structure.properties))
+        self.updateVersion()
+        del guard
+        self.notifyStructure()
         return RTC.RTC_OK
 
     ##
@@ -201,6 +252,117 @@ class ExtendedFsmServiceProvider(
     def get_fsm_structure(self):
         return (RTC.RTC_OK, self._fsmStructure)
 
+    ##
+    # @if jp
+    # @brief 指定したバージョン以降に変化した場合のみFSMの構造を取得する
+    #
+    # 取得済みの FsmStructure の properties の "fsm_structure.version"
+    # を渡すと、変化していない場合は FsmStructure の代わりに None を
+    # 返す。
+    #
+    # @param version 取得済みのバージョン
+    # @return (RTC_OK, FsmStructure もしくは None)
+    #
+    # @else
+    # @brief Get the FSM structure only if changed since a version
+    #
+    # Given the "fsm_structure.version" of the properties of an
+    # FsmStructure already obtained, None is returned instead of the
+    # FsmStructure when it is unchanged.
+    #
+    # @param version version already obtained
+    # @return (RTC_OK, FsmStructure or None)
+    #
+    # @endif
+    #
+    def get_fsm_structure_since(self, version):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if str(version) == str(self._version):
+            return (RTC.RTC_OK, None)
+        return (RTC.RTC_OK, self._fsmStructure)
+
+    ##
+    # @if jp
+    # @brief FSMの構造のバージョンを取得する
+    # @else
+    # @brief Get the version of the FSM structure
+    # @endif
+    #
+    def getStructureVersion(self):
+        return self._version
+
+    ##
+    # @if jp
+    # @brief 保持しているFSMの構造と内容が同じかどうか
+    #
+    # properties の "fsm_structure.version" は比較しない。
+    #
+    # @param fsm_structure FsmStructure
+    # @return 同じ場合にTrue
+    #
+    # @else
+    # @brief Whether the content equals the FSM structure held
+    #
+    # "fsm_structure.version" of the properties is not compared.
+    #
+    # @param fsm_structure FsmStructure
+    # @return True if the same
+    #
+    # @endif
+    #
+    def isSameStructure(self, fsm_structure):
+        cur = self._fsmStructure
+        if cur.name != fsm_structure.name or \
+                cur.structure != fsm_structure.structure:
+            return False
+        if [(e.name, e.data_type) for e in cur.event_profiles] != \
+                [(e.name, e.data_type) for e in fsm_structure.event_profiles]:
+            return False
+        return self.toPropertyList(cur.properties) == \
+            self.toPropertyList(fsm_structure.properties)
+
+    ##
+    # @if jp
+    # @brief バージョンを除いた properties の (名前, 値) のリスト
+    # @else
+    # @brief List of (name, value) of the properties except the version
+    # @endif
+    #
+    def toPropertyList(self, properties):
+        return [(nv.name, any.from_any(nv.value, keep_structs=True))
+                for nv in properties
+                if nv.name != ExtendedFsmServiceProvider.VERSION_KEY]
+
+    ##
+    # @if jp
+    # @brief バージョンを1つ増やし、FsmStructure の properties に格納する
+    # @else
+    # @brief Increment the version and store it in the FsmStructure properties
+    # @endif
+    #
+    def updateVersion(self):
+        self._version += 1
+        nv = OpenRTM_aist.NVUtil.newNV(ExtendedFsmServiceProvider.VERSION_KEY,
+                                       str(self._version))
+        properties = self._fsmStructure.properties
+        index = OpenRTM_aist.NVUtil.find_index(properties, nv.name)
+        if index >= 0:
+            properties[index] = nv
+        else:
+            properties.append(nv)
+
+    ##
+    # @if jp
+    # @brief FsmStructureListener にFSMの構造の設定を通知する
+    # @else
+    # @brief Notify the FsmStructureListeners of the FSM structure setting
+    # @endif
+    #
+    def notifyStructure(self):
+        if self._rtobj is None:
+            return
+        self._rtobj.onSetFsmStructure(self._fsmStructure)
+
     ##
     # @if jp
     # @brief RTObjectへのリスナ接続処理
@@ -219,18 +381,47 @@ class ExtendedFsmServiceProvider(
     # @brief FSM status change
     # @endif
     #
-    def changeStatus(self, state):
+    def changeStatus(self, state, from_="", event=""):
         self._fsmState = state
+        self._lastTransition = (from_, state, event)
 
     ##
     # @if jp
-    # @brief ハートビートを解除する
+    # @brief 最後の状態遷移の取得
+    #
+    # @return (遷移元, 遷移先, イベント名)
+    #
     # @else
-    # @brief Unsetting heartbeat
+    # @brief Get the last state transition
+    #
+    # @return (source, target, event name)
+    #
+    # @endif
+    #
+    def getLastTransition(self):
+        return self._lastTransition
+
+    ##
+    # @if jp
+    # @brief FSMの構造の文字列を変更する
+    #
+    # 内容が変化した場合のみバージョンを増やす。
+    #
+    # @else
+    # @brief Change the structure string of the FSM
+    #
+    # The version is incremented only when the content changes.
+    #
     # @endif
     #
     def changeStructure(self, fsm_structure):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self._fsmStructure.structure == fsm_structure:
+            return
         self._fsmStructure.structure = fsm_structure
+        self.updateVersion()
+        del guard
+        self.notifyStructure()
 
     ##
     # @if jp
@@ -240,7 +431,20 @@ class ExtendedFsmServiceProvider(
     # @endif
     #
     def setFSMStatusListeners(self):
-        pass
+        if self._rtobj is None or self._transitionListener:
+            return
+        self._transitionListener = self._rtobj.addFsmTransitionListener(
+            self.onTransition)
+
+    ##
+    # @if jp
+    # @brief 状態遷移の通知を受ける
+    # @else
+    # @brief Receive a state transition
+    # @endif
+    #
+    def onTransition(self, from_, to, event):
+        self.changeStatus(to, from_, event)
 
     ##
     # @if jp
@@ -250,7 +454,9 @@ class ExtendedFsmServiceProvider(
     # @endif
     #
     def unsetFSMStatusListeners(self):
-        pass
+        if self._transitionListener:
+            self._rtobj.removeFsmTransitionListener(self._transitionListener)
+            self._transitionListener = None
 
     ##
     # @if jp
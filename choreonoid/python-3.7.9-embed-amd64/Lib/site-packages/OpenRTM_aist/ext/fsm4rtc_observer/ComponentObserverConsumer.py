@@ -106,10 +106,22 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
     # \subsection FSM_STATUS FSM_STATUS
     # FSMの状態が変化した際にこのタグ名(enum値)を
     # 第1引数にして update_status() オペレーションが呼び出される。
+    # 1回の状態遷移について1回だけ、遷移の差分のみをヒントとして
+    # コールバックされる。
+    #
+    # - 状態遷移の完了時: TRANSITION: <遷移元> <遷移先> <イベント名>
+    #
+    # fsm_status.detail に YES を指定した場合は、さらに各状態の
+    # init、entry、do、exit の前後に "<状態名> PRE_ON_ENTRY" 等の
+    # ヒントとともにコールバックされる。
     #
     # \subsection FSM_STRUCTURE FSM_STRUCTURE
     # FSMの構造が変化した際にこのタグ名(enum値)を
     # 第1引数にして update_status() オペレーションが呼び出される。
+    # ヒントは構造全体ではなく構造のバージョンのみであり、構造は
+    # ExtendedFsmService から取得する。
+    #
+    # - FsmStructure の設定時: VERSION: <fsm_structure.version>
     #
     # \subsection USER_DEFINED USER_DEFINED
     # ユーザ定義した際にこのタグ名(enum値)を
@@ -130,6 +142,7 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
         self._ecaction = self.ECAction(self)
         self._configMsg = self.ConfigAction(self)
         self._fsmaction = self.FSMAction(self)
+        self._fsmDetail = False
 
         self._rtcInterval = OpenRTM_aist.TimeValue(1, 0)
         self._rtcHeartbeat = False
@@ -228,6 +241,8 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
         self.unsetPortProfileListeners()
         self.unsetExecutionContextListeners()
         self.unsetConfigurationListeners()
+        self.unsetFSMStatusListeners()
+        self.unsetFSMStructureListeners()
         self.unsetRTCHeartbeat()
         return
 
@@ -303,9 +318,9 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
             elif observed_[i] == "FSM_PROFILE":
                 flags_[RTC.FSM_PROFILE._v] = True
             elif observed_[i] == "FSM_STATUS":
-                flags_[RTC.FSM_STRUCTURE._v] = True
+                flags_[RTC.FSM_STATUS._v] = True
             elif observed_[i] == "FSM_STRUCTURE":
-                flags_[RTC.CONFIGURATION._v] = True
+                flags_[RTC.FSM_STRUCTURE._v] = True
             elif observed_[i] == "ALL":
                 for j in range(RTC.STATUS_KIND_NUM._v):
                     flags_[j] = True
@@ -346,6 +361,12 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
                              RTC.FSM_PROFILE._v,
                              self.setFSMProfileListeners,
                              self.unsetFSMProfileListeners)
+        detail_ = OpenRTM_aist.toBool(prop.getProperty("fsm_status.detail"),
+                                      "YES", "NO", False)
+        if self._observed[RTC.FSM_STATUS._v] and detail_ != self._fsmDetail:
+            self.unsetFSMStatusListeners()
+            self._observed[RTC.FSM_STATUS._v] = False
+        self._fsmDetail = detail_
         self.switchListeners(flags_[RTC.FSM_STATUS._v],
                              self._observed,
                              RTC.FSM_STATUS._v,
@@ -587,11 +608,42 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
 
         return
 
+    ##
+    # @if jp
+    # @brief FSM状態変化リスナの設定処理
+    #
+    # 状態遷移毎に差分のみを通知する FsmTransitionListener を設定する。
+    # fsm_status.detail が YES の場合は各アクションのリスナも設定する。
+    #
+    # @else
+    # @brief Setting FSM status listeners
+    #
+    # Sets a FsmTransitionListener notifying only the delta of each
+    # transition, and the listeners of each action when
+    # fsm_status.detail is YES.
+    #
+    # @endif
+    #
     def setFSMStatusListeners(self):
-        pass
+        if not self._fsmaction.transitionListener:
+            self._fsmaction.transitionListener = \
+                self._rtobj.addFsmTransitionListener(self._fsmaction.transition)
+        if self._fsmDetail:
+            self.setFSMActionListeners()
 
+    ##
+    # @if jp
+    # @brief FSM状態変化リスナの解除処理
+    # @else
+    # @brief Unsetting FSM status listeners
+    # @endif
+    #
     def unsetFSMStatusListeners(self):
-        pass
+        if self._fsmaction.transitionListener:
+            self._rtobj.removeFsmTransitionListener(
+                self._fsmaction.transitionListener)
+            self._fsmaction.transitionListener = None
+        self.unsetFSMActionListeners()
 
     # ============================================================
     # Port profile related functions
@@ -779,51 +831,96 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
     # void setConfigurationListeners();
 
     def setFSMStructureListeners(self):
-        fsmactionlistenertype_ = OpenRTM_aist.PreFsmActionListenerType
-        self._fsmaction.preOnFsmInitListener = \
-            self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_INIT,
-                                                self._fsmaction.preInit)
+        if not self._fsmaction.structureListener:
+            self._fsmaction.structureListener = \
+                self._rtobj.addFsmStructureListener(
+                    OpenRTM_aist.FsmStructureListenerType.SET_FSM_STRUCTURE,
+                    self._fsmaction.updateFsmStructure)
 
-        self._fsmaction.preOnFsmEntryListener = \
-            self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_ENTRY,
-                                                self._fsmaction.preEntry)
-
-        self._fsmaction.preOnFsmDoListener = \
-            self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_DO,
-                                                self._fsmaction.preDo)
-
-        self._fsmaction.preOnFsmExitListener = \
-            self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_EXIT,
-                                                self._fsmaction.preExit)
+    ##
+    # @if jp
+    # @brief FsmStructure状態変化リスナの解除
+    # @else
+    # @brief Unsetting FsmStructure listener
+    # @endif
+    #
+    def unsetFSMStructureListeners(self):
+        if self._fsmaction.structureListener:
+            self._rtobj.removeFsmStructureListener(
+                OpenRTM_aist.FsmStructureListenerType.SET_FSM_STRUCTURE,
+                self._fsmaction.structureListener)
+            self._fsmaction.structureListener = None
 
-        self._fsmaction.preOnFsmStateChangeListener = \
-            self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_STATE_CHANGE,
-                                                self._fsmaction.postInit)
+    ##
+    # @if jp
+    # @brief FSMの各アクションのリスナの設定
+    # @else
+    # @brief Setting the listeners of each FSM action
+    # @endif
+    #
+    def setFSMActionListeners(self):
+        fsmactionlistenertype_ = OpenRTM_aist.PreFsmActionListenerType
+        if not self._fsmaction.preOnFsmInitListener:
+            self._fsmaction.preOnFsmInitListener = \
+                self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_INIT,
+                                                    self._fsmaction.preInit)
+
+        if not self._fsmaction.preOnFsmEntryListener:
+            self._fsmaction.preOnFsmEntryListener = \
+                self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_ENTRY,
+                                                    self._fsmaction.preEntry)
+
+        if not self._fsmaction.preOnFsmDoListener:
+            self._fsmaction.preOnFsmDoListener = \
+                self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_DO,
+                                                    self._fsmaction.preDo)
+
+        if not self._fsmaction.preOnFsmExitListener:
+            self._fsmaction.preOnFsmExitListener = \
+                self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_EXIT,
+                                                    self._fsmaction.preExit)
+
+        if not self._fsmaction.preOnFsmStateChangeListener:
+            self._fsmaction.preOnFsmStateChangeListener = \
+                self._rtobj.addPreFsmActionListener(fsmactionlistenertype_.PRE_ON_STATE_CHANGE,
+                                                    self._fsmaction.preStateChange)
 
         fsmactionlistenertype_ = OpenRTM_aist.PostFsmActionListenerType
 
-        self._fsmaction.postOnFsmInitListener = \
-            self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_INIT,
-                                                 self._fsmaction.preStateChange)
+        if not self._fsmaction.postOnFsmInitListener:
+            self._fsmaction.postOnFsmInitListener = \
+                self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_INIT,
+                                                     self._fsmaction.postInit)
 
-        self._fsmaction.postOnFsmEntryListener = \
-            self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_ENTRY,
-                                                 self._fsmaction.postEntry)
+        if not self._fsmaction.postOnFsmEntryListener:
+            self._fsmaction.postOnFsmEntryListener = \
+                self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_ENTRY,
+                                                     self._fsmaction.postEntry)
 
-        self._fsmaction.postOnFsmDoListener = \
-            self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_DO,
-                                                 self._fsmaction.postDo)
+        if not self._fsmaction.postOnFsmDoListener:
+            self._fsmaction.postOnFsmDoListener = \
+                self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_DO,
+                                                     self._fsmaction.postDo)
 
-        self._fsmaction.postOnFsmExitListener = \
-            self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_EXIT,
-                                                 self._fsmaction.postExit)
+        if not self._fsmaction.postOnFsmExitListener:
+            self._fsmaction.postOnFsmExitListener = \
+                self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_EXIT,
+                                                     self._fsmaction.postExit)
 
-        self._fsmaction.postOnFsmStateChangeListener = \
-            self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_STATE_CHANGE,
-                                                 self._fsmaction.postStateChange)
+        if not self._fsmaction.postOnFsmStateChangeListener:
+            self._fsmaction.postOnFsmStateChangeListener = \
+                self._rtobj.addPostFsmActionListener(fsmactionlistenertype_.POST_ON_STATE_CHANGE,
+                                                     self._fsmaction.postStateChange)
 
-    def unsetFSMStructureListeners(self):
-        fsmactionlistenertype_ = OpenRTM_aist.FSMActionListenerType
+    ##
+    # @if jp
+    # @brief FSMの各アクションのリスナの解除
+    # @else
+    # @brief Unsetting the listeners of each FSM action
+    # @endif
+    #
+    def unsetFSMActionListeners(self):
+        fsmactionlistenertype_ = OpenRTM_aist.PreFsmActionListenerType
         if self._fsmaction.preOnFsmInitListener:
             self._rtobj.removePreFsmActionListener(fsmactionlistenertype_.PRE_ON_INIT,
                                                    self._fsmaction.preOnFsmInitListener)
@@ -849,6 +946,7 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
                                                    self._fsmaction.preOnFsmStateChangeListener)
             self._fsmaction.preOnFsmStateChangeListener = None
 
+        fsmactionlistenertype_ = OpenRTM_aist.PostFsmActionListenerType
         if self._fsmaction.postOnFsmInitListener:
             self._rtobj.removePostFsmActionListener(fsmactionlistenertype_.POST_ON_INIT,
                                                     self._fsmaction.postOnFsmInitListener)
@@ -870,7 +968,7 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
             self._fsmaction.postOnFsmExitListener = None
 
         if self._fsmaction.postOnFsmStateChangeListener:
-            self._rtobj.removePostFsmActionListener(fsmactionlistenertype_.POST_ON_EXIT,
+            self._rtobj.removePostFsmActionListener(fsmactionlistenertype_.POST_ON_STATE_CHANGE,
                                                     self._fsmaction.postOnFsmStateChangeListener)
             self._fsmaction.postOnFsmStateChangeListener = None
 
@@ -1241,6 +1339,8 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
         #ConfigAction(ComponentObserverConsumer& coc)
         def __init__(self, coc):
             self.updateFsmStatusListener = None
+            self.transitionListener = None
+            self.structureListener = None
             self.preOnFsmInitListener = None
             self.preOnFsmEntryListener = None
             self.preOnFsmDoListener = None
@@ -1261,6 +1361,17 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
             self._coc.updateStatus(RTC.FSM_STATUS, state)
             return
 
+        def transition(self, from_, to, event):
+            msg_ = "TRANSITION: " + from_ + " " + to + " " + event
+            self._coc.updateStatus(RTC.FSM_STATUS, msg_)
+            return
+
+        def updateFsmStructure(self, fsm_structure):
+            version_ = OpenRTM_aist.NVUtil.toString(fsm_structure.properties,
+                                                    "fsm_structure.version")
+            self._coc.updateStatus(RTC.FSM_STRUCTURE, "VERSION: " + version_)
+            return
+
         def preInit(self, state):
             msg_ = state + " PRE_ON_INIT"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
@@ -1286,27 +1397,27 @@ class ComponentObserverConsumer(OpenRTM_aist.SdoServiceConsumerBase):
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
 
-        def postInit(self, state):
+        def postInit(self, state, ret):
             msg_ = state + " POST_ON_INIT"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
 
-        def postEntry(self, state):
+        def postEntry(self, state, ret):
             msg_ = state + " POST_ONENTRY"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
 
-        def postDo(self, state):
+        def postDo(self, state, ret):
             msg_ = state + " POST_ON_DO"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
 
-        def postExit(self, state):
+        def postExit(self, state, ret):
             msg_ = state + " POST_ON_EXIT"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
 
-        def postStateChange(self, state):
+        def postStateChange(self, state, ret):
             msg_ = state + " POST_ON_STATE_CHNAGE"
             self._coc.updateStatus(RTC.FSM_STATUS, msg_)
             return
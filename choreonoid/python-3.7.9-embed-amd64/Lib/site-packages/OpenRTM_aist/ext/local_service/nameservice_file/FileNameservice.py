@@ -19,16 +19,341 @@
 
 import shutil
 import os.path
+import time
+import socket
+import threading
 import OpenRTM_aist
 
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
 service_name = "org.openrtm.local_service.nameservice.file_nameservice"
 service_uuid = "7288D080-F618-480B-B6D9-A199686F3101"
 default_config = ["base_path", "./openrtm_ns/",
                   "file_structure", "tree",
                   "context_delimiter", "|",
+                  "registry_file", "",
                   ""]
 
 
+##
+# @if jp
+# @class NameRegistry クラス
+# @brief 名前とIORの対応を1つのファイルに保持するレジストリ
+#
+# 全ての名前の登録を1つの SQLite ファイルに保持する。登録、削除は
+# トランザクションで行うため、複数のプロセスから同時に更新しても
+# ファイルが壊れない。resolve()、list() はファイルの更新時刻が
+# 変わっていなければメモリ上の表から返す。hasChanged()、waitChange()
+# でファイルの更新時刻による変更の通知を受けられる。
+#
+# FileNameservice の file_structure に registry を指定した場合に使用する。
+# ツールからは次のように単独で使用できる。
+#
+# reg = NameRegistry("./openrtm_ns/registry.db")
+# ior = reg.resolve("host_cxt/ConsoleIn0.rtc")
+# for path, ior in reg.list("host_cxt/"): ...
+#
+# @else
+# @class NameRegistry class
+# @brief Registry keeping all name to IOR bindings in a single file
+#
+# All bindings are kept in a single SQLite file. Binding and unbinding
+# run in transactions, so several processes can update the file at the
+# same time without corrupting it. resolve() and list() answer from an
+# in-memory table as long as the file modification time is unchanged.
+# hasChanged() and waitChange() notify changes by the file modification
+# time.
+#
+# Used by FileNameservice when file_structure is "registry". Tools can
+# use it on its own, e.g.
+#
+# reg = NameRegistry("./openrtm_ns/registry.db")
+# ior = reg.resolve("host_cxt/ConsoleIn0.rtc")
+# for path, ior in reg.list("host_cxt/"): ...
+#
+# @endif
+class NameRegistry:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # ファイルとテーブルがない場合は作成する。
+    #
+    # @param filename レジストリのファイル名
+    # @param owner 登録の所有者(省略時は "ホスト名:プロセスID")
+    # @exception RuntimeError sqlite3 が使用できない場合
+    #
+    # @else
+    # @brief Constructor
+    #
+    # The file and the table are created if missing.
+    #
+    # @param filename registry file name
+    # @param owner owner of the bindings ("hostname:pid" if omitted)
+    # @exception RuntimeError sqlite3 is unavailable
+    #
+    # @endif
+    def __init__(self, filename, owner=None):
+        if sqlite3 is None:
+            raise RuntimeError("sqlite3 is not available")
+        self._filename = filename
+        self._owner = owner or "%s:%d" % (socket.gethostname(), os.getpid())
+        self._mutex = threading.RLock()
+        self._stamp = None
+        self._table = None
+        directory = os.path.dirname(os.path.abspath(filename))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(filename, timeout=10.0,
+                                     check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS bindings ("
+                               "path TEXT PRIMARY KEY, ior TEXT NOT NULL, "
+                               "owner TEXT NOT NULL, updated REAL NOT NULL)")
+
+    ##
+    # @if jp
+    # @brief レジストリを閉じる
+    # @else
+    # @brief Close the registry
+    # @endif
+    def close(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    ##
+    # @if jp
+    # @brief 所有者の取得
+    # @else
+    # @brief Get the owner
+    # @endif
+    def getOwner(self):
+        return self._owner
+
+    ##
+    # @if jp
+    # @brief 名前を登録する
+    #
+    # 既に登録されている場合は置き換える。
+    #
+    # @param path 名前
+    # @param ior IOR
+    #
+    # @else
+    # @brief Bind a name
+    #
+    # An existing binding is replaced.
+    #
+    # @param path name
+    # @param ior IOR
+    #
+    # @endif
+    def bind(self, path, ior):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO bindings "
+                               "(path, ior, owner, updated) VALUES (?, ?, ?, ?)",
+                               (path, ior, self._owner, time.time()))
+        self._table = None
+
+    ##
+    # @if jp
+    # @brief 名前の登録を削除する
+    #
+    # @param path 名前
+    # @param owner_only Trueの場合は自身が登録した名前のみ削除する
+    # @return 削除した場合にTrue
+    #
+    # @else
+    # @brief Unbind a name
+    #
+    # @param path name
+    # @param owner_only if True, only bindings made by this owner are removed
+    # @return True if removed
+    #
+    # @endif
+    def unbind(self, path, owner_only=True):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        with self._conn:
+            if owner_only:
+                cur = self._conn.execute("DELETE FROM bindings "
+                                         "WHERE path = ? AND owner = ?",
+                                         (path, self._owner))
+            else:
+                cur = self._conn.execute("DELETE FROM bindings WHERE path = ?",
+                                         (path,))
+        self._table = None
+        return cur.rowcount > 0
+
+    ##
+    # @if jp
+    # @brief 所有者の登録を全て削除する
+    #
+    # @param owner 所有者(省略時は自身)
+    # @return 削除した数
+    #
+    # @else
+    # @brief Unbind all bindings of an owner
+    #
+    # @param owner owner (this owner if omitted)
+    # @return number of removed bindings
+    #
+    # @endif
+    def unbindAll(self, owner=None):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM bindings WHERE owner = ?",
+                                     (owner or self._owner,))
+        self._table = None
+        return cur.rowcount
+
+    ##
+    # @if jp
+    # @brief ファイルの更新時刻とサイズの取得
+    # @else
+    # @brief Get the modification time and the size of the file
+    # @endif
+    def _fileStamp(self):
+        try:
+            st = os.stat(self._filename)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    ##
+    # @if jp
+    # @brief メモリ上の表の取得
+    #
+    # ファイルが更新されている場合は読み直す。
+    #
+    # @return 名前をキー、(IOR, 所有者) を値とする辞書
+    #
+    # @else
+    # @brief Get the in-memory table
+    #
+    # Reloaded when the file has been modified.
+    #
+    # @return dict of name to (IOR, owner)
+    #
+    # @endif
+    def _getTable(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        stamp = self._fileStamp()
+        if self._table is None or stamp != self._stamp:
+            rows = self._conn.execute("SELECT path, ior, owner FROM bindings")
+            self._table = dict((path, (ior, owner)) for path, ior, owner in rows)
+            self._stamp = stamp
+        return self._table
+
+    ##
+    # @if jp
+    # @brief 名前を解決する
+    #
+    # @param path 名前
+    # @return IOR(登録されていない場合はNone)
+    #
+    # @else
+    # @brief Resolve a name
+    #
+    # @param path name
+    # @return IOR (None if not bound)
+    #
+    # @endif
+    def resolve(self, path):
+        entry = self._getTable().get(path)
+        if entry is None:
+            return None
+        return entry[0]
+
+    ##
+    # @if jp
+    # @brief 登録されている名前の一覧を取得する
+    #
+    # @param prefix 指定した場合はこの文字列で始まる名前のみ返す
+    # @param with_owner Trueの場合は所有者も返す
+    # @return 名前順の (名前, IOR) もしくは (名前, IOR, 所有者) のリスト
+    #
+    # @else
+    # @brief List the bound names
+    #
+    # @param prefix if given, only names starting with it are returned
+    # @param with_owner if True, the owners are returned as well
+    # @return list of (name, IOR) or (name, IOR, owner) sorted by name
+    #
+    # @endif
+    def list(self, prefix="", with_owner=False):
+        table = self._getTable()
+        ret = []
+        for path in sorted(table):
+            if prefix and not path.startswith(prefix):
+                continue
+            ior, owner = table[path]
+            if with_owner:
+                ret.append((path, ior, owner))
+            else:
+                ret.append((path, ior))
+        return ret
+
+    ##
+    # @if jp
+    # @brief 前回の確認からファイルが更新されたかどうか
+    #
+    # resolve()、list() で読み直した時点も確認済みとする。
+    #
+    # @return 更新された場合にTrue
+    #
+    # @else
+    # @brief Whether the file was modified since the last check
+    #
+    # Reloads by resolve() and list() count as checks.
+    #
+    # @return True if modified
+    #
+    # @endif
+    def hasChanged(self):
+        guard = OpenRTM_aist.ScopedLock(self._mutex)
+        stamp = self._fileStamp()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        self._table = None
+        return True
+
+    ##
+    # @if jp
+    # @brief ファイルが更新されるまで待つ
+    #
+    # @param timeout 最大の待ち時間[s](Noneの場合は無制限)
+    # @param interval 更新時刻を確認する間隔[s]
+    # @return 更新された場合にTrue、タイムアウトした場合にFalse
+    #
+    # @else
+    # @brief Wait until the file is modified
+    #
+    # @param timeout maximum wait [s] (None for no limit)
+    # @param interval interval of checking the modification time [s]
+    # @return True if modified, False on timeout
+    #
+    # @endif
+    def waitChange(self, timeout=None, interval=0.2):
+        if self._stamp is None:
+            self._getTable()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.hasChanged():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+
 ##
 # @if jp
 # @class FileNameservice クラス
@@ -59,6 +384,7 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
         self._profile.properties = prop
         self._profile.service = self
         self._files = []
+        self._registry = None
         self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("file_nameservice")
         self._rtcout.RTC_DEBUG("FileNameservice was created(")
         self._rtcout.RTC_DEBUG("    name = %s", self._profile.name)
@@ -83,7 +409,9 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
     # @if jp
     # @brief 初期化関数
     #
-    # TODO: Documentation
+    # file_structure に registry を指定した場合は、名前毎のファイルの
+    # 代わりに registry_file(省略時は base_path/registry.db)の
+    # NameRegistry に登録する。
     #
     # @param profile 外部から与えられた property
     # @return
@@ -91,7 +419,9 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
     # @else
     # @brief Initialization function
     #
-    # TODO: Documentation
+    # When file_structure is "registry", names are bound in the
+    # NameRegistry of registry_file (base_path/registry.db if omitted)
+    # instead of one file per name.
     #
     # @endif
     # virtual bool
@@ -102,6 +432,24 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
         self._rtcout.RTC_DEBUG(profile)
         self._profile.properties.mergeProperties(profile)
 
+        fs_ = self._profile.properties.getProperty("file_structure")
+        if fs_.strip().lower() == "registry":
+            regfile_ = self._profile.properties.getProperty("registry_file")
+            if not regfile_:
+                regfile_ = os.path.join(
+                    self._profile.properties.getProperty("base_path"),
+                    "registry.db")
+            try:
+                self._registry = NameRegistry(regfile_)
+                self._rtcout.RTC_INFO("name registry: %s", regfile_)
+            except BaseException:
+                self._rtcout.RTC_ERROR("Opening name registry has been failed. %s",
+                                       regfile_)
+                self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+                self._rtcout.RTC_WARN("file_structure falls back to tree.")
+                self._profile.properties.setProperty("file_structure", "tree")
+                self._registry = None
+
         manager_ = OpenRTM_aist.Manager.instance()
         manager_.addNamingActionListener(NamingAction(self))
         return True
@@ -192,6 +540,17 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
         self._rtcout.RTC_TRACE(" nsinfo = %s",
                                OpenRTM_aist.flatten(ns_info))
 
+        if self._registry is not None:
+            for p in path:
+                try:
+                    self._registry.bind(p, "".join(ns_info))
+                    self._rtcout.RTC_INFO("RTC %s's IOR has been successfully registered.",
+                                          p)
+                except BaseException:
+                    self._rtcout.RTC_ERROR("Registering name has been failed. %s",
+                                           p)
+            return
+
         for p in path:
             filepath_ = self.getFname(p)
             directory_ = os.path.dirname(filepath_)
@@ -234,6 +593,17 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
     def onUnregisterNameservice(self, path):
         self._rtcout.RTC_TRACE("onUnregisterNameservice(%s)",
                                OpenRTM_aist.flatten(path))
+        if self._registry is not None:
+            for p in path:
+                try:
+                    if not self._registry.unbind(p):
+                        self._rtcout.RTC_WARN("This name (%s) might not be my name.",
+                                              p)
+                except BaseException:
+                    self._rtcout.RTC_ERROR("Unregistering name has been failed. %s",
+                                           p)
+            return
+
         for p in path:
             filepath_ = self.getFname(p)
             if not os.path.exists(filepath_):
@@ -345,6 +715,14 @@ class FileNameservice(OpenRTM_aist.LocalServiceBase):
 
         self._files = []
 
+        if self._registry is not None:
+            try:
+                self._registry.unbindAll()
+                self._registry.close()
+            except BaseException:
+                self._rtcout.RTC_ERROR("Cleaning up name registry has been failed.")
+            self._registry = None
+
     ##
     # @if jp
     # @brief プロパティの処理
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##
+# @file ROSEventLoop.py
+# @brief ROS Transport selector based I/O loop
+# @date $Date$
+#
+# Copyright (C) 2019
+#     Noriaki Ando
+#     Robot Innovation Research Center,
+#     National Institute of
+#         Advanced Industrial Science and Technology (AIST), Japan
+#     All rights reserved.
+#
+# $Id$
+#
+
+import OpenRTM_aist
+import selectors
+import socket
+import threading
+import collections
+import errno
+import os
+import time
+
+
+##
+# @if jp
+# @class ROSEventLoop
+# @brief ROSリンクのI/Oを1スレッドで多重化するイベントループ
+#
+# selectorsモジュールにより、TCPROSの待ち受けソケット、Subscriber側の
+# 受信ソケット、Publisher側の送信ソケットを1つのスレッドで監視する。
+# ソケットの登録、解除はループスレッドで実行するため、他のスレッドから
+# 呼び出された場合は処理を登録してループを起床させる。
+#
+# @else
+# @class ROSEventLoop
+# @brief Event loop multiplexing all ROS link I/O on a single thread
+#
+# The TCPROS accept socket, subscriber receive sockets and publisher
+# send sockets are all watched by one thread using the selectors module.
+# Registration changes are executed on the loop thread; calls from
+# other threads are queued and the loop is woken up.
+#
+# @endif
+#
+class ROSEventLoop:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    #
+    # @endif
+    def __init__(self):
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf("ROSEventLoop")
+        self._selector = selectors.DefaultSelector()
+        self._pending = collections.deque()
+        self._shutdownflag = False
+        self._thread = None
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+    ##
+    # @if jp
+    # @brief I/Oスレッドの開始
+    #
+    # @param self
+    #
+    # @else
+    # @brief Start the I/O thread
+    #
+    # @param self
+    #
+    # @endif
+    def start(self):
+        self._thread = threading.Thread(target=self.run, args=())
+        self._thread.daemon = True
+        self._thread.start()
+
+    ##
+    # @if jp
+    # @brief I/Oスレッドの終了
+    #
+    # 登録済みのソケットの監視を止めてスレッドの終了を待つ。
+    # ソケットのクローズは各リンクが行う。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Stop the I/O thread
+    #
+    # @param self
+    #
+    # @endif
+    def shutdown(self):
+        self._shutdownflag = True
+        self.wakeup()
+        if self._thread is not None and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    ##
+    # @if jp
+    # @brief ループスレッドかを判定
+    #
+    # @param self
+    # @return ループスレッドから呼ばれた場合はTrue
+    #
+    # @else
+    # @brief Check whether the caller runs on the loop thread
+    #
+    # @param self
+    # @return True if called on the loop thread
+    #
+    # @endif
+    def inLoop(self):
+        return self._thread is threading.current_thread()
+
+    ##
+    # @if jp
+    # @brief ループスレッドでの処理実行
+    #
+    # ループスレッドから呼ばれた場合は直ちに実行し、それ以外の場合は
+    # 次のループで実行する。
+    #
+    # @param self
+    # @param func 実行する関数
+    #
+    # @else
+    # @brief Run a function on the loop thread
+    #
+    # @param self
+    # @param func function to run
+    #
+    # @endif
+    def call(self, func):
+        if self.inLoop():
+            func()
+        else:
+            self._pending.append(func)
+            self.wakeup()
+
+    ##
+    # @if jp
+    # @brief select待ちのループを起床させる
+    #
+    # @param self
+    #
+    # @else
+    # @brief Wake the loop up from select
+    #
+    # @param self
+    #
+    # @endif
+    def wakeup(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    ##
+    # @if jp
+    # @brief ソケットの監視開始
+    #
+    # handlerはonReadable()、onWritable()、onError()を持つオブジェクト。
+    #
+    # @param self
+    # @param sock ソケット
+    # @param handler イベントハンドラ
+    # @param events 監視するイベント
+    #
+    # @else
+    # @brief Start watching a socket
+    #
+    # @param self
+    # @param sock socket
+    # @param handler object with onReadable(), onWritable() and onError()
+    # @param events event mask
+    #
+    # @endif
+    def register(self, sock, handler, events=selectors.EVENT_READ):
+        def _register():
+            try:
+                self._selector.register(sock, events, handler)
+            except (KeyError, ValueError, OSError):
+                handler.onError()
+        self.call(_register)
+
+    ##
+    # @if jp
+    # @brief 監視イベントの変更
+    #
+    # @param self
+    # @param sock ソケット
+    # @param handler イベントハンドラ
+    # @param events 監視するイベント
+    #
+    # @else
+    # @brief Change the watched events of a socket
+    #
+    # @param self
+    # @param sock socket
+    # @param handler event handler
+    # @param events event mask
+    #
+    # @endif
+    def modify(self, sock, handler, events):
+        def _modify():
+            try:
+                self._selector.modify(sock, events, handler)
+            except (KeyError, ValueError, OSError):
+                pass
+        self.call(_modify)
+
+    ##
+    # @if jp
+    # @brief ソケットの監視終了
+    #
+    # @param self
+    # @param sock ソケット
+    # @param done 監視終了後に呼び出す関数
+    #
+    # @else
+    # @brief Stop watching a socket
+    #
+    # @param self
+    # @param sock socket
+    # @param done function called after the socket is unregistered
+    #
+    # @endif
+    def unregister(self, sock, done=None):
+        def _unregister():
+            try:
+                self._selector.unregister(sock)
+            except (KeyError, ValueError, OSError):
+                pass
+            if done is not None:
+                done()
+        if self._shutdownflag:
+            if done is not None:
+                done()
+            return
+        self.call(_unregister)
+
+    ##
+    # @if jp
+    # @brief I/Oスレッドの処理
+    #
+    # @param self
+    #
+    # @else
+    # @brief I/O thread body
+    #
+    # @param self
+    #
+    # @endif
+    def run(self):
+        while not self._shutdownflag:
+            while self._pending:
+                func = self._pending.popleft()
+                try:
+                    func()
+                except BaseException:
+                    self._rtcout.RTC_ERROR(OpenRTM_aist.Logger.print_exception())
+            try:
+                events = self._selector.select(1.0)
+            except (OSError, ValueError):
+                self._rtcout.RTC_ERROR("select failed")
+                self._rtcout.RTC_DEBUG(OpenRTM_aist.Logger.print_exception())
+                # a socket closed while registered makes every select()
+                # fail; drop it, otherwise back off instead of spinning
+                if not self.removeInvalid():
+                    time.sleep(0.1)
+                continue
+            for key, mask in events:
+                handler = key.data
+                if handler is None:
+                    self.drainWakeup()
+                    continue
+                try:
+                    if mask & selectors.EVENT_READ:
+                        handler.onReadable()
+                    if mask & selectors.EVENT_WRITE:
+                        handler.onWritable()
+                except BaseException:
+                    handler.onError()
+
+    ##
+    # @if jp
+    # @brief 無効になったソケットの登録解除
+    #
+    # 登録されたまま閉じられたソケットの登録を解除し、ハンドラの
+    # onError()を呼び出す。
+    #
+    # @param self
+    # @return 登録を解除したソケットがある場合はTrue
+    #
+    # @else
+    # @brief Unregister sockets that became invalid
+    #
+    # Sockets closed while still registered are unregistered and the
+    # onError() of their handler is called.
+    #
+    # @param self
+    # @return True if any socket was unregistered
+    #
+    # @endif
+    def removeInvalid(self):
+        removed = False
+        for key in list(self._selector.get_map().values()):
+            try:
+                if key.fileobj.fileno() < 0:
+                    raise ValueError("closed socket")
+                os.fstat(key.fd)
+                continue
+            except (OSError, ValueError):
+                pass
+            try:
+                self._selector.unregister(key.fileobj)
+            except (KeyError, ValueError, OSError):
+                pass
+            removed = True
+            self._rtcout.RTC_WARN("invalid socket %d unregistered", key.fd)
+            if key.data is not None:
+                try:
+                    key.data.onError()
+                except BaseException:
+                    self._rtcout.RTC_ERROR(
+                        OpenRTM_aist.Logger.print_exception())
+        return removed
+
+    ##
+    # @if jp
+    # @brief 起床通知用ソケットの読み捨て
+    #
+    # @param self
+    #
+    # @else
+    # @brief Drain the wakeup socket
+    #
+    # @param self
+    #
+    # @endif
+    def drainWakeup(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+
+##
+# @if jp
+# @class SendQueue
+# @brief リンク毎の上限付き送信キュー
+#
+# キューが上限に達した場合は最も古いデータを破棄する。
+# 送信は非ブロッキングで行い、送信しきれなかった分はループスレッドが
+# 書き込み可能になった時点で送信する。
+#
+# @else
+# @class SendQueue
+# @brief Bounded per-link send queue
+#
+# The oldest message is dropped when the queue is full. Sends are
+# non-blocking; whatever could not be written is flushed by the loop
+# thread once the socket becomes writable.
+#
+# @endif
+#
+class SendQueue:
+    """
+    """
+
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param loop イベントループ
+    # @param sock 送信ソケット
+    # @param size キューの上限
+    # @param owner エラー時にonError()を呼び出すオブジェクト
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    # @param loop event loop
+    # @param sock socket
+    # @param size maximum number of queued messages
+    # @param owner object whose onError() is called on failure
+    #
+    # @endif
+    def __init__(self, loop, sock, size, owner):
+        self._loop = loop
+        self._sock = sock
+        self._size = max(size, 1)
+        self._owner = owner
+        self._queue = collections.deque()
+        self._offset = 0
+        self._writing = False
+        self._mutex = threading.RLock()
+        self._dropped = 0
+
+    ##
+    # @if jp
+    # @brief 破棄したメッセージ数の取得
+    #
+    # @param self
+    # @return 破棄したメッセージ数
+    #
+    # @else
+    # @brief Get the number of dropped messages
+    #
+    # @param self
+    # @return number of dropped messages
+    #
+    # @endif
+    def getDropped(self):
+        return self._dropped
+
+    ##
+    # @if jp
+    # @brief データの送信
+    #
+    # キューが空であれば直ちに非ブロッキング送信を試みる。
+    #
+    # @param self
+    # @param data 送信データ
+    # @return 古いデータを破棄した場合はFalse
+    #
+    # @else
+    # @brief Send data
+    #
+    # @param self
+    # @param data data to send
+    # @return False if an older message had to be dropped
+    #
+    # @endif
+    def send(self, data):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        ret = True
+        if len(self._queue) >= self._size:
+            # a partially written head must stay intact
+            idx = 1 if self._offset else 0
+            self._dropped += 1
+            if idx >= len(self._queue):
+                # nothing older can be dropped, drop the new data
+                return False
+            del self._queue[idx]
+            ret = False
+        self._queue.append(memoryview(data))
+        if not self._writing:
+            self.flush()
+            if self._queue:
+                self._writing = True
+                self._loop.modify(self._sock, self._owner,
+                                  selectors.EVENT_READ | selectors.EVENT_WRITE)
+        return ret
+
+    ##
+    # @if jp
+    # @brief キューのデータを書けるだけ送信する
+    #
+    # @param self
+    # @return 送信したバイト数
+    #
+    # @else
+    # @brief Write as much queued data as the socket accepts
+    #
+    # @param self
+    # @return number of bytes written
+    #
+    # @endif
+    def flush(self):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        sent = 0
+        while self._queue:
+            head = self._queue[0]
+            try:
+                n = self._sock.send(head[self._offset:])
+            except (BlockingIOError, InterruptedError):
+                break
+            except socket.error as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            sent += n
+            self._offset += n
+            if self._offset >= len(head):
+                self._queue.popleft()
+                self._offset = 0
+            else:
+                break
+        return sent
+
+    ##
+    # @if jp
+    # @brief 書き込み可能時の処理
+    #
+    # ループスレッドから呼び出す。キューが空になれば書き込み監視を止める。
+    #
+    # @param self
+    # @return 送信したバイト数
+    #
+    # @else
+    # @brief Handle a writable socket
+    #
+    # Called on the loop thread. Write interest is dropped once the
+    # queue is empty.
+    #
+    # @param self
+    # @return number of bytes written
+    #
+    # @endif
+    def onWritable(self):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        sent = self.flush()
+        if not self._queue and self._writing:
+            self._writing = False
+            self._loop.modify(self._sock, self._owner, selectors.EVENT_READ)
+        return sent
+
+    ##
+    # @if jp
+    # @brief キューの破棄
+    #
+    # @param self
+    #
+    # @else
+    # @brief Discard queued data
+    #
+    # @param self
+    #
+    # @endif
+    def clear(self):
+        guard = OpenRTM_aist.Guard.ScopedLock(self._mutex)
+        self._queue.clear()
+        self._offset = 0
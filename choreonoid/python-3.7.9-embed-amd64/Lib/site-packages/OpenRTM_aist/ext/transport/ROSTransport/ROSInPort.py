@@ -370,8 +370,12 @@ class ROSInPort(OpenRTM_aist.InPortProvider):
                             return
 
                 self._topicmgr = ROSTopicManager.instance()
-                listener = SubListener(self, sock)
-                task = threading.Thread(target=listener.recieve, args=())
+                loop = self._topicmgr.getEventLoop()
+                listener = SubListener(self, sock, loop)
+                if loop is None:
+                    task = threading.Thread(target=listener.recieve, args=())
+                else:
+                    task = None
                 self._topicmgr.addPublisherLink(
                     sock, caller_id, topic, uri, listener, task)
                 pub = self._topicmgr.getPublisherLink(sock)
@@ -415,9 +419,12 @@ class ROSInPort(OpenRTM_aist.InPortProvider):
                     self._rtcout.RTC_ERROR("read ROS handshake header")
                     continue
 
-                self._rtcout.RTC_VERBOSE("Subscriber Listener thread start")
-
-                task.start()
+                if task is not None:
+                    self._rtcout.RTC_VERBOSE("Subscriber Listener thread start")
+                    task.start()
+                else:
+                    self._rtcout.RTC_VERBOSE("Subscriber Listener registered")
+                    listener.start()
 
     # virtual void setBuffer(BufferBase<cdrMemoryStream>* buffer);
 
@@ -656,7 +663,7 @@ class SubListener:
     # @param self
     # @param sub ROSInPort
     # @param sock ソケット
-    # @param uri 接続先のURI
+    # @param loop I/Oイベントループ(selectorモードの場合)
     #
     # @else
     # @brief Constructor
@@ -664,16 +671,18 @@ class SubListener:
     # @param self
     # @param sub
     # @param sock
-    # @param uri
+    # @param loop I/O event loop (selector mode only)
     #
     # @endif
     #
-    def __init__(self, sub, sock):
+    def __init__(self, sub, sock, loop=None):
         self._sub = sub
         self._sock = sock
+        self._loop = loop
         self._shutdown = False
         self._stat_bytes = 0
         self._stat_num_msg = 0
+        self._buff = bytearray()
 
     ##
     # @if jp
@@ -767,6 +776,7 @@ class SubListener:
                             b.seek(start)
                             data = b.read(size+4)
                             self._sub.put(data)
+                            self._stat_num_msg += 1
                             b.seek(start)
                             pos += size
                             size = -1
@@ -786,13 +796,106 @@ class SubListener:
                     if d:
                         b.write(d)
                         self._stat_bytes += len(d)
-                        self._stat_num_msg += 1
                     else:
                         raise BaseException
             except BaseException:
                 self._sub.deleteSocket(self._sock)
                 return
 
+    ##
+    # @if jp
+    # @brief イベントループでの受信開始(selectorモード)
+    #
+    # @param self
+    #
+    # @else
+    # @brief Start receiving on the event loop (selector mode)
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def start(self):
+        self._sock.setblocking(False)
+        self._loop.register(self._sock, self)
+
+    ##
+    # @if jp
+    # @brief 受信可能時の処理(selectorモード)
+    #
+    # 受信したデータを蓄積し、完全なメッセージ(4バイトの長さ＋本体)が
+    # 揃った分だけROSInPortに渡す。
+    #
+    # @param self
+    #
+    # @else
+    # @brief Handle a readable socket (selector mode)
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def onReadable(self):
+        if self._shutdown:
+            return
+        try:
+            d = self._sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not d:
+            self.onError()
+            return
+        self._stat_bytes += len(d)
+
+        b = self._buff
+        b.extend(d)
+        pos = 0
+        btell = len(b)
+        while btell - pos >= 4:
+            (size,) = struct.unpack_from('<I', b, pos)
+            if btell - pos - 4 < size:
+                break
+            self._sub.put(bytes(b[pos:pos + size + 4]))
+            self._stat_num_msg += 1
+            pos += size + 4
+        if pos:
+            del b[:pos]
+
+    ##
+    # @if jp
+    # @brief 送信可能時の処理(selectorモード)
+    #
+    # @param self
+    #
+    # @else
+    # @brief
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def onWritable(self):
+        pass
+
+    ##
+    # @if jp
+    # @brief 通信エラー時の処理(selectorモード)
+    #
+    # @param self
+    #
+    # @else
+    # @brief Handle a socket error (selector mode)
+    #
+    # @param self
+    #
+    # @endif
+    #
+    def onError(self):
+        if not self._shutdown:
+            self._shutdown = True
+            self._loop.unregister(self._sock)
+            self._sub.deleteSocket(self._sock)
+
 
 ##
 # @if jp
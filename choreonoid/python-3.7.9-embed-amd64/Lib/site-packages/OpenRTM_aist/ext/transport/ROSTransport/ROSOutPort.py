@@ -285,14 +285,18 @@ class ROSOutPort(OpenRTM_aist.InPortConsumer):
                   'type': info_type,
                   'callerid': self._callerid}
 
+        self._topicmgr = ROSTopicManager.instance()
+        sub = self._topicmgr.getSubscriberLink(client_sock)
+
         try:
-            stat_bytes = write_ros_handshake_header(client_sock, fields)
-        except rosgraph.network.ROSHandshakeException:
+            if sub is not None:
+                stat_bytes = sub.sendHandshake(fields)
+            else:
+                stat_bytes = write_ros_handshake_header(client_sock, fields)
+        except (rosgraph.network.ROSHandshakeException, socket.error):
             self._rtcout.RTC_ERROR("write ROS handshake exception")
             return
 
-        self._topicmgr = ROSTopicManager.instance()
-        sub = self._topicmgr.getSubscriberLink(client_sock)
         if sub is not None:
             guard_con = OpenRTM_aist.Guard.ScopedLock(self._con_mutex)
             sub.setTopic(topic_name)
@@ -342,7 +346,8 @@ class ROSOutPort(OpenRTM_aist.InPortConsumer):
         guard_con = OpenRTM_aist.Guard.ScopedLock(self._con_mutex)
         for connector in self._tcp_connecters[:]:
             try:
-                connector.sendall(data)
+                if not connector.sendall(data):
+                    ret = self.SEND_FULL
             except BaseException:
                 self._rtcout.RTC_ERROR("send error")
                 self._topicmgr.removeSubscriberLink(connector.getConnection())
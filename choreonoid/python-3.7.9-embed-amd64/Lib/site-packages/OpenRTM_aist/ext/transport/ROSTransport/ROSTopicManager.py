@@ -19,7 +19,10 @@
 import OpenRTM_aist
 import threading
 import rosgraph.xmlrpc
-from rosgraph.network import read_ros_handshake_header
+from rosgraph.network import read_ros_handshake_header, decode_ros_handshake_header
+from rosgraph.network import write_ros_handshake_header, encode_ros_handshake_header
+from ROSEventLoop import ROSEventLoop, SendQueue
+import struct
 import time
 import socket
 import select
@@ -85,6 +88,15 @@ class ROSTopicManager(rosgraph.xmlrpc.XmlRpcHandler):
         self._sublink_mutex = threading.RLock()
         self._subnum = 0
         self._pubnum = 0
+        self._loop = None
+
+        conf = OpenRTM_aist.Manager.instance().getConfig()
+        self._io_mode = conf.getProperty("ros.io.mode", "thread")
+        try:
+            self._send_queue_size = int(
+                conf.getProperty("ros.io.send_queue_size", "32"))
+        except ValueError:
+            self._send_queue_size = 32
 
     ##
     # @if jp
@@ -123,9 +135,65 @@ class ROSTopicManager(rosgraph.xmlrpc.XmlRpcHandler):
             (rosgraph.network.get_bind_address(), self._port))
         (self._addr, self._port) = self._server_sock.getsockname()[0:2]
         self._server_sock.listen(5)
-        self._thread = threading.Thread(target=self.run, args=())
-        self._thread.daemon = True
-        self._thread.start()
+        if self._io_mode == "selector":
+            self._loop = ROSEventLoop()
+            self._loop.start()
+            self._server_sock.setblocking(False)
+            self._loop.register(self._server_sock, AcceptHandler(self))
+        else:
+            self._thread = threading.Thread(target=self.run, args=())
+            self._thread.daemon = True
+            self._thread.start()
+
+    ##
+    # @if jp
+    # @brief I/Oイベントループの取得
+    #
+    # ros.io.modeがselectorの場合、全てのROSリンクの送受信を
+    # 1つのスレッドで処理するイベントループを返す。
+    #
+    # @param self
+    # @return イベントループ(threadモードの場合はNone)
+    #
+    # @else
+    #
+    # @brief Get the I/O event loop
+    #
+    # @param self
+    # @return event loop (None in thread mode)
+    #
+    # @endif
+    def getEventLoop(self):
+        return self._loop
+
+    ##
+    # @if jp
+    # @brief 受信したハンドシェイクヘッダをROSOutPortに渡す
+    #
+    # @param self
+    # @param client_sock ソケット
+    # @param header ハンドシェイクヘッダ
+    #
+    # @else
+    #
+    # @brief Pass a received handshake header to the ROSOutPorts
+    #
+    # @param self
+    # @param client_sock socket
+    # @param header handshake header
+    #
+    # @endif
+    def onHandshake(self, client_sock, header):
+        # the socket stays non-blocking, the response header is sent
+        # through the send queue of the link
+        sub = self.getSubscriberLink(client_sock)
+        if sub is not None:
+            sub.start()
+
+        guard_pub = OpenRTM_aist.Guard.ScopedLock(self._pub_mutex)
+        for publisher in self._publishers:
+            publisher.connect(client_sock, header)
+        del guard_pub
 
     ##
     # @if jp
@@ -424,12 +492,15 @@ class ROSTopicManager(rosgraph.xmlrpc.XmlRpcHandler):
     # @endif
     def shutdown(self):
         self._shutdownflag = True
+        if self._loop is not None:
+            self._loop.shutdown()
         try:
             self._server_sock.shutdown(socket.SHUT_WR)
         except BaseException:
             pass
         self._server_sock.close()
-        self._thread.join()
+        if self._thread is not None:
+            self._thread.join()
         self._node.shutdown(True)
 
     ##
@@ -729,7 +800,7 @@ class ROSTopicManager(rosgraph.xmlrpc.XmlRpcHandler):
     def addPublisherLink(self, connection, caller_id, topic, xmlrpc_uri, listener, task):
         guard_pl = OpenRTM_aist.Guard.ScopedLock(self._publink_mutex)
         self._tcp_pub_connecters.append(PublisherLink(
-            connection, self._pubnum, caller_id, topic, xmlrpc_uri, listener, task))
+            connection, self._pubnum, caller_id, topic, xmlrpc_uri, listener, task, self._loop))
         self._pubnum += 1
         return True
 
@@ -807,7 +878,8 @@ class ROSTopicManager(rosgraph.xmlrpc.XmlRpcHandler):
     def addSubscriberLink(self, connection):
         guard_sl = OpenRTM_aist.Guard.ScopedLock(self._sublink_mutex)
         self._tcp_sub_connecters.append(
-            SubscriberLink(connection, self._subnum))
+            SubscriberLink(connection, self._subnum, loop=self._loop,
+                           queue_size=self._send_queue_size, mgr=self))
         self._subnum += 1
         return True
 
@@ -963,6 +1035,7 @@ class PublisherLink:
     # @param xmlrpc_uri 接続先のURI
     # @param listener 受信処理用コールバック関数オブジェクト
     # @param task 受信処理用スレッドオブジェクト
+    # @param loop I/Oイベントループ(selectorモードの場合)
     #
     # @else
     # @brief Constructor
@@ -975,9 +1048,10 @@ class PublisherLink:
     # @param xmlrpc_uri
     # @param listener
     # @param task
+    # @param loop I/O event loop (selector mode only)
     #
     # @endif
-    def __init__(self, conn=None, num=0, caller_id="", topic="", xmlrpc_uri="", listener=None, task=None):
+    def __init__(self, conn=None, num=0, caller_id="", topic="", xmlrpc_uri="", listener=None, task=None, loop=None):
         self._conn = conn
         self._num = num
         self._caller_id = caller_id
@@ -985,6 +1059,7 @@ class PublisherLink:
         self._xmlrpc_uri = xmlrpc_uri
         self._listener = listener
         self._task = task
+        self._loop = loop
         self._done = False
 
     ##
@@ -1109,6 +1184,7 @@ class PublisherLink:
     # @brief 終了処理
     # ソケット通信を切断する
     # 受信処理用スレッドを終了する
+    # selectorモードの場合はイベントループからソケットを外した後に切断する
     #
     # @param self
     #
@@ -1119,12 +1195,35 @@ class PublisherLink:
     # @endif
 
     def exit(self):
-        self._conn.shutdown(socket.SHUT_RDWR)
-        self._conn.close()
-        self._listener.shutdown()
-        self._task.join()
+        if self._loop is not None:
+            self._listener.shutdown()
+            self._loop.unregister(self._conn, self.close)
+        else:
+            self.close()
+            self._listener.shutdown()
+            self._task.join()
         self._done = True
 
+    ##
+    # @if jp
+    # @brief ソケットを切断する
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Close the socket
+    #
+    # @param self
+    #
+    # @endif
+    def close(self):
+        try:
+            self._conn.shutdown(socket.SHUT_RDWR)
+        except BaseException:
+            pass
+        self._conn.close()
+
     ##
     # @if jp
     # @brief コネクタの情報取得(getBusInfo用)
@@ -1234,6 +1333,9 @@ class SubscriberLink:
     # @param num 接続ID
     # @param topic トピック名
     # @param caller_id 呼び出しID
+    # @param loop I/Oイベントループ(selectorモードの場合)
+    # @param queue_size 送信キューの上限(selectorモードの場合)
+    # @param mgr 切断時にリンクを削除するROSTopicManager
     #
     # @else
     # @brief Constructor
@@ -1243,9 +1345,12 @@ class SubscriberLink:
     # @param num
     # @param topic
     # @param caller_id
+    # @param loop I/O event loop (selector mode only)
+    # @param queue_size send queue bound (selector mode only)
+    # @param mgr ROSTopicManager removing the link on disconnection
     #
     # @endif
-    def __init__(self, conn=None, num=0, topic="", caller_id=""):
+    def __init__(self, conn=None, num=0, topic="", caller_id="", loop=None, queue_size=32, mgr=None):
         self._conn = conn
         self._num = num
         self._topic = topic
@@ -1253,6 +1358,11 @@ class SubscriberLink:
         self._stat_bytes = 0
         self._stat_num_msg = 0
         self._done = False
+        self._loop = loop
+        self._mgr = mgr
+        self._queue = None
+        if loop is not None:
+            self._queue = SendQueue(loop, conn, queue_size, self)
 
     ##
     # @if jp
@@ -1333,9 +1443,108 @@ class SubscriberLink:
     #
     # @endif
     def exit(self):
-        self._conn.shutdown(socket.SHUT_RDWR)
-        self._conn.close()
         self._done = True
+        if self._loop is not None:
+            self._queue.clear()
+            self._loop.unregister(self._conn, self.close)
+        else:
+            self._conn.shutdown(socket.SHUT_RDWR)
+            self._conn.close()
+
+    ##
+    # @if jp
+    # @brief ソケットを切断する
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Close the socket
+    #
+    # @param self
+    #
+    # @endif
+    def close(self):
+        try:
+            self._conn.shutdown(socket.SHUT_RDWR)
+        except BaseException:
+            pass
+        self._conn.close()
+
+    ##
+    # @if jp
+    # @brief ハンドシェイク完了後にイベントループでの監視を開始する
+    #
+    # 送信はSendQueueで非ブロッキングに行い、受信イベントは
+    # 切断の検知に使用する。
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Start watching the link on the event loop after the handshake
+    #
+    # @param self
+    #
+    # @endif
+    def start(self):
+        if self._loop is not None:
+            self._conn.setblocking(False)
+            self._loop.register(self._conn, self)
+
+    ##
+    # @if jp
+    # @brief 受信可能時の処理(切断の検知)
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Handle a readable socket (disconnect detection)
+    #
+    # @param self
+    #
+    # @endif
+    def onReadable(self):
+        try:
+            d = self._conn.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not d:
+            self.onError()
+
+    ##
+    # @if jp
+    # @brief 送信可能時の処理
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Handle a writable socket
+    #
+    # @param self
+    #
+    # @endif
+    def onWritable(self):
+        self._queue.onWritable()
+
+    ##
+    # @if jp
+    # @brief 通信エラー時の処理
+    #
+    # @param self
+    #
+    # @else
+    #
+    # @brief Handle a socket error
+    #
+    # @param self
+    #
+    # @endif
+    def onError(self):
+        if not self._done and self._mgr is not None:
+            self._mgr.removeSubscriberLink(self._conn)
 
     ##
     # @if jp
@@ -1467,20 +1676,58 @@ class SubscriberLink:
     # @if jp
     # @brief データ送信
     #
+    # selectorモードの場合は送信キューに格納して非ブロッキングで送信する。
+    #
     # @param data データ
+    # @return 送信キューが一杯で古いデータを破棄した場合はFalse
     #
     # @else
     # @brief
     #
     # @param data
+    # @return False if an older message was dropped from the send queue
     #
     # @endif
     #
 
     def sendall(self, data):
-        self._conn.sendall(data)
+        ret = True
+        if self._queue is not None:
+            if self._done:
+                raise socket.error("connection closed")
+            ret = self._queue.send(data)
+        else:
+            self._conn.sendall(data)
         self._stat_bytes += len(data)
         self._stat_num_msg += 1
+        return ret
+
+    ##
+    # @if jp
+    # @brief ハンドシェイクヘッダの送信
+    #
+    # selectorモードの場合は送信キューを経由して非ブロッキングで送信する。
+    #
+    # @param fields ヘッダのフィールド
+    # @return 送信したバイト数
+    #
+    # @else
+    # @brief Send a handshake header
+    #
+    # In selector mode the header goes through the send queue without
+    # blocking.
+    #
+    # @param fields header fields
+    # @return number of bytes sent
+    #
+    # @endif
+    #
+    def sendHandshake(self, fields):
+        if self._queue is None:
+            return write_ros_handshake_header(self._conn, fields)
+        data = encode_ros_handshake_header(fields)
+        self._queue.send(data)
+        return len(data)
 
     ##
     # @if jp
@@ -1499,3 +1746,144 @@ class SubscriberLink:
     def getStats(self):
         ret = [self._num, self._stat_bytes, self._stat_num_msg, self._done]
         return ret
+
+
+##
+# @if jp
+# @class AcceptHandler
+# @brief selectorモードでの待ち受けソケットのイベントハンドラ
+#
+#
+# @else
+# @class AcceptHandler
+# @brief Event handler of the listening socket in selector mode
+#
+#
+# @endif
+class AcceptHandler:
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param mgr ROSTopicManager
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    # @param mgr
+    #
+    # @endif
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._rtcout = OpenRTM_aist.Manager.instance().getLogbuf(
+            "ROSTopicManager")
+
+    ##
+    # @if jp
+    # @brief 接続要求の受け付け
+    #
+    # @param self
+    #
+    # @else
+    # @brief Accept a connection
+    #
+    # @param self
+    #
+    # @endif
+    def onReadable(self):
+        try:
+            (client_sock, _) = self._mgr._server_sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        client_sock.setblocking(False)
+        self._mgr.addSubscriberLink(client_sock)
+        self._mgr.getEventLoop().register(
+            client_sock, HandshakeReader(self._mgr, client_sock))
+
+    def onWritable(self):
+        pass
+
+    def onError(self):
+        self._rtcout.RTC_ERROR("accept failed")
+        self._rtcout.RTC_DEBUG(OpenRTM_aist.Logger.print_exception())
+
+
+##
+# @if jp
+# @class HandshakeReader
+# @brief selectorモードでのハンドシェイクヘッダ受信処理
+#
+# ヘッダを全て受信するまでループスレッドをブロックせずに読み込む。
+#
+# @else
+# @class HandshakeReader
+# @brief Non-blocking reader of the TCPROS handshake header
+#
+#
+# @endif
+class HandshakeReader:
+    ##
+    # @if jp
+    # @brief コンストラクタ
+    #
+    # @param self
+    # @param mgr ROSTopicManager
+    # @param sock ソケット
+    #
+    # @else
+    # @brief Constructor
+    #
+    # @param self
+    # @param mgr
+    # @param sock
+    #
+    # @endif
+    def __init__(self, mgr, sock):
+        self._mgr = mgr
+        self._sock = sock
+        self._buff = bytearray()
+
+    ##
+    # @if jp
+    # @brief ヘッダの受信
+    #
+    # @param self
+    #
+    # @else
+    # @brief Receive the header
+    #
+    # @param self
+    #
+    # @endif
+    def onReadable(self):
+        try:
+            d = self._sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not d:
+            self.onError()
+            return
+        self._buff.extend(d)
+        if len(self._buff) < 4:
+            return
+        (size,) = struct.unpack('<I', self._buff[0:4])
+        if size > 65536:
+            print("read ROS handshake exception")
+            self.onError()
+            return
+        if len(self._buff) < size + 4:
+            return
+
+        header = decode_ros_handshake_header(bytes(self._buff[0:size + 4]))
+        loop = self._mgr.getEventLoop()
+        loop.unregister(self._sock)
+        self._mgr.onHandshake(self._sock, header)
+
+    def onWritable(self):
+        pass
+
+    def onError(self):
+        self._mgr.getEventLoop().unregister(self._sock)
+        self._mgr.removeSubscriberLink(self._sock)
@@ -15,6 +15,9 @@
 #     All rights reserved.
 
 import sys
+import time
+import random
+import threading
 
 RESERVED_NCS, RFC_4122, RESERVED_MICROSOFT, RESERVED_FUTURE = [
     'reserved for NCS compatibility', 'specified in RFC 4122',
@@ -75,6 +78,9 @@ class UUID(object):
             if len(bytes) != 16:
                 raise ValueError('bytes is not a 16-char string')
 
+        if bytes and isinstance(bytes, (type(b''), bytearray)):
+            int_value = int.from_bytes(bytes, 'big')
+        elif bytes:
             def ord_func(v):
                 if sys.version_info[0] == 3:
                     return ord(chr(v))
@@ -371,19 +377,69 @@ def getnode():
             return _node
 
 
+##
+# @if jp
+# @brief 時刻ベースの UUID の生成(高速版)
+#
+# ノードID(getnode())とクロックシーケンスをプロセス内でキャッシュし、
+# タイムスタンプは前回の値より必ず大きくする。ライブラリ関数の呼び出し
+# や外部プログラムの実行は初回のノードIDの取得時のみ行う。
+#
+# @return UUID
+#
+# @else
+# @brief Generate a time based UUID (fast path)
+#
+# The node ID (getnode()) and the clock sequence are cached in the
+# process, and each timestamp is made greater than the previous one.
+# Library calls and external programs are only used once to get the
+# node ID.
+#
+# @return UUID
+#
+# @endif
+def _uuid1_cached():
+    global _last_timestamp, _clock_seq
+    node = _node or getnode()
+    with _uuid1_mutex:
+        timestamp = _time_ns() // 100 + 0x01b21dd213814000
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp + 1
+        _last_timestamp = timestamp
+        if _clock_seq is None:
+            _clock_seq = random.randrange(1 << 14)
+        clock_seq = _clock_seq
+    uuid = object.__new__(UUID)
+    uuid.__dict__['int_value'] = (
+        ((timestamp & 0xffffffff) << 96) |
+        (((timestamp >> 32) & 0xffff) << 80) |
+        ((0x1000 | ((timestamp >> 48) & 0x0fff)) << 64) |
+        ((0x8000 | clock_seq) << 48) | node)
+    return uuid
+
+
+if hasattr(time, 'time_ns'):
+    _time_ns = time.time_ns
+else:
+    def _time_ns():
+        return int(time.time() * 1e9)
+
+_last_timestamp = 0
+_clock_seq = None
+_uuid1_mutex = threading.Lock()
+
+
 def uuid1(node=None, clock_seq=None):
     """Generate a UUID from a host ID, sequence number, and the current time.
     If 'node' is not given, getnode() is used to obtain the hardware
     address.  If 'clock_seq' is given, it is used as the sequence number;
     otherwise a random 14-bit sequence number is chosen."""
 
-    # When the system provides a version-1 UUID generator, use it (but don't
-    # use UuidCreate here because its UUIDs don't conform to RFC 4122).
-    if _uuid_generate_time and node is clock_seq is None:
-        _uuid_generate_time(_buffer)
-        return UUID(bytes=_buffer.raw)
+    # Without explicit node and clock_seq, use the cached node ID and
+    # clock sequence with a monotonic timestamp.
+    if node is clock_seq is None:
+        return _uuid1_cached()
 
-    import time
     nanoseconds = int(time.time() * 1e9)
     # 0x01b21dd213814000 is the number of 100-ns intervals between the
     # UUID epoch 1582-10-15 00:00:00 and the Unix epoch 1970-01-01 00:00:00.